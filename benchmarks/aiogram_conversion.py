@@ -0,0 +1,53 @@
+"""
+Benchmark of the conversion of aiogram updates to the Telegram wire form.
+
+Compares the previous conversion (aiogram's deserialize_telegram_object_to_python
+followed by a recursive rename of "from_user") with the pydantic-based
+object_to_dict() and object_to_json() of dashgram.integrations.aiogram.
+
+Usage:
+    python benchmarks/aiogram_conversion.py [--repeat 3]
+"""
+
+import argparse
+import json
+import timeit
+
+from aiogram.types import Update
+from aiogram.utils.serialization import deserialize_telegram_object_to_python
+
+from dashgram.integrations.aiogram import object_to_dict, object_to_json, rename_key
+
+from updates import UPDATES
+
+
+def previous_object_to_dict(obj: Update) -> dict:
+    return rename_key(deserialize_telegram_object_to_python(obj), "from_user", "from")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=3, help="timing runs per update and method, the best is kept")
+    args = parser.parse_args()
+
+    methods = {
+        "deserialize + rename_key": previous_object_to_dict,
+        "object_to_dict": object_to_dict,
+        "object_to_json": object_to_json,
+        "object_to_dict + json.dumps": lambda obj: json.dumps(object_to_dict(obj)).encode(),
+    }
+
+    for name, data in UPDATES.items():
+        update = Update.model_validate(data)
+        print(f"{name}:")
+        baseline = None
+        for method, convert in methods.items():
+            timer = timeit.Timer(lambda: convert(update))
+            number, _ = timer.autorange()
+            per_update = min(timer.repeat(repeat=args.repeat, number=number)) / number * 1e6
+            baseline = baseline or per_update
+            print(f"  {method:<40} {per_update:8.2f} us  {baseline / per_update:5.2f}x")
+
+
+if __name__ == "__main__":
+    main()
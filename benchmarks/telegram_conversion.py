@@ -0,0 +1,51 @@
+"""
+Benchmark of the conversion of python-telegram-bot updates to the Telegram wire form.
+
+Compares TelegramObject.to_dict(), used previously, with object_to_dict()
+of dashgram.integrations.telegram, alone and followed by JSON encoding as
+done by the client.
+
+Usage:
+    python benchmarks/telegram_conversion.py [--repeat 3]
+"""
+
+import argparse
+import copy
+import timeit
+
+from telegram import Update
+
+from dashgram.integrations.telegram import object_to_dict
+from dashgram.serialization import get_json_encoder
+
+from updates import UPDATES
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=3, help="timing runs per update and method, the best is kept")
+    args = parser.parse_args()
+
+    encode = get_json_encoder(None)
+    methods = {
+        "Update.to_dict": lambda obj: obj.to_dict(),
+        "object_to_dict": object_to_dict,
+        "Update.to_dict + encode": lambda obj: encode(obj.to_dict()),
+        "object_to_dict + encode": lambda obj: encode(object_to_dict(obj)),
+    }
+
+    for name, data in UPDATES.items():
+        update = Update.de_json(copy.deepcopy(data), None)
+        assert object_to_dict(update) == update.to_dict()
+        print(f"{name}:")
+        baseline = None
+        for method, convert in methods.items():
+            timer = timeit.Timer(lambda: convert(update))
+            number, _ = timer.autorange()
+            per_update = min(timer.repeat(repeat=args.repeat, number=number)) / number * 1e6
+            baseline = baseline or per_update
+            print(f"  {method:<40} {per_update:8.2f} us  {baseline / per_update:5.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""Realistic Telegram updates shared by the conversion benchmarks."""
+
+USER = {"id": 123456789, "is_bot": False, "first_name": "Alice", "last_name": "Smith",
+        "username": "alice", "language_code": "en"}
+CHAT = {"id": 123456789, "type": "private", "first_name": "Alice", "last_name": "Smith", "username": "alice"}
+
+UPDATES = {
+    "text message": {
+        "update_id": 100000001,
+        "message": {"message_id": 42, "from": USER, "chat": CHAT, "date": 1700000000, "text": "/start"},
+    },
+    "reply with entities": {
+        "update_id": 100000002,
+        "message": {
+            "message_id": 43, "from": USER, "chat": CHAT, "date": 1700000001,
+            "text": "Thanks @bob, see https://example.com",
+            "entities": [
+                {"type": "text_mention", "offset": 7, "length": 4,
+                 "user": {"id": 987654321, "is_bot": False, "first_name": "Bob"}},
+                {"type": "url", "offset": 17, "length": 19},
+            ],
+            "link_preview_options": {"url": "https://example.com", "prefer_small_media": True},
+            "reply_to_message": {"message_id": 41, "from": {"id": 987654321, "is_bot": False, "first_name": "Bob"},
+                                 "chat": CHAT, "date": 1699999990, "text": "Check the docs"},
+        },
+    },
+    "callback query": {
+        "update_id": 100000003,
+        "callback_query": {
+            "id": "4382bfdwdsb323b2d9", "from": USER, "chat_instance": "-7267392616537465728", "data": "buy:premium",
+            "message": {
+                "message_id": 44, "from": {"id": 555000111, "is_bot": True, "first_name": "Shop", "username": "shop_bot"},
+                "chat": CHAT, "date": 1700000002, "text": "Choose a plan",
+                "reply_markup": {"inline_keyboard": [
+                    [{"text": "Basic", "callback_data": "buy:basic"}, {"text": "Premium", "callback_data": "buy:premium"}],
+                ]},
+            },
+        },
+    },
+    "photo with caption": {
+        "update_id": 100000004,
+        "message": {
+            "message_id": 45, "from": USER, "chat": CHAT, "date": 1700000003, "media_group_id": "13579",
+            "photo": [
+                {"file_id": "AgACAgIAAxkBAAIBOWVl", "file_unique_id": "AQADx8ox", "width": 90, "height": 67, "file_size": 1320},
+                {"file_id": "AgACAgIAAxkBAAIBOWVm", "file_unique_id": "AQADx8oy", "width": 320, "height": 240, "file_size": 18052},
+                {"file_id": "AgACAgIAAxkBAAIBOWVn", "file_unique_id": "AQADx8oz", "width": 1280, "height": 960, "file_size": 164300},
+            ],
+            "caption": "Holiday #photos",
+            "caption_entities": [{"type": "hashtag", "offset": 8, "length": 7}],
+        },
+    },
+}
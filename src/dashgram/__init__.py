@@ -28,10 +28,20 @@ Framework Integration:
 For more information, visit: https://docs.dashgram.io
 """
 
+from .adaptive import AdaptiveBatching
+from .circuit import CircuitBreaker
 from .client import Dashgram
-from .enums import HandlerType
-
-
-__all__ = ["Dashgram", "HandlerType"]
+from .dedup import Deduplicator
+from .enums import CircuitState, HandlerType, OverflowPolicy
+from .integrations.base import register_converter
+from .projection import Projection
+from .ratelimit import RateLimit
+from .raw import RawUpdates
+from .retry import RetryPolicy
+from .sampling import Sampler
+from .spool import Spool
+
+
+__all__ = ["AdaptiveBatching", "CircuitBreaker", "CircuitState", "Dashgram", "Deduplicator", "HandlerType", "OverflowPolicy", "Projection", "RateLimit", "RawUpdates", "RetryPolicy", "Sampler", "Spool", "register_converter"]
 
 __version__ = "0.1.4"
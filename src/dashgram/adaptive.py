@@ -0,0 +1,152 @@
+"""
+Dashgram SDK Adaptive Batching Module.
+
+This module provides the controller adapting the background sender to the
+load and to the health of the Dashgram API. Fixed batch sizes are either
+too small at peak or needlessly large off-peak; the controller grows the
+batch size and then the number of batches in flight additively while
+`/track` requests stay fast and successful, and cuts both multiplicatively
+when latency or errors degrade (AIMD).
+"""
+
+import threading
+import time
+import typing
+
+
+class AdaptiveBatching:
+    """
+    AIMD controller of the batch size and of the batches in flight.
+
+    After each batch sent in the background:
+
+    - if the request failed, or the smoothed latency exceeds
+      `target_latency`, the batch size and the batches in flight are
+      multiplied by `decrease_factor`, at most once per observed latency so
+      that batches already in flight do not compound the decrease
+    - otherwise, if the batch was full, so more events are waiting, the
+      batch size grows by `batch_size_step` up to `max_batch_size`, then the
+      batches in flight grow by one up to `max_in_flight`
+
+    Batches never wait longer than the sender's `max_batch_delay_ms` to
+    fill up, which bounds the delay the controller adds to events.
+
+    Attributes:
+        min_batch_size: Smallest batch size
+        max_batch_size: Largest batch size
+        min_in_flight: Smallest number of batches in flight
+        max_in_flight: Largest number of batches in flight
+        target_latency: Smoothed request latency in seconds above which the controller backs off
+        batch_size_step: Number of events added to the batch size after a healthy full batch
+        decrease_factor: Factor applied to both values when backing off
+        smoothing: Weight of the newest observation in the latency and error rate averages
+        batch_size: The current batch size
+        in_flight: The current maximum number of batches in flight
+        latency: Smoothed request latency in seconds (None before the first batch)
+        error_rate: Smoothed fraction of failed batches
+
+    Example:
+        >>> sdk = Dashgram(
+        ...     project_id="123",
+        ...     access_key="key",
+        ...     max_batch_delay_ms=500,
+        ...     adaptive_batching=AdaptiveBatching(min_batch_size=20, max_batch_size=1000,
+        ...                                        max_in_flight=8, target_latency=0.5),
+        ... )
+        >>> sdk.adaptive_batching.metrics()
+        {'batch_size': 20, 'in_flight': 1, 'latency': None, 'error_rate': 0.0}
+    """
+
+    def __init__(self, *, min_batch_size: int = 10,
+                 max_batch_size: int = 1000,
+                 min_in_flight: int = 1,
+                 max_in_flight: int = 4,
+                 target_latency: float = 1.0,
+                 batch_size_step: typing.Optional[int] = None,
+                 decrease_factor: float = 0.5,
+                 smoothing: float = 0.3) -> None:
+        """
+        Initialize the controller at its lower bounds.
+
+        Args:
+            min_batch_size: Smallest batch size
+            max_batch_size: Largest batch size
+            min_in_flight: Smallest number of batches in flight
+            max_in_flight: Largest number of batches in flight
+            target_latency: Smoothed request latency in seconds above which the controller backs off
+            batch_size_step: Number of events added to the batch size after a healthy
+                full batch (defaults to min_batch_size)
+            decrease_factor: Factor between 0 and 1 applied to both values when backing off
+            smoothing: Weight between 0 and 1 of the newest observation in the averages
+
+        Raises:
+            ValueError: If a bound or factor is invalid
+        """
+        if not 1 <= min_batch_size <= max_batch_size:
+            raise ValueError("Expected 1 <= min_batch_size <= max_batch_size")
+        if not 1 <= min_in_flight <= max_in_flight:
+            raise ValueError("Expected 1 <= min_in_flight <= max_in_flight")
+        if not 0 < decrease_factor < 1:
+            raise ValueError("decrease_factor must be between 0 and 1")
+        if not 0 < smoothing <= 1:
+            raise ValueError("smoothing must be between 0 and 1")
+
+        self.min_batch_size = min_batch_size
+        self.max_batch_size = max_batch_size
+        self.min_in_flight = min_in_flight
+        self.max_in_flight = max_in_flight
+        self.target_latency = target_latency
+        self.batch_size_step = batch_size_step if batch_size_step is not None else min_batch_size
+        self.decrease_factor = decrease_factor
+        self.smoothing = smoothing
+
+        self.batch_size = min_batch_size
+        self.in_flight = min_in_flight
+        self.latency: typing.Optional[float] = None
+        self.error_rate = 0.0
+
+        self._decreased_at = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, latency: float, delivered: bool, full: bool) -> None:
+        """
+        Record the outcome of a batch and adjust the batch size and batches in flight.
+
+        Args:
+            latency: Time in seconds the batch took to send, including retries
+            delivered: Whether the batch was delivered
+            full: Whether the batch had the current batch size, i.e. more events were waiting
+        """
+        with self._lock:
+            if self.latency is None:
+                self.latency = latency
+            else:
+                self.latency += self.smoothing * (latency - self.latency)
+            self.error_rate += self.smoothing * ((0.0 if delivered else 1.0) - self.error_rate)
+
+            if not delivered or self.latency > self.target_latency:
+                now = time.monotonic()
+                if now - self._decreased_at >= self.latency:
+                    self._decreased_at = now
+                    self.batch_size = max(self.min_batch_size, int(self.batch_size * self.decrease_factor))
+                    self.in_flight = max(self.min_in_flight, int(self.in_flight * self.decrease_factor))
+            elif full:
+                if self.batch_size < self.max_batch_size:
+                    self.batch_size = min(self.max_batch_size, self.batch_size + self.batch_size_step)
+                elif self.in_flight < self.max_in_flight:
+                    self.in_flight += 1
+
+    def metrics(self) -> typing.Dict[str, typing.Any]:
+        """
+        Get the current values of the controller.
+
+        Returns:
+            A dictionary with the current batch size, maximum batches in
+            flight, smoothed latency and smoothed error rate
+        """
+        return {
+            "batch_size": self.batch_size,
+            "in_flight": self.in_flight,
+            "latency": self.latency,
+            "error_rate": self.error_rate,
+        }
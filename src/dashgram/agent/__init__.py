@@ -0,0 +1,21 @@
+"""
+Dashgram Agent Package.
+
+The agent is a local collector that lets several worker processes share one
+batching uplink to the Dashgram API. Workers created with
+`Dashgram(..., agent_socket=path)` write encoded events to the agent's Unix
+socket without blocking; the agent batches events of all workers and sends
+them with its own compression, retries, spool and connection pool.
+
+Run the agent with:
+
+    python -m dashgram.agent --socket /run/dashgram/agent.sock \
+        --project-id <project_id> --access-key <access_key>
+"""
+
+from dashgram.agent.protocol import encode_frame, read_frame
+from dashgram.agent.server import Agent
+from dashgram.agent.writer import AgentWriter
+
+
+__all__ = ["Agent", "AgentWriter", "encode_frame", "read_frame"]
@@ -0,0 +1,113 @@
+"""
+Dashgram Agent command line interface.
+
+Usage:
+    python -m dashgram.agent --socket /run/dashgram/agent.sock \
+        --project-id <project_id> --access-key <access_key> [options]
+
+The project id and access key can also be given with the DASHGRAM_PROJECT_ID
+and DASHGRAM_ACCESS_KEY environment variables.
+"""
+
+import argparse
+import asyncio
+import os
+import signal
+import typing
+
+from dashgram.agent.server import Agent
+from dashgram.client import Dashgram
+
+DEFAULT_SOCKET = "/tmp/dashgram-agent.sock"
+
+
+def parse_args(argv: typing.Optional[typing.Sequence[str]] = None) -> argparse.Namespace:
+    """
+    Parse the agent's command line arguments.
+
+    Args:
+        argv: The arguments to parse (defaults to sys.argv)
+
+    Returns:
+        The parsed arguments
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m dashgram.agent",
+        description="Collect events of local worker processes and send them to Dashgram in shared batches.",
+    )
+    parser.add_argument("--socket", default=os.environ.get("DASHGRAM_AGENT_SOCKET", DEFAULT_SOCKET),
+                        help=f"path of the Unix socket to listen on (default: {DEFAULT_SOCKET})")
+    parser.add_argument("--socket-mode", type=lambda value: int(value, 8), default=None,
+                        help="permissions of the socket file in octal, e.g. 660")
+    parser.add_argument("--project-id", default=os.environ.get("DASHGRAM_PROJECT_ID"),
+                        help="Dashgram project ID (default: $DASHGRAM_PROJECT_ID)")
+    parser.add_argument("--access-key", default=os.environ.get("DASHGRAM_ACCESS_KEY"),
+                        help="Dashgram access key (default: $DASHGRAM_ACCESS_KEY)")
+    parser.add_argument("--api-url", default=None, help="custom Dashgram API URL")
+    parser.add_argument("--origin", default=None, help="origin string sent with the events")
+    parser.add_argument("--max-batch-size", type=int, default=500, help="maximum number of events per request")
+    parser.add_argument("--max-batch-delay-ms", type=int, default=1000,
+                        help="maximum time an event waits for its batch to fill up")
+    parser.add_argument("--max-queue-size", type=int, default=100000, help="maximum number of queued events")
+    parser.add_argument("--compression", default="auto", choices=["gzip", "zstd", "auto", "none"],
+                        help="request body compression (default: auto)")
+    parser.add_argument("--spool", default=None, help="directory of the on-disk spool for undelivered events")
+    parser.add_argument("--deduplicate", action="store_true", help="skip updates already tracked recently")
+    parser.add_argument("--http2", action="store_true", help="use HTTP/2 (requires dashgram[http2])")
+    parser.add_argument("--shutdown-timeout", type=float, default=10.0,
+                        help="maximum time in seconds to send queued events on shutdown")
+
+    args = parser.parse_args(argv)
+    if not args.project_id or not args.access_key:
+        parser.error("--project-id and --access-key (or DASHGRAM_PROJECT_ID and DASHGRAM_ACCESS_KEY) are required")
+    return args
+
+
+async def run(args: argparse.Namespace) -> int:
+    """
+    Run the agent until SIGINT or SIGTERM.
+
+    Args:
+        args: The parsed command line arguments
+
+    Returns:
+        The number of events that were neither delivered nor spooled on shutdown
+    """
+    sdk = Dashgram(
+        args.project_id,
+        args.access_key,
+        api_url=args.api_url,
+        origin=args.origin,
+        max_batch_size=args.max_batch_size,
+        max_batch_delay_ms=args.max_batch_delay_ms,
+        max_queue_size=args.max_queue_size,
+        compression=None if args.compression == "none" else args.compression,
+        spool=args.spool,
+        deduplicate=args.deduplicate,
+        http2=args.http2,
+    )
+    agent = Agent(sdk, args.socket, socket_mode=args.socket_mode)
+    await agent.start()
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signum, stop.set)
+
+    print(f"Dashgram agent listening on {args.socket}", flush=True)
+    await stop.wait()
+
+    undelivered = await agent.aclose(args.shutdown_timeout)
+    stats = sdk.sender_stats()
+    print(f"Dashgram agent stopped: {agent.received} events received, {stats['sent']} sent, "
+          f"{stats['spooled']} spooled, {stats['dropped']} dropped, {undelivered} not sent", flush=True)
+    return undelivered
+
+
+def main(argv: typing.Optional[typing.Sequence[str]] = None) -> None:
+    """Run the agent from the command line."""
+    asyncio.run(run(parse_args(argv)))
+
+
+if __name__ == "__main__":
+    main()
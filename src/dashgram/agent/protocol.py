@@ -0,0 +1,61 @@
+"""
+Dashgram Agent Protocol Module.
+
+Worker processes send encoded events to the agent over a Unix stream
+socket as length-prefixed frames:
+
+- 4 bytes: length of the event JSON (big-endian)
+- 2 bytes: length of the update type (big-endian)
+- the update type, UTF-8 encoded (empty if unknown)
+- the encoded event JSON
+"""
+
+import asyncio
+import struct
+import typing
+
+FRAME_HEADER = struct.Struct(">IH")
+MAX_EVENT_SIZE = 16 * 1024 * 1024
+
+
+def encode_frame(event: bytes, event_type: typing.Optional[str] = None) -> bytes:
+    """
+    Encode an event as a frame.
+
+    Args:
+        event: The encoded event JSON
+        event_type: The update type of the event (optional)
+
+    Returns:
+        The frame bytes
+
+    Example:
+        >>> encode_frame(b'{"update_id":1}', "message")
+        b'\\x00\\x00\\x00\\x0f\\x00\\x07message{"update_id":1}'
+    """
+    type_bytes = event_type.encode("utf-8") if event_type else b""
+    return FRAME_HEADER.pack(len(event), len(type_bytes)) + type_bytes + event
+
+
+async def read_frame(reader: asyncio.StreamReader) -> typing.Optional[typing.Tuple[bytes, typing.Optional[str]]]:
+    """
+    Read the next frame from a stream.
+
+    Args:
+        reader: The stream to read from
+
+    Returns:
+        The event and its update type, or None if the stream ended
+
+    Raises:
+        ValueError: If the frame is larger than MAX_EVENT_SIZE
+    """
+    try:
+        length, type_length = FRAME_HEADER.unpack(await reader.readexactly(FRAME_HEADER.size))
+        if length > MAX_EVENT_SIZE:
+            raise ValueError(f"Event of {length} bytes exceeds the maximum size")
+        event_type = (await reader.readexactly(type_length)).decode("utf-8") if type_length else None
+        event = await reader.readexactly(length)
+    except asyncio.IncompleteReadError:
+        return None
+    return event, event_type
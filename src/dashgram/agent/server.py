@@ -0,0 +1,117 @@
+"""
+Dashgram Agent Server Module.
+
+This module provides the agent itself: a collector listening on a Unix
+socket that forwards events received from worker processes to the
+Dashgram API through one `Dashgram` client, so events of all processes
+share its batches, compression, retries, spool and connection pool.
+"""
+
+import asyncio
+import os
+import stat
+import typing
+import warnings
+
+from dashgram.agent.protocol import read_frame
+
+if typing.TYPE_CHECKING:
+    from dashgram.client import Dashgram
+
+
+class Agent:
+    """
+    Collector forwarding events received on a Unix socket to the Dashgram API.
+
+    Received events are queued with the client's background sender. When
+    the client has a deduplicator, duplicate updates sent by different
+    processes are skipped.
+
+    Attributes:
+        sdk: The Dashgram client sending the events
+        path: The path of the Unix socket
+        socket_mode: Permissions of the socket file (None to keep the default)
+        received: Number of events received
+        connections: Number of connected worker processes
+
+    Example:
+        >>> sdk = Dashgram(project_id="123", access_key="key", max_batch_size=500)
+        >>> agent = Agent(sdk, "/run/dashgram/agent.sock")
+        >>> await agent.start()
+        >>> ...
+        >>> await agent.aclose()
+    """
+
+    def __init__(self, sdk: "Dashgram", path: typing.Union[str, "os.PathLike[str]"], *,
+                 socket_mode: typing.Optional[int] = None) -> None:
+        """
+        Initialize the agent without listening.
+
+        Args:
+            sdk: The Dashgram client sending the events
+            path: The path of the Unix socket
+            socket_mode: Permissions of the socket file, e.g. 0o660 (None to keep the default)
+        """
+        self.sdk = sdk
+        self.path = os.fspath(path)
+        self.socket_mode = socket_mode
+        self.received = 0
+        self.connections = 0
+        self._server: typing.Optional[asyncio.AbstractServer] = None
+
+    async def start(self) -> None:
+        """
+        Start listening on the Unix socket.
+
+        A socket file left by a previous agent is replaced.
+        """
+        try:
+            if stat.S_ISSOCK(os.stat(self.path).st_mode):
+                os.unlink(self.path)
+        except FileNotFoundError:
+            pass
+
+        self._server = await asyncio.start_unix_server(self._handle, self.path)
+        if self.socket_mode is not None:
+            os.chmod(self.path, self.socket_mode)
+
+    async def aclose(self, timeout: typing.Optional[float] = 5.0) -> int:
+        """
+        Stop listening and send the queued events.
+
+        Args:
+            timeout: Maximum time in seconds to wait for queued events to be sent
+
+        Returns:
+            The number of events that were neither delivered nor spooled
+        """
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+            try:
+                os.unlink(self.path)
+            except FileNotFoundError:
+                pass
+
+        return await self.sdk.aclose(timeout)
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        deduplicator = self.sdk.deduplicator
+        try:
+            while True:
+                frame = await read_frame(reader)
+                if frame is None:
+                    break
+
+                event, event_type = frame
+                self.received += 1
+                if deduplicator is not None and deduplicator.is_duplicate(event):
+                    continue
+                self.sdk._enqueue(event, event_type)
+        except (ValueError, ConnectionError) as e:
+            warnings.warn(f"{type(e).__name__}: {e}")
+        finally:
+            self.connections -= 1
+            writer.close()
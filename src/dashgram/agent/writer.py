@@ -0,0 +1,262 @@
+"""
+Dashgram Agent Writer Module.
+
+This module provides the client side of the agent: a non-blocking writer
+that sends encoded events from a worker process to the agent's Unix socket.
+"""
+
+import collections
+import os
+import select
+import socket
+import threading
+import time
+import typing
+import warnings
+
+from dashgram.agent.protocol import encode_frame
+
+
+class AgentWriter:
+    """
+    Non-blocking writer of events to a Dashgram agent.
+
+    Events are written to the agent's Unix socket without waiting. When the
+    socket buffer is full or the agent is unavailable, frames are buffered
+    up to `max_buffer_bytes`; beyond that, events are dropped. Buffered
+    frames are written with the next event, on flush(), or by a background
+    timer every `retry_interval` seconds, so they are not held back when
+    traffic stops. While the agent is unavailable, the writer reconnects at
+    most every `reconnect_interval` seconds. Frames still buffered at exit
+    are lost unless close() is called.
+
+    The writer is thread-safe.
+
+    Attributes:
+        path: The path of the agent's Unix socket
+        max_buffer_bytes: Maximum size in bytes of the frames waiting to be written
+        reconnect_interval: Minimum time in seconds between two connection attempts
+        retry_interval: Time in seconds between two background attempts to write buffered frames
+        sent: Number of events written to the socket
+        dropped: Number of events dropped because the buffer was full
+        dropped_by_type: Number of dropped events per update type
+
+    Example:
+        >>> writer = AgentWriter("/run/dashgram/agent.sock")
+        >>> writer.send(b'{"update_id":1,"message":{...}}', "message")
+        True
+    """
+
+    def __init__(self, path: typing.Union[str, "os.PathLike[str]"], *,
+                 max_buffer_bytes: int = 8 * 1024 * 1024,
+                 reconnect_interval: float = 1.0,
+                 retry_interval: float = 0.1) -> None:
+        """
+        Initialize the writer without connecting.
+
+        Args:
+            path: The path of the agent's Unix socket
+            max_buffer_bytes: Maximum size in bytes of the frames waiting to be written
+            reconnect_interval: Minimum time in seconds between two connection attempts
+            retry_interval: Time in seconds between two background attempts to write buffered frames
+        """
+        self.path = os.fspath(path)
+        self.max_buffer_bytes = max_buffer_bytes
+        self.reconnect_interval = reconnect_interval
+        self.retry_interval = retry_interval
+
+        self.sent = 0
+        self.dropped = 0
+        self.dropped_by_type: typing.Counter[str] = collections.Counter()
+
+        self._frames: typing.Deque[typing.Tuple[bytes, typing.Optional[str]]] = collections.deque()
+        self._frames_bytes = 0
+        self._offset = 0
+        self._sock: typing.Optional[socket.socket] = None
+        self._next_connect = 0.0
+        self._warned = False
+        self._timer: typing.Optional[threading.Timer] = None
+        self._closed = False
+        self._lock = threading.Lock()
+
+    @property
+    def connected(self) -> bool:
+        """Whether the writer is connected to the agent."""
+        return self._sock is not None
+
+    @property
+    def pending(self) -> int:
+        """Number of events waiting to be written."""
+        return len(self._frames)
+
+    @property
+    def pending_bytes(self) -> int:
+        """Total size in bytes of the frames waiting to be written."""
+        return self._frames_bytes
+
+    def send(self, event: bytes, event_type: typing.Optional[str] = None) -> bool:
+        """
+        Send an event to the agent without blocking.
+
+        Args:
+            event: The encoded event JSON
+            event_type: The update type of the event (optional)
+
+        Returns:
+            True if the event was written or buffered, False if it was dropped
+        """
+        frame = encode_frame(event, event_type)
+        with self._lock:
+            if self._frames_bytes + len(frame) > self.max_buffer_bytes:
+                self._write()
+
+            queued = self._frames_bytes + len(frame) <= self.max_buffer_bytes
+            if queued:
+                self._frames.append((frame, event_type))
+                self._frames_bytes += len(frame)
+                self._write()
+            else:
+                self._count_drop(event_type)
+
+        if not queued:
+            warnings.warn("Dashgram agent buffer is full, event dropped")
+        return queued
+
+    def flush(self, timeout: typing.Optional[float] = None) -> bool:
+        """
+        Wait until the buffered events are written to the socket.
+
+        Args:
+            timeout: Maximum time in seconds to wait (None to wait until written)
+
+        Returns:
+            True if all events were written
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                self._write()
+                if not self._frames:
+                    return True
+                sock = self._sock
+
+            wait = 0.1 if deadline is None else min(0.1, deadline - time.monotonic())
+            if wait <= 0:
+                return False
+            if sock is None:
+                time.sleep(min(wait, 0.05))
+            else:
+                try:
+                    select.select([], [sock], [], wait)
+                except (OSError, ValueError):
+                    pass
+
+    def close(self, timeout: typing.Optional[float] = None) -> int:
+        """
+        Write the buffered events and close the connection.
+
+        Args:
+            timeout: Maximum time in seconds to wait for buffered events to be written
+
+        Returns:
+            The number of events that could not be written
+        """
+        self.flush(timeout)
+        with self._lock:
+            self._closed = True
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            undelivered = len(self._frames)
+            self._frames.clear()
+            self._frames_bytes = 0
+            self._offset = 0
+            if self._sock is not None:
+                self._sock.close()
+                self._sock = None
+        return undelivered
+
+    def _count_drop(self, event_type: typing.Optional[str]) -> None:
+        self.dropped += 1
+        self.dropped_by_type[event_type or "unknown"] += 1
+
+    def _connect(self) -> bool:
+        # Called with the lock held
+        if self._sock is not None:
+            return True
+
+        now = time.monotonic()
+        if now < self._next_connect:
+            return False
+
+        # Connecting a non-blocking Unix socket never waits: it fails with
+        # EAGAIN when the agent's backlog is full
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.setblocking(False)
+        try:
+            sock.connect(self.path)
+        except OSError as e:
+            sock.close()
+            self._next_connect = now + self.reconnect_interval
+            if not self._warned:
+                self._warned = True
+                warnings.warn(f"Dashgram agent is unavailable: {e}")
+            return False
+
+        self._sock = sock
+        self._warned = False
+        return True
+
+    def _disconnect(self) -> None:
+        # Called with the lock held. A partially written frame cannot be
+        # resumed on a new connection, so it is dropped.
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+        self._next_connect = time.monotonic() + self.reconnect_interval
+
+        if self._offset:
+            frame, event_type = self._frames.popleft()
+            self._frames_bytes -= len(frame)
+            self._offset = 0
+            self._count_drop(event_type)
+
+    def _retry(self) -> None:
+        with self._lock:
+            self._timer = None
+            if not self._closed:
+                self._write()
+
+    def _write(self) -> None:
+        # Called with the lock held. Frames left in the buffer are retried
+        # by a timer until they are written.
+        self._write_frames()
+        if self._frames and self._timer is None and not self._closed:
+            self._timer = threading.Timer(self.retry_interval, self._retry)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _write_frames(self) -> None:
+        # Called with the lock held
+        if not self._frames or not self._connect():
+            return
+        assert self._sock is not None
+
+        while self._frames:
+            frame, _ = self._frames[0]
+            try:
+                written = self._sock.send(memoryview(frame)[self._offset:])
+            except BlockingIOError:
+                return
+            except OSError:
+                self._disconnect()
+                return
+
+            self._offset += written
+            if self._offset < len(frame):
+                return
+
+            self._frames.popleft()
+            self._frames_bytes -= len(frame)
+            self._offset = 0
+            self.sent += 1
@@ -0,0 +1,460 @@
+"""
+Dashgram SDK Backfill Module.
+
+This module loads historical raw Telegram updates into Dashgram. Updates
+are streamed from a JSONL/NDJSON file (optionally gzip-compressed), one
+update per line, sent in `/track` batches by concurrent uploads, and the
+progress is checkpointed so an interrupted run resumes where it stopped.
+
+Usage:
+    python -m dashgram.backfill updates.jsonl.gz \
+        --project-id <project_id> --access-key <access_key> [options]
+
+The project id and access key can also be given with the DASHGRAM_PROJECT_ID
+and DASHGRAM_ACCESS_KEY environment variables.
+"""
+
+import argparse
+import asyncio
+import gzip
+import json
+import os
+import sys
+import time
+import typing
+
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
+from dashgram.batching import to_batch_result
+from dashgram.client import Dashgram
+from dashgram.ratelimit import TokenBucket
+
+GZIP_MAGIC = b"\x1f\x8b"
+
+
+def is_json_object(line: bytes) -> bool:
+    """
+    Check whether a line holds a complete JSON object.
+
+    Args:
+        line: The stripped line
+
+    Returns:
+        True if the line parses as a JSON object
+    """
+    if line[:1] != b"{":
+        return False
+    try:
+        return isinstance(json_loads(line), dict)
+    except ValueError:
+        return False
+
+
+class LineBatch(typing.NamedTuple):
+    """
+    Updates read from the input file together with the position after them.
+
+    Attributes:
+        seq: Sequence number of the batch
+        events: The encoded updates
+        lines: Number of lines read, including skipped ones
+        offset: The offset in the uncompressed input after the last line
+    """
+
+    seq: int
+    events: typing.List[bytes]
+    lines: int
+    offset: int
+
+
+class LineReader:
+    """
+    Streaming reader of JSONL/NDJSON updates.
+
+    Lines are read one by one, so the file is never loaded into memory.
+    Gzip-compressed files are detected by their magic bytes. Blank lines
+    are ignored; lines that are not valid JSON objects, such as a truncated
+    last line of a crashed log, are counted in `skipped`, so they never make
+    the API reject a whole batch.
+
+    Attributes:
+        path: The path of the input file
+        offset: The offset in the uncompressed input of the next line
+        skipped: Number of lines skipped because they are not JSON objects
+    """
+
+    def __init__(self, path: typing.Union[str, "os.PathLike[str]"], offset: int = 0) -> None:
+        """
+        Open the input file.
+
+        Args:
+            path: The path of the input file
+            offset: The offset in the uncompressed input to start reading at
+        """
+        self.path = os.fspath(path)
+        self.skipped = 0
+        self._seq = 0
+
+        with open(self.path, "rb") as f:
+            compressed = f.read(2) == GZIP_MAGIC
+
+        self._file: typing.BinaryIO = gzip.open(self.path, "rb") if compressed else open(self.path, "rb", buffering=1024 * 1024)
+        if offset:
+            self._file.seek(offset)
+        self.offset = offset
+
+    def read_batch(self, max_events: int) -> typing.Optional[LineBatch]:
+        """
+        Read the next batch of updates.
+
+        Args:
+            max_events: Maximum number of updates in the batch
+
+        Returns:
+            The batch, or None at the end of the file
+        """
+        events = []
+        lines = 0
+        readline = self._file.readline
+        while len(events) < max_events:
+            line = readline()
+            if not line:
+                break
+            lines += 1
+            self.offset += len(line)
+
+            line = line.strip()
+            if not line:
+                continue
+            if not is_json_object(line):
+                self.skipped += 1
+                continue
+            events.append(line)
+
+        if not lines:
+            return None
+
+        self._seq += 1
+        return LineBatch(self._seq, events, lines, self.offset)
+
+    def close(self) -> None:
+        """Close the input file."""
+        self._file.close()
+
+
+class Checkpoint:
+    """
+    Progress of a backfill stored in a JSON file.
+
+    The file is replaced atomically, so an interrupted write never corrupts it.
+
+    Attributes:
+        path: The path of the checkpoint file
+        offset: The offset in the uncompressed input up to which updates were handled
+        lines: Number of lines up to the offset
+    """
+
+    def __init__(self, path: typing.Union[str, "os.PathLike[str]"]) -> None:
+        """
+        Load the checkpoint, if the file exists.
+
+        Args:
+            path: The path of the checkpoint file
+        """
+        self.path = os.fspath(path)
+        self.offset = 0
+        self.lines = 0
+
+        try:
+            with open(self.path, "rb") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        self.offset = int(data["offset"])
+        self.lines = int(data["lines"])
+
+    def save(self) -> None:
+        """Write the checkpoint file."""
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"offset": self.offset, "lines": self.lines}, f)
+        os.replace(tmp_path, self.path)
+
+    def remove(self) -> None:
+        """Remove the checkpoint file."""
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
+
+
+class BackfillStats:
+    """
+    Counters of a backfill run.
+
+    Attributes:
+        lines: Number of lines handled, including those of earlier runs
+        sent: Number of updates delivered in this run
+        failed: Number of updates that could not be delivered in this run
+        skipped: Number of lines skipped because they are not JSON objects
+        bytes: Total size in bytes of the delivered updates
+        started: Monotonic time the run started at
+        completed: Whether the whole file was handled
+    """
+
+    def __init__(self, lines: int = 0) -> None:
+        self.lines = lines
+        self.sent = 0
+        self.failed = 0
+        self.skipped = 0
+        self.bytes = 0
+        self.started = time.monotonic()
+        self.completed = False
+
+    @property
+    def elapsed(self) -> float:
+        """Time in seconds since the run started."""
+        return time.monotonic() - self.started
+
+    def __str__(self) -> str:
+        elapsed = max(self.elapsed, 1e-9)
+        return (f"{self.lines} lines, {self.sent} sent, {self.failed} failed, {self.skipped} skipped, "
+                f"{self.sent / elapsed:.0f} updates/s, {self.bytes / elapsed / 1e6:.2f} MB/s")
+
+
+async def backfill(sdk: Dashgram, path: typing.Union[str, "os.PathLike[str]"], *,
+                   batch_size: int = 500,
+                   concurrency: int = 4,
+                   max_requests_per_second: typing.Optional[float] = None,
+                   checkpoint: typing.Optional[Checkpoint] = None,
+                   checkpoint_interval: float = 1.0,
+                   failed_path: typing.Union[str, "os.PathLike[str]", None] = None,
+                   progress: typing.Optional[typing.Callable[[BackfillStats], None]] = None,
+                   progress_interval: float = 5.0) -> BackfillStats:
+    """
+    Send the updates of a JSONL file to Dashgram.
+
+    The file is read in a worker thread while up to `concurrency` batches
+    are uploaded. Failed batches are retried according to the client's
+    `retry` policy. A batch that still fails is appended to `failed_path`
+    if given; otherwise the run stops, and the checkpoint points to the
+    first batch that was not delivered.
+
+    Args:
+        sdk: The Dashgram client sending the updates
+        path: The path of the JSONL/NDJSON file, optionally gzip-compressed
+        batch_size: Maximum number of updates per request
+        concurrency: Maximum number of requests in flight
+        max_requests_per_second: Maximum request rate (None for no limit)
+        checkpoint: Checkpoint to resume from and to update (optional)
+        checkpoint_interval: Minimum time in seconds between two checkpoint writes
+        failed_path: File the updates of failed batches are appended to (optional)
+        progress: Callback called with the stats every `progress_interval` seconds (optional)
+        progress_interval: Time in seconds between two progress callbacks
+
+    Returns:
+        The counters of the run
+
+    Example:
+        >>> async with Dashgram(project_id="123", access_key="key") as sdk:
+        ...     stats = await backfill(sdk, "updates.jsonl.gz", concurrency=8,
+        ...                            checkpoint=Checkpoint("updates.checkpoint"))
+    """
+    if batch_size < 1:
+        raise ValueError("batch_size must be at least 1")
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1")
+
+    reader = LineReader(path, checkpoint.offset if checkpoint is not None else 0)
+    stats = BackfillStats(checkpoint.lines if checkpoint is not None else 0)
+    limiter = TokenBucket(max_requests_per_second, burst=1) if max_requests_per_second else None
+    failed_file = open(failed_path, "ab") if failed_path is not None else None
+
+    queue: "asyncio.Queue[typing.Optional[LineBatch]]" = asyncio.Queue(maxsize=concurrency)
+    stop = asyncio.Event()
+    # Batches complete out of order; the checkpoint only advances over a
+    # contiguous prefix of handled batches
+    handled: typing.Dict[int, LineBatch] = {}
+    next_seq = 1
+    last_save = time.monotonic()
+
+    def advance(batch: LineBatch) -> None:
+        nonlocal next_seq, last_save
+        handled[batch.seq] = batch
+        while next_seq in handled:
+            done = handled.pop(next_seq)
+            next_seq += 1
+            stats.lines += done.lines
+            if checkpoint is not None:
+                checkpoint.offset = done.offset
+                checkpoint.lines = stats.lines
+        if checkpoint is not None and time.monotonic() - last_save >= checkpoint_interval:
+            checkpoint.save()
+            last_save = time.monotonic()
+
+    async def produce() -> None:
+        while not stop.is_set():
+            batch = await asyncio.to_thread(reader.read_batch, batch_size)
+            if batch is None:
+                stats.completed = True
+                break
+            await queue.put(batch)
+        for _ in range(concurrency):
+            await queue.put(None)
+
+    async def upload() -> None:
+        while True:
+            batch = await queue.get()
+            if batch is None:
+                return
+            if stop.is_set():
+                continue
+
+            if batch.events:
+                if limiter is not None:
+                    await limiter.acquire()
+                result = to_batch_result(batch.events, await sdk._send_batch(batch.events))
+                undelivered = result.retry + result.failed
+                stats.sent += len(batch.events) - len(undelivered)
+                stats.bytes += sum(len(event) for event in batch.events) - sum(len(event) for event in undelivered)
+                if undelivered:
+                    stats.failed += len(undelivered)
+                    if failed_file is None:
+                        stop.set()
+                        continue
+                    failed_file.write(b"\n".join(undelivered) + b"\n")
+            advance(batch)
+
+    async def report() -> None:
+        assert progress is not None
+        while True:
+            await asyncio.sleep(progress_interval)
+            stats.skipped = reader.skipped
+            progress(stats)
+
+    reporter = asyncio.ensure_future(report()) if progress is not None else None
+    tasks = [asyncio.ensure_future(produce())] + [asyncio.ensure_future(upload()) for _ in range(concurrency)]
+    try:
+        await asyncio.gather(*tasks)
+    except BaseException:
+        # Stop the reader and the other uploads before the file is closed
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+    finally:
+        if reporter is not None:
+            reporter.cancel()
+        stats.skipped = reader.skipped
+        reader.close()
+        if failed_file is not None:
+            failed_file.close()
+        if checkpoint is not None:
+            checkpoint.save()
+
+    stats.completed = stats.completed and not stop.is_set()
+    return stats
+
+
+def parse_args(argv: typing.Optional[typing.Sequence[str]] = None) -> argparse.Namespace:
+    """
+    Parse the backfill's command line arguments.
+
+    Args:
+        argv: The arguments to parse (defaults to sys.argv)
+
+    Returns:
+        The parsed arguments
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m dashgram.backfill",
+        description="Send historical raw Telegram updates from a JSONL file (optionally gzip-compressed) to Dashgram.",
+    )
+    parser.add_argument("path", help="JSONL/NDJSON file with one raw Telegram update per line")
+    parser.add_argument("--project-id", default=os.environ.get("DASHGRAM_PROJECT_ID"),
+                        help="Dashgram project ID (default: $DASHGRAM_PROJECT_ID)")
+    parser.add_argument("--access-key", default=os.environ.get("DASHGRAM_ACCESS_KEY"),
+                        help="Dashgram access key (default: $DASHGRAM_ACCESS_KEY)")
+    parser.add_argument("--api-url", default=None, help="custom Dashgram API URL")
+    parser.add_argument("--origin", default=None, help="origin string sent with the updates")
+    parser.add_argument("--batch-size", type=int, default=500, help="maximum number of updates per request")
+    parser.add_argument("--concurrency", type=int, default=4, help="maximum number of requests in flight")
+    parser.add_argument("--max-requests-per-second", type=float, default=None, help="maximum request rate")
+    parser.add_argument("--checkpoint", default=None,
+                        help="checkpoint file to resume from (default: <path>.checkpoint)")
+    parser.add_argument("--restart", action="store_true", help="ignore the checkpoint and start from the beginning")
+    parser.add_argument("--failed", default=None,
+                        help="file to append updates of failed batches to; without it the run stops at the first failure")
+    parser.add_argument("--compression", default="auto", choices=["gzip", "zstd", "auto", "none"],
+                        help="request body compression (default: auto)")
+    parser.add_argument("--http2", action="store_true", help="use HTTP/2 (requires dashgram[http2])")
+    parser.add_argument("--progress-interval", type=float, default=5.0,
+                        help="time in seconds between two progress lines")
+
+    args = parser.parse_args(argv)
+    if not args.project_id or not args.access_key:
+        parser.error("--project-id and --access-key (or DASHGRAM_PROJECT_ID and DASHGRAM_ACCESS_KEY) are required")
+    if args.checkpoint is None:
+        args.checkpoint = args.path + ".checkpoint"
+    return args
+
+
+async def run(args: argparse.Namespace) -> BackfillStats:
+    """
+    Run a backfill from the command line arguments.
+
+    Args:
+        args: The parsed command line arguments
+
+    Returns:
+        The counters of the run
+    """
+    checkpoint = Checkpoint(args.checkpoint)
+    if args.restart:
+        checkpoint.offset = checkpoint.lines = 0
+    elif checkpoint.offset:
+        print(f"Resuming {args.path} at line {checkpoint.lines}", file=sys.stderr, flush=True)
+
+    def print_progress(stats: BackfillStats) -> None:
+        print(stats, file=sys.stderr, flush=True)
+
+    async with Dashgram(
+        args.project_id,
+        args.access_key,
+        api_url=args.api_url,
+        origin=args.origin,
+        compression=None if args.compression == "none" else args.compression,
+        http2=args.http2,
+        max_connections=max(args.concurrency, 1),
+    ) as sdk:
+        stats = await backfill(
+            sdk,
+            args.path,
+            batch_size=args.batch_size,
+            concurrency=args.concurrency,
+            max_requests_per_second=args.max_requests_per_second,
+            checkpoint=checkpoint,
+            failed_path=args.failed,
+            progress=print_progress,
+            progress_interval=args.progress_interval,
+        )
+
+    if stats.completed:
+        checkpoint.remove()
+        print(f"Backfill completed: {stats}", file=sys.stderr, flush=True)
+    else:
+        print(f"Backfill stopped at line {checkpoint.lines}: {stats}", file=sys.stderr, flush=True)
+    return stats
+
+
+def main(argv: typing.Optional[typing.Sequence[str]] = None) -> None:
+    """Run the backfill from the command line."""
+    stats = asyncio.run(run(parse_args(argv)))
+    sys.exit(0 if stats.completed else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,611 @@
+"""
+Dashgram SDK Batching Module.
+
+This module provides the background batch sender used by
+`Dashgram.track_event_nowait()`. Events are collected in a bounded
+in-process queue and sent to the Dashgram API in batches, so handlers never
+wait for the network.
+"""
+
+import asyncio
+import collections
+import threading
+import typing
+import warnings
+
+from dashgram.adaptive import AdaptiveBatching
+from dashgram.enums import OverflowPolicy
+from dashgram.spool import Spool
+
+_UNKNOWN_TYPE = "unknown"
+
+
+class BatchResult(typing.NamedTuple):
+    """
+    Outcome of the delivery of a batch.
+
+    Events of the batch that are in neither list were delivered.
+
+    Attributes:
+        retry: Undelivered events whose failure is transient, e.g. a transport
+            error or a retryable API status, which can be sent again later
+        failed: Undelivered events that were permanently rejected
+    """
+
+    retry: typing.List[typing.Any]
+    failed: typing.List[typing.Any] = []
+
+
+def to_batch_result(batch: typing.List[typing.Any], result: typing.Union[bool, BatchResult]) -> BatchResult:
+    """
+    Normalize the return value of a `send_batch` function.
+
+    Args:
+        batch: The events that were sent
+        result: A BatchResult, or a boolean where True means the whole batch
+            was delivered and False that it can be sent again later
+
+    Returns:
+        The outcome of the delivery as a BatchResult
+    """
+    if isinstance(result, BatchResult):
+        return result
+    return BatchResult([] if result else batch)
+
+
+class BatchSender:
+    """
+    Background sender that groups queued events into batches.
+
+    Events are put into an in-memory queue and a sender task drains it. A
+    batch is sent as soon as it contains `max_batch_size` events or when
+    `max_batch_delay_ms` milliseconds have passed since its first event,
+    whichever happens first.
+
+    The queue is bounded by the number of events (`max_queue_size`) and by
+    the total size of the encoded events (`max_queue_bytes`). When it is
+    full, the `overflow` policy decides what happens to a new event:
+
+    - `drop_newest`: the new event is dropped
+    - `drop_oldest`: the oldest queued events are dropped to make room
+    - `block`: the caller waits up to `block_timeout` seconds for room, then
+      the new event is dropped. Only callers in threads other than the
+      sender's event loop can wait; in the loop itself the event is dropped
+      right away, since blocking would stop the sender
+    - `spill`: the new event is written to the spool
+
+    With an `adaptive` controller, the batch size and the number of batches
+    sent concurrently follow the controller instead of `max_batch_size` and
+    one batch at a time.
+
+    With a spool, events whose delivery failed transiently are written to
+    disk, and so are new batches while the spool holds a backlog, to keep
+    events in order. The backlog is drained oldest first once the API accepts
+    events again. Events the API rejects permanently are counted as failed
+    and never spooled, so they cannot block the backlog. Only the undelivered
+    events of a partly delivered batch are spooled; when that batch was
+    drained from the spool, they are appended again behind the newer
+    spooled events. Events that cannot be written to the spool, e.g. when
+    the disk is full, are counted as failed and dropped.
+
+    With an `encode` function, events may be queued unencoded; they are
+    encoded by the sender task right before their batch is sent or spooled,
+    and are not counted by `max_queue_bytes`.
+
+    The sender is bound to the event loop it was started on and is started
+    lazily by the first `put_nowait()` call. Once started, events can also be
+    queued from other threads.
+
+    Attributes:
+        max_batch_size: Maximum number of events sent in one request
+        max_batch_delay_ms: Maximum time an event waits for its batch to fill up
+        max_queue_size: Maximum number of events waiting to be sent
+        max_queue_bytes: Maximum total size in bytes of the events waiting to be sent
+        overflow: Policy applied to new events when the queue is full
+        block_timeout: Maximum time in seconds a caller waits for room with the block policy
+        sent: Number of events delivered successfully
+        failed: Number of events whose delivery failed
+        dropped: Number of events dropped because the queue was full
+        dropped_by_type: Number of dropped events per update type
+        spooled: Number of events written to the spool
+        adaptive: Controller of the batch size and batches in flight (optional)
+        encode: Function encoding queued events that are not bytes (optional)
+
+    Example:
+        >>> sender = BatchSender(sdk._send_batch, max_batch_size=100, max_batch_delay_ms=500)
+        >>> sender.put_nowait(b'{"update_id":1,"message":{...}}', "message")
+        >>> await sender.flush()
+    """
+
+    def __init__(self, send_batch: typing.Callable[[typing.List[typing.Any]], typing.Awaitable[typing.Union[bool, BatchResult]]], *,
+                 max_batch_size: int = 100,
+                 max_batch_delay_ms: int = 500,
+                 max_queue_size: int = 10000,
+                 max_queue_bytes: int = 0,
+                 overflow: typing.Union[OverflowPolicy, str] = OverflowPolicy.DROP_NEWEST,
+                 block_timeout: float = 1.0,
+                 spool: typing.Optional[Spool] = None,
+                 drain_interval: float = 1.0,
+                 max_drain_interval: float = 30.0,
+                 adaptive: typing.Optional[AdaptiveBatching] = None,
+                 encode: typing.Optional[typing.Callable[[typing.Any], bytes]] = None) -> None:
+        """
+        Initialize the batch sender.
+
+        Args:
+            send_batch: Coroutine function delivering a list of events, returns a BatchResult,
+                or True on success and False if the batch can be sent again later
+            max_batch_size: Maximum number of events sent in one request
+            max_batch_delay_ms: Maximum time in milliseconds an event waits for its batch
+            max_queue_size: Maximum number of queued events (0 for unbounded)
+            max_queue_bytes: Maximum total size in bytes of the queued events (0 for
+                unbounded). Only encoded `bytes` events are counted
+            overflow: Policy applied to new events when the queue is full
+            block_timeout: Maximum time in seconds a caller waits for room with the block policy
+            spool: Disk spool for undelivered events, which must then be encoded bytes (optional)
+            drain_interval: Delay in seconds before retrying to drain the spool after a failure
+            max_drain_interval: Maximum delay in seconds between attempts to drain the spool
+            adaptive: Controller adapting the batch size and batches in flight (optional)
+            encode: Function encoding queued events that are not `bytes`, called by the
+                sender task right before a batch is sent or spooled (optional)
+
+        Raises:
+            ValueError: If a setting is invalid, or the spill policy is used without a spool
+        """
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        if max_batch_delay_ms < 0:
+            raise ValueError("max_batch_delay_ms must not be negative")
+
+        overflow = OverflowPolicy(overflow)
+        if overflow == OverflowPolicy.SPILL and spool is None:
+            raise ValueError("The spill overflow policy requires a spool")
+
+        self._send_batch = send_batch
+        self.max_batch_size = max_batch_size
+        self.max_batch_delay_ms = max_batch_delay_ms
+        self.max_queue_size = max_queue_size
+        self.max_queue_bytes = max_queue_bytes
+        self.overflow = overflow
+        self.block_timeout = block_timeout
+        self.spool = spool
+        self.drain_interval = drain_interval
+        self.max_drain_interval = max_drain_interval
+        self.adaptive = adaptive
+        self.encode = encode
+
+        self.sent = 0
+        self.failed = 0
+        self.dropped = 0
+        self.dropped_by_type: typing.Counter[str] = collections.Counter()
+        self.spooled = 0
+
+        self._drain_delay = 0.0
+        self._next_drain = 0.0
+
+        # Queued events as (event, update type, size) tuples. The lock guards
+        # the queue and its counters, as producers may run in other threads.
+        self._queue: typing.Deque[typing.Tuple[typing.Any, typing.Optional[str], int]] = collections.deque()
+        self._queue_bytes = 0
+        self._unfinished = 0
+        self._batch: typing.List[typing.Any] = []
+        # Batches being sent by delivery tasks, spooled by close() if cancelled
+        self._deliveries: typing.Dict[asyncio.Task, typing.List[typing.Any]] = {}
+        self._lock = threading.Condition()
+        self._blocked = 0
+        # The sender task sleeps on _wakeup while _waiting is set, and is
+        # woken once the queue holds _wake_at events.
+        self._waiting = False
+        self._wake_at = 1
+        self._flushing = 0
+
+        self._loop: typing.Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: typing.Optional[asyncio.Event] = None
+        self._idle: typing.Optional[asyncio.Event] = None
+        self._task: typing.Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        """Whether the sender task is currently running."""
+        if self._task is None or self._task.done():
+            return False
+        return self._loop is not None and not self._loop.is_closed()
+
+    @property
+    def pending(self) -> int:
+        """Number of events waiting in the queue."""
+        return len(self._queue)
+
+    @property
+    def pending_bytes(self) -> int:
+        """Total size in bytes of the events waiting in the queue."""
+        return self._queue_bytes
+
+    @property
+    def unsent(self) -> int:
+        """Number of events queued or being sent."""
+        return max(self._unfinished, 0)
+
+    @property
+    def batch_size(self) -> int:
+        """The current maximum number of events per batch."""
+        return self.adaptive.batch_size if self.adaptive is not None else self.max_batch_size
+
+    @property
+    def max_in_flight(self) -> int:
+        """The current maximum number of batches sent concurrently."""
+        return self.adaptive.in_flight if self.adaptive is not None else 1
+
+    @property
+    def in_flight(self) -> int:
+        """Number of batches being sent."""
+        return len(self._deliveries)
+
+    def start(self) -> None:
+        """
+        Start the sender task on the currently running event loop.
+
+        Raises:
+            RuntimeError: If called without a running event loop
+        """
+        if self.running:
+            return
+
+        loop = asyncio.get_running_loop()
+        self._loop = loop
+        self._wakeup = asyncio.Event()
+        self._idle = asyncio.Event()
+        self._waiting = False
+        self._task = loop.create_task(self._run())
+
+    def put_nowait(self, event: typing.Any, event_type: typing.Optional[str] = None) -> bool:
+        """
+        Queue an event for sending.
+
+        Returns immediately, except with the block overflow policy when the
+        queue is full and the caller runs outside the sender's event loop.
+
+        Args:
+            event: The prepared event to send
+            event_type: The update type of the event, used to count dropped events (optional)
+
+        Returns:
+            True if the event was queued or spilled to the spool, False if it was dropped
+        """
+        if not self.running:
+            self.start()
+
+        in_loop = self._in_loop()
+        size = len(event) if isinstance(event, (bytes, bytearray)) else 0
+        fits = not self.max_queue_bytes or size <= self.max_queue_bytes
+
+        with self._lock:
+            if fits and not self._has_room(size):
+                if self.overflow == OverflowPolicy.DROP_OLDEST:
+                    while not self._has_room(size):
+                        _, dropped_type, dropped_size = self._queue.popleft()
+                        self._queue_bytes -= dropped_size
+                        self._unfinished -= 1
+                        self._count_drop(dropped_type)
+                elif self.overflow == OverflowPolicy.BLOCK and not in_loop:
+                    self._blocked += 1
+                    self._wake(in_loop)
+                    try:
+                        self._lock.wait_for(lambda: self._has_room(size), self.block_timeout)
+                    finally:
+                        self._blocked -= 1
+
+            queued = fits and self._has_room(size)
+            if queued:
+                self._queue.append((event, event_type, size))
+                self._queue_bytes += size
+                self._unfinished += 1
+                if len(self._queue) >= self._wake_at or self._blocked:
+                    self._wake(in_loop)
+            elif self.overflow != OverflowPolicy.SPILL:
+                self._count_drop(event_type)
+
+        if queued:
+            return True
+        if self.overflow == OverflowPolicy.SPILL:
+            return self._spill(event, in_loop)
+
+        warnings.warn("Dashgram event queue is full, event dropped")
+        return False
+
+    async def flush(self) -> None:
+        """
+        Wait until every queued event has been sent.
+
+        While a flush is waiting, batches are sent without waiting for
+        `max_batch_delay_ms`.
+        """
+        if not self.running:
+            return
+        assert self._idle is not None
+
+        self._flushing += 1
+        try:
+            while True:
+                with self._lock:
+                    if self._unfinished <= 0:
+                        return
+                    self._idle.clear()
+                    self._wake(in_loop=True)
+                await self._idle.wait()
+        finally:
+            self._flushing -= 1
+
+    async def close(self, timeout: typing.Optional[float] = None) -> int:
+        """
+        Send the remaining events and stop the sender task.
+
+        Events that are not sent within the timeout, including batches whose
+        requests are still in flight, are written to the spool if there is
+        one, and discarded otherwise.
+
+        Args:
+            timeout: Maximum time in seconds to wait for queued events to be sent (None to wait for all)
+
+        Returns:
+            The number of events that were neither delivered nor spooled
+        """
+        if self.running:
+            try:
+                await asyncio.wait_for(self.flush(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        # Cancelled deliveries remove themselves from _deliveries, their
+        # batches are taken from this copy
+        deliveries = dict(self._deliveries)
+        for delivery in deliveries:
+            delivery.cancel()
+        await asyncio.gather(*deliveries, return_exceptions=True)
+
+        with self._lock:
+            remaining = [event for delivery, batch in deliveries.items() if delivery.cancelled() for event in batch]
+            remaining += self._batch + [event for event, _, _ in self._queue]
+            self._deliveries.clear()
+            self._batch = []
+            self._queue.clear()
+            self._queue_bytes = 0
+            self._unfinished = 0
+            self._lock.notify_all()
+
+        if self.spool is not None:
+            if remaining and self._spool_batch(remaining):
+                remaining = []
+            try:
+                self.spool.sync()
+            except Exception as e:
+                warnings.warn(f"{type(e).__name__}: {e}")
+        return len(remaining)
+
+    def _in_loop(self) -> bool:
+        try:
+            return asyncio.get_running_loop() is self._loop
+        except RuntimeError:
+            return False
+
+    def _has_room(self, size: int) -> bool:
+        if self.max_queue_size and len(self._queue) >= self.max_queue_size:
+            return False
+        return not self.max_queue_bytes or self._queue_bytes + size <= self.max_queue_bytes
+
+    def _count_drop(self, event_type: typing.Optional[str]) -> None:
+        self.dropped += 1
+        self.dropped_by_type[event_type or _UNKNOWN_TYPE] += 1
+
+    def _wake(self, in_loop: bool) -> None:
+        # Called with the lock held
+        if not self._waiting:
+            return
+        self._waiting = False
+
+        assert self._loop is not None and self._wakeup is not None
+        if in_loop:
+            self._wakeup.set()
+        else:
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    def _spill(self, event: typing.Any, in_loop: bool) -> bool:
+        assert self._loop is not None
+        if not in_loop:
+            self._loop.call_soon_threadsafe(self._spill, event, True)
+            return True
+
+        spooled = self._spool_batch([event])
+        with self._lock:
+            self._wake(in_loop)
+        return spooled
+
+    def _task_done(self, count: int) -> None:
+        assert self._idle is not None
+        with self._lock:
+            self._unfinished -= count
+            idle = self._unfinished <= 0
+        if idle:
+            self._idle.set()
+
+    async def _collect(self, timeout: typing.Optional[float] = None) -> typing.List[typing.Any]:
+        assert self._loop is not None and self._wakeup is not None
+        # The batch is shared with close(), which spools it if the task is cancelled
+        batch: typing.List[typing.Any] = []
+        self._batch = batch
+        deadline = None
+        batch_size = self.batch_size
+
+        while True:
+            with self._lock:
+                while self._queue and len(batch) < batch_size:
+                    event, _, size = self._queue.popleft()
+                    self._queue_bytes -= size
+                    batch.append(event)
+                if batch and self._blocked:
+                    self._lock.notify_all()
+
+                if len(batch) >= batch_size:
+                    break
+                if batch:
+                    if deadline is None:
+                        deadline = self._loop.time() + self.max_batch_delay_ms / 1000
+                    timeout = 0 if self._flushing else deadline - self._loop.time()
+                if timeout is not None and timeout <= 0:
+                    break
+
+                self._wake_at = batch_size - len(batch) if batch else 1
+                if self.max_queue_size:
+                    self._wake_at = min(self._wake_at, self.max_queue_size)
+                self._waiting = True
+                self._wakeup.clear()
+
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+            finally:
+                self._waiting = False
+
+            if not batch:
+                # Woken up without a timeout to wait for: take what is queued
+                # and return, so the caller can look at the spool again.
+                timeout = 0
+
+        return batch
+
+    async def _deliver(self, batch: typing.List[typing.Any]) -> BatchResult:
+        try:
+            return to_batch_result(batch, await self._send_batch(batch))
+        except Exception as e:
+            warnings.warn(f"{type(e).__name__}: {e}")
+            return BatchResult(batch)
+
+    def _encode_batch(self, batch: typing.List[typing.Any]) -> typing.List[typing.Any]:
+        if self.encode is None:
+            return batch
+
+        encoded = []
+        for event in batch:
+            if isinstance(event, bytes):
+                encoded.append(event)
+                continue
+            try:
+                encoded.append(self.encode(event))
+            except Exception as e:
+                self.failed += 1
+                warnings.warn(f"{type(e).__name__}: {e}")
+        return encoded
+
+    def _spool_batch(self, batch: typing.List[typing.Any]) -> bool:
+        batch = self._encode_batch(batch)
+        if not self._append_spool(batch):
+            return False
+        self.spooled += len(batch)
+        return True
+
+    def _append_spool(self, events: typing.List[bytes]) -> bool:
+        # Spool I/O errors (e.g. a full disk) drop the events instead of
+        # stopping the sender or raising in the caller of put_nowait()
+        assert self.spool is not None
+        try:
+            self.spool.append(events)
+        except Exception as e:
+            self.failed += len(events)
+            warnings.warn(f"{type(e).__name__}: {e}")
+            return False
+        return True
+
+    async def _drain_spool(self) -> None:
+        assert self.spool is not None and self._loop is not None
+        batch_size = self.batch_size
+        try:
+            batch = self.spool.read(batch_size)
+            if not batch.events:
+                self.spool.commit(batch)
+                return
+        except Exception as e:
+            warnings.warn(f"{type(e).__name__}: {e}")
+            self._drain_delay = min(self.max_drain_interval, max(self.drain_interval, self._drain_delay * 2))
+            self._next_drain = self._loop.time() + self._drain_delay
+            return
+
+        started = self._loop.time()
+        result = await self._deliver(batch.events)
+        if self.adaptive is not None:
+            self.adaptive.record(self._loop.time() - started, not result.retry, len(batch.events) >= batch_size)
+        undelivered = len(result.retry) + len(result.failed)
+        if len(result.retry) < len(batch.events):
+            # Delivered and permanently rejected events are committed, so
+            # they are neither sent twice nor block the events after them.
+            # Retryable events of a partly delivered batch are appended to
+            # the spool again, behind the events spooled since.
+            try:
+                self.spool.commit(batch)
+            except Exception as e:
+                warnings.warn(f"{type(e).__name__}: {e}")
+            self.sent += len(batch.events) - undelivered
+            self.failed += len(result.failed)
+            if result.retry:
+                self._append_spool(result.retry)
+        if not result.retry:
+            self._drain_delay = 0.0
+        else:
+            self._drain_delay = min(self.max_drain_interval, max(self.drain_interval, self._drain_delay * 2))
+        self._next_drain = self._loop.time() + self._drain_delay
+
+    async def _send(self, batch: typing.List[typing.Any], full: bool) -> None:
+        assert self._loop is not None
+        try:
+            started = self._loop.time()
+            result = await self._deliver(batch)
+            if self.adaptive is not None:
+                self.adaptive.record(self._loop.time() - started, not result.retry, full)
+
+            self.sent += len(batch) - len(result.retry) - len(result.failed)
+            self.failed += len(result.failed)
+            if result.retry:
+                if self.spool is not None:
+                    self._spool_batch(result.retry)
+                    self._next_drain = self._loop.time() + self.drain_interval
+                else:
+                    self.failed += len(result.retry)
+        finally:
+            # A delivery left in _deliveries would make _run() spin on it
+            self._deliveries.pop(typing.cast(asyncio.Task, asyncio.current_task()), None)
+            self._task_done(len(batch))
+
+    async def _run(self) -> None:
+        assert self._loop is not None
+        while True:
+            while len(self._deliveries) >= self.max_in_flight:
+                await asyncio.wait(list(self._deliveries), return_when=asyncio.FIRST_COMPLETED)
+
+            backlog = self.spool is not None and not self.spool.empty
+
+            batch_size = self.batch_size
+            batch = await self._collect(self._next_drain - self._loop.time() if backlog else None)
+            if batch and self.encode is not None:
+                encoded = self._encode_batch(batch)
+                if len(encoded) < len(batch):
+                    self._task_done(len(batch) - len(encoded))
+                batch = encoded
+            if batch:
+                if backlog:
+                    self._spool_batch(batch)
+                    self._task_done(len(batch))
+                else:
+                    delivery = self._loop.create_task(self._send(batch, len(batch) >= batch_size))
+                    self._deliveries[delivery] = batch
+                self._batch = []
+
+            if self.spool is not None and not self.spool.empty and self._loop.time() >= self._next_drain:
+                await self._drain_spool()
@@ -0,0 +1,212 @@
+"""
+Dashgram SDK Circuit Breaker Module.
+
+This module provides the circuit breaker around the Dashgram API. When the
+API is degraded, every request would wait for the full timeout before
+failing, stalling handlers that await it. After a number of consecutive
+failures the breaker opens and requests fail fast with `CircuitOpenError`
+(events sent in the background are spooled, if a spool is configured).
+After a cool-down period it half-opens and lets probe requests through,
+closing again once a probe succeeds.
+"""
+
+import threading
+import time
+import typing
+import warnings
+
+import httpx
+
+from dashgram.enums import CircuitState
+from dashgram.exceptions import DashgramApiError
+
+StateChangeCallback = typing.Callable[[CircuitState, CircuitState], None]
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker counting consecutive failures of API requests.
+
+    Connection errors, timeouts and 408, 429 and 5xx responses are failures.
+    Other responses, including client errors like 400, show that the API is
+    reachable and count as successes.
+
+    The breaker is thread-safe, so it can be shared by requests made on
+    different event loops.
+
+    Attributes:
+        failure_threshold: Number of consecutive failures that open the circuit
+        reset_timeout: Time in seconds the circuit stays open before half-opening
+        half_open_max_calls: Maximum number of concurrent probe requests while half-open
+        on_state_change: Callback called with the old and new state on every transition
+        consecutive_failures: Number of failures since the last success
+        opened: Number of times the circuit opened
+        rejected: Number of requests rejected while the circuit was open
+
+    Example:
+        >>> def log_state(old, new):
+        ...     logging.warning("Dashgram circuit %s -> %s", old, new)
+        >>> sdk = Dashgram(project_id="123", access_key="key",
+        ...                circuit_breaker=CircuitBreaker(failure_threshold=5, reset_timeout=30,
+        ...                                               on_state_change=log_state))
+    """
+
+    FAILURE_STATUSES = frozenset((408, 429))
+
+    def __init__(self, failure_threshold: int = 5, *,
+                 reset_timeout: float = 30.0,
+                 half_open_max_calls: int = 1,
+                 on_state_change: typing.Optional[StateChangeCallback] = None) -> None:
+        """
+        Initialize the circuit breaker.
+
+        Args:
+            failure_threshold: Number of consecutive failures that open the circuit
+            reset_timeout: Time in seconds the circuit stays open before half-opening
+            half_open_max_calls: Maximum number of concurrent probe requests while half-open
+            on_state_change: Callback called with the old and new state on every transition
+        """
+        if failure_threshold < 1:
+            raise ValueError("failure_threshold must be at least 1")
+        if half_open_max_calls < 1:
+            raise ValueError("half_open_max_calls must be at least 1")
+
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self.on_state_change = on_state_change
+
+        self.consecutive_failures = 0
+        self.opened = 0
+        self.rejected = 0
+
+        self._state = CircuitState.CLOSED
+        self._opened_at = 0.0
+        self._probes = 0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> CircuitState:
+        """The current state of the circuit."""
+        with self._lock:
+            changes = self._update_state()
+        self._notify(changes)
+        return self._state
+
+    @property
+    def retry_after(self) -> float:
+        """Time in seconds until the open circuit half-opens (0 if it is not open)."""
+        if self._state != CircuitState.OPEN:
+            return 0.0
+        return max(0.0, self._opened_at + self.reset_timeout - time.monotonic())
+
+    def is_failure(self, exc: BaseException) -> bool:
+        """
+        Check whether a request error counts as a failure of the API.
+
+        Args:
+            exc: The exception raised by the request
+
+        Returns:
+            True for transport errors, timeouts and 408, 429 and 5xx responses
+        """
+        if isinstance(exc, DashgramApiError):
+            return exc.status_code >= 500 or exc.status_code in self.FAILURE_STATUSES
+        return isinstance(exc, httpx.TransportError)
+
+    def allow_request(self) -> bool:
+        """
+        Check whether a request may be sent, and reserve a probe slot while half-open.
+
+        Every allowed request must be followed by a record() call.
+
+        Returns:
+            True if the request may be sent, False if it must fail fast
+        """
+        with self._lock:
+            changes = self._update_state()
+            if self._state == CircuitState.CLOSED:
+                allowed = True
+            elif self._state == CircuitState.HALF_OPEN and self._probes < self.half_open_max_calls:
+                self._probes += 1
+                allowed = True
+            else:
+                self.rejected += 1
+                allowed = False
+        self._notify(changes)
+        return allowed
+
+    def record(self, exc: typing.Optional[BaseException] = None) -> None:
+        """
+        Record the outcome of an allowed request.
+
+        Args:
+            exc: The exception raised by the request, or None if it succeeded.
+                Exceptions that are not request errors (e.g. cancellation)
+                only release the probe slot.
+        """
+        with self._lock:
+            changes: typing.List[typing.Tuple[CircuitState, CircuitState]] = []
+            if self._state == CircuitState.HALF_OPEN and self._probes > 0:
+                self._probes -= 1
+
+            if exc is not None and not isinstance(exc, Exception):
+                pass
+            elif exc is not None and self.is_failure(exc):
+                self.consecutive_failures += 1
+                if self._state == CircuitState.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+                    changes = self._open()
+            else:
+                self.consecutive_failures = 0
+                if self._state != CircuitState.CLOSED:
+                    changes = [self._set_state(CircuitState.CLOSED)]
+        self._notify(changes)
+
+    def metrics(self) -> typing.Dict[str, typing.Any]:
+        """
+        Get the state and counters of the circuit breaker.
+
+        Returns:
+            A dictionary with the state, consecutive failures, the number of
+            times the circuit opened, rejected requests and the time until a
+            probe is let through
+
+        Example:
+            >>> breaker.metrics()
+            {'state': 'open', 'consecutive_failures': 5, 'opened': 1, 'rejected': 42, 'retry_after': 12.5}
+        """
+        return {
+            "state": str(self.state),
+            "consecutive_failures": self.consecutive_failures,
+            "opened": self.opened,
+            "rejected": self.rejected,
+            "retry_after": self.retry_after,
+        }
+
+    def _open(self) -> typing.List[typing.Tuple[CircuitState, CircuitState]]:
+        # Failures of requests sent before the circuit opened do not extend the cool-down
+        if self._state == CircuitState.OPEN:
+            return []
+        self.opened += 1
+        self._opened_at = time.monotonic()
+        self._probes = 0
+        return [self._set_state(CircuitState.OPEN)]
+
+    def _update_state(self) -> typing.List[typing.Tuple[CircuitState, CircuitState]]:
+        if self._state == CircuitState.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+            self._probes = 0
+            return [self._set_state(CircuitState.HALF_OPEN)]
+        return []
+
+    def _set_state(self, state: CircuitState) -> typing.Tuple[CircuitState, CircuitState]:
+        old, self._state = self._state, state
+        return old, state
+
+    def _notify(self, changes: typing.List[typing.Tuple[CircuitState, CircuitState]]) -> None:
+        if self.on_state_change is None:
+            return
+        for old, new in changes:
+            try:
+                self.on_state_change(old, new)
+            except Exception as e:
+                warnings.warn(f"{type(e).__name__}: {e}")
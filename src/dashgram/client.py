@@ -5,15 +5,45 @@ This module provides the main Dashgram client for tracking Telegram bot events
 and integrating with popular Python Telegram bot frameworks.
 """
 
+import asyncio
+import atexit
+import json
+import os
+import signal
+import threading
 import typing
 import httpx
 import warnings
 
-from dashgram.integrations.base import object_to_dict, resolve_framework
+from dashgram.adaptive import AdaptiveBatching
+from dashgram.agent.writer import AgentWriter
+from dashgram.batching import BatchResult, BatchSender
+from dashgram.compression import Compressor
+from dashgram.integrations.base import object_to_dict, object_to_json, resolve_framework
 from dashgram.integrations import aiogram, telegram, telebot
-from dashgram.enums import HandlerType
-from dashgram.exceptions import InvalidCredentials, DashgramApiError
-from dashgram.utils import auto_async, wrap_event
+from dashgram.circuit import CircuitBreaker
+from dashgram.dedup import Deduplicator
+from dashgram.enums import HandlerType, OverflowPolicy
+from dashgram.exceptions import InvalidCredentials, DashgramApiError, CircuitOpenError
+from dashgram.retry import RetryPolicy, parse_retry_after
+from dashgram.projection import Projection, Projections, normalize_projections, project_update
+from dashgram.ratelimit import RateLimit, RateLimits, normalize_rate_limits
+from dashgram.raw import RawUpdates
+from dashgram.sampling import Sampler, resolve_update
+from dashgram.spool import Spool
+from dashgram.transport import DEFAULT_TIMEOUT, create_client, get_pool_stats
+from dashgram.serialization import (JsonEncoder, encode_request, encode_track_body, get_json_encoder,
+                                    split_requests, wrap_raw_event)
+from dashgram.utils import LoopThread, auto_async, get_loop_thread, wrap_event
+
+# Classifies background send failures when retries are disabled
+_DEFAULT_RETRY = RetryPolicy()
+
+
+class _DeferredEvent(typing.NamedTuple):
+    # A framework object queued by track_event_nowait() with lazy_serialization
+    event: typing.Any
+    handler_type: typing.Optional[HandlerType]
 
 
 class Dashgram:
@@ -39,7 +69,33 @@ class Dashgram:
     def __init__(self, project_id: typing.Union[int, str], access_key: str, *,
                  api_url: typing.Optional[str] = None,
                  suppress_exceptions: bool = True,
-                 origin: typing.Optional[str] = None) -> None:
+                 origin: typing.Optional[str] = None,
+                 max_batch_size: int = 100,
+                 max_batch_delay_ms: int = 500,
+                 max_queue_size: int = 10000,
+                 max_queue_bytes: int = 64 * 1024 * 1024,
+                 overflow: typing.Union[OverflowPolicy, str] = OverflowPolicy.DROP_NEWEST,
+                 block_timeout: float = 1.0,
+                 compression: typing.Optional[str] = None,
+                 compression_min_size: int = 1024,
+                 json_encoder: typing.Union[str, JsonEncoder, None] = None,
+                 http2: bool = False,
+                 max_connections: typing.Optional[int] = 100,
+                 max_keepalive_connections: typing.Optional[int] = 20,
+                 keepalive_expiry: typing.Optional[float] = 5.0,
+                 timeout: typing.Union[float, httpx.Timeout, None] = DEFAULT_TIMEOUT,
+                 retry: typing.Optional[RetryPolicy] = RetryPolicy(),
+                 spool: typing.Union[str, "os.PathLike[str]", Spool, None] = None,
+                 sampling: typing.Union[Sampler, typing.Mapping[typing.Union[HandlerType, str], float], None] = None,
+                 projection: typing.Optional[Projections] = None,
+                 deduplicate: typing.Union[bool, Deduplicator] = False,
+                 circuit_breaker: typing.Optional[CircuitBreaker] = None,
+                 agent_socket: typing.Union[str, "os.PathLike[str]", None] = None,
+                 max_concurrent_requests: int = 8,
+                 rate_limits: typing.Optional[RateLimits] = None,
+                 adaptive_batching: typing.Optional[AdaptiveBatching] = None,
+                 raw_updates: typing.Union[bool, RawUpdates] = False,
+                 lazy_serialization: bool = False) -> None:
         """
         Initialize the Dashgram client.
         
@@ -48,6 +104,56 @@ class Dashgram:
             access_key: Your Dashgram access key for authentication
             api_url: Custom API URL (defaults to https://api.dashgram.io/v1)
             origin: Custom origin string (auto-detected if not provided)
+            max_batch_size: Maximum number of events per request sent by track_event_nowait()
+            max_batch_delay_ms: Maximum time an event queued by track_event_nowait() waits for its batch
+            max_queue_size: Maximum number of events waiting to be sent in the background
+            max_queue_bytes: Maximum total size in bytes of the encoded events waiting to be
+                sent in the background (0 for no limit)
+            overflow: What track_event_nowait() does with an event when the queue is full:
+                "drop_newest", "drop_oldest", "block" (wait up to block_timeout for room)
+                or "spill" (write the event to the spool)
+            block_timeout: Maximum time in seconds track_event_nowait() waits for room
+                with the "block" overflow policy
+            compression: Request body compression: "gzip", "zstd", "auto" or None to disable
+            compression_min_size: Minimum request body size in bytes to compress
+            json_encoder: Callable encoding an object to JSON bytes, or the name of an encoder
+                ("orjson", "msgspec", "json"). Defaults to the fastest installed one
+            http2: Whether to use HTTP/2 multiplexing (requires the `h2` package)
+            max_connections: Maximum number of concurrent connections to the API
+            max_keepalive_connections: Maximum number of idle connections kept open
+            keepalive_expiry: Time in seconds an idle connection is kept open
+            timeout: Request timeout in seconds, or an httpx.Timeout with per-phase values
+            retry: Retry policy for events sent in the background (None to disable retries)
+            spool: Directory or Spool instance storing events sent in the background
+                that could not be delivered, so they are sent once the API recovers
+            sampling: Sampler, or a mapping of update types to sampling rates between
+                0.0 and 1.0, to track only a fraction of some update types
+            projection: Projection applied to every update type, or a mapping of update
+                types to projections, selecting the fields of tracked events that are sent.
+                Events passed as encoded bytes are decoded to be projected
+            deduplicate: Skip updates whose update_id was already tracked recently. True
+                remembers ids for 10 minutes, or pass a Deduplicator to configure the window
+            circuit_breaker: Circuit breaker making requests fail fast with CircuitOpenError
+                while the API keeps failing (optional)
+            agent_socket: Unix socket of a local Dashgram agent (`python -m dashgram.agent`).
+                When set, track_event_nowait() writes events to the agent, which batches
+                them together with the events of other processes
+            max_concurrent_requests: Maximum number of requests sent concurrently by the
+                bulk methods (payments(), refund_payments(), invited_by_many()) and for
+                payments, refunds and referrals queued in the background
+            rate_limits: RateLimit shared by all endpoints, or a mapping of endpoints
+                ("track", "invited_by", "payment", "payment/refund") to RateLimit,
+                capping requests per second and requests in flight
+            adaptive_batching: Controller growing the batch size and batches in flight of
+                the background sender while the API is healthy, and backing off when its
+                latency or errors degrade. Replaces max_batch_size; batches still wait at
+                most max_batch_delay_ms to fill up
+            raw_updates: Send the original JSON of updates captured with capture_raw_update()
+                instead of converting their framework objects. True keeps updates for a
+                minute, or pass a RawUpdates store to configure it
+            lazy_serialization: Queue the framework objects passed to track_event_nowait()
+                and convert them in the background sender right before batching, instead
+                of in the caller. The objects must not be modified once tracked
         
         Example:
             >>> sdk = Dashgram(
@@ -75,17 +181,84 @@ class Dashgram:
         self.origin = origin
         
         self.suppress_exceptions = suppress_exceptions
+        self.retry = retry
+        if max_concurrent_requests < 1:
+            raise ValueError("max_concurrent_requests must be at least 1")
+        self.max_concurrent_requests = max_concurrent_requests
+
+        self.rate_limits: typing.Dict[str, RateLimit] = {}
+        if rate_limits is not None:
+            self.rate_limits = normalize_rate_limits(rate_limits)
+        self.circuit_breaker = circuit_breaker
+
+        if sampling is not None and not isinstance(sampling, Sampler):
+            sampling = Sampler(sampling)
+        self.sampler = sampling
+
+        if deduplicate is True:
+            deduplicate = Deduplicator()
+        self.deduplicator = deduplicate if isinstance(deduplicate, Deduplicator) else None
+
+        if raw_updates is True:
+            raw_updates = RawUpdates()
+        self.raw_updates = raw_updates if isinstance(raw_updates, RawUpdates) else None
+
+        self._projection: typing.Union[Projection, typing.Dict[str, Projection], None] = None
+        if projection is not None:
+            self._projection = normalize_projections(projection)
+
+        self._json_encoder = get_json_encoder(json_encoder)
+
+        self._compressor = None
+        if compression is not None:
+            self._compressor = Compressor(compression, min_size=compression_min_size)
+
+        self._client = create_client(
+            self.api_url,
+            {"Authorization": f"Bearer {access_key}"},
+            http2=http2,
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+            timeout=timeout,
+        )
 
-        self._client = httpx.AsyncClient(base_url=self.api_url, headers={"Authorization": f"Bearer {access_key}"})
+        if spool is not None and not isinstance(spool, Spool):
+            spool = Spool(spool)
 
-    async def _request(self, url: str, json: typing.Optional[typing.Dict[str, typing.Any]] = None, suppress_exceptions: typing.Optional[bool] = None) -> bool:
+        self._sender = BatchSender(
+            self._send_batch,
+            max_batch_size=max_batch_size,
+            max_batch_delay_ms=max_batch_delay_ms,
+            max_queue_size=max_queue_size,
+            max_queue_bytes=max_queue_bytes,
+            overflow=overflow,
+            block_timeout=block_timeout,
+            spool=spool,
+            adaptive=adaptive_batching,
+            encode=self._encode_deferred if lazy_serialization else None,
+        )
+        self._sender_thread: typing.Optional[LoopThread] = None
+
+        self.adaptive_batching = adaptive_batching
+        self.lazy_serialization = lazy_serialization
+
+        self._agent: typing.Optional[AgentWriter] = None
+        if agent_socket is not None:
+            self._agent = AgentWriter(agent_socket)
+
+        self.closed = False
+
+    async def _request(self, url: str, json: typing.Union[typing.Dict[str, typing.Any], bytes, None] = None, suppress_exceptions: typing.Optional[bool] = None,
+                       retry: typing.Optional[RetryPolicy] = None) -> bool:
         """
         Make an HTTP request to the Dashgram API.
         
         Args:
             url: The endpoint URL to request
-            json: JSON data to send with the request
+            json: JSON data to send with the request, as a dictionary or already-encoded bytes
             suppress_exceptions: Whether to suppress exceptions and return False instead
+            retry: Retry policy for transient failures (no retries if not provided)
         
         Returns:
             True if the request was successful, False otherwise
@@ -93,39 +266,149 @@ class Dashgram:
         Raises:
             InvalidCredentials: If the API credentials are invalid
             DashgramApiError: If the API returns an error response
+            CircuitOpenError: If the circuit breaker is open
         """
         if suppress_exceptions is None:
             suppress_exceptions = self.suppress_exceptions
 
         try:
-            resp = await self._client.post(url, json=json)
-            
-            if resp.status_code == 403:
-                raise InvalidCredentials
-            
-            resp_data = resp.json()
-            
-            if not (200 <= resp.status_code < 300) or resp_data.get("status") != "success":
-                raise DashgramApiError(resp.status_code, resp_data.get("details"))
-            
-            return True
+            body, headers = self._encode_body(json)
+
+            attempt = 1
+            while True:
+                try:
+                    await self._send(url, body, headers)
+                    return True
+                except Exception as e:
+                    if retry is None or not retry.should_retry(e, attempt):
+                        raise
+                    await asyncio.sleep(retry.get_delay(e, attempt))
+                    attempt += 1
         except Exception as e:
             if not suppress_exceptions:
                 raise e
             warnings.warn(f"{type(e).__name__}: {e}")
             return False
 
+    async def _request_many(self, requests: typing.Iterable[typing.Tuple[str, typing.Union[typing.Dict[str, typing.Any], bytes]]],
+                            concurrency: typing.Optional[int] = None, suppress_exceptions: typing.Optional[bool] = None,
+                            retry: typing.Optional[RetryPolicy] = None) -> typing.List[typing.Union[bool, Exception]]:
+        """
+        Make many HTTP requests with bounded concurrency.
+        
+        Requests are taken lazily from the iterable by `concurrency` workers,
+        so large iterables are not materialized as tasks all at once.
+        
+        Args:
+            requests: (endpoint, JSON data) pairs to send
+            concurrency: Maximum number of requests in flight (defaults to max_concurrent_requests)
+            suppress_exceptions: Whether failed requests return False instead of their exception
+            retry: Retry policy for transient failures (no retries if not provided)
+        
+        Returns:
+            The result of each request, in order: True if it was successful,
+            otherwise False or the exception it raised
+        """
+        if suppress_exceptions is None:
+            suppress_exceptions = self.suppress_exceptions
+        if concurrency is None:
+            concurrency = self.max_concurrent_requests
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+
+        results: typing.List[typing.Union[bool, Exception]] = []
+        pending = enumerate(requests)
+
+        async def worker() -> None:
+            # The iterator is advanced between awaits only, so workers never share an item
+            for i, (url, json) in pending:
+                results.append(False)
+                try:
+                    results[i] = await self._request(url, json=json, suppress_exceptions=False, retry=retry)
+                except Exception as e:
+                    if not suppress_exceptions:
+                        results[i] = e
+                    else:
+                        warnings.warn(f"{type(e).__name__}: {e}")
+
+        workers = [asyncio.ensure_future(worker()) for _ in range(concurrency)]
+        try:
+            await asyncio.gather(*workers)
+        except BaseException:
+            for task in workers:
+                task.cancel()
+            raise
+        return results
+
+    def _encode_body(self, json: typing.Union[typing.Dict[str, typing.Any], bytes, None]) -> typing.Tuple[bytes, typing.Dict[str, str]]:
+        body = json if isinstance(json, bytes) else self._json_encoder(json)
+
+        headers = {"Content-Type": "application/json"}
+        if self._compressor is not None:
+            body, content_encoding = self._compressor.compress(body)
+            if content_encoding is not None:
+                headers["Content-Encoding"] = content_encoding
+
+        return body, headers
+
+    async def _send(self, url: str, body: bytes, headers: typing.Dict[str, str]) -> None:
+        limit = self.rate_limits.get(url)
+        if limit is None:
+            return await self._send_checked(url, body, headers)
+        async with limit:
+            await self._send_checked(url, body, headers)
+
+    async def _send_checked(self, url: str, body: bytes, headers: typing.Dict[str, str]) -> None:
+        breaker = self.circuit_breaker
+        if breaker is None:
+            return await self._post(url, body, headers)
+
+        if not breaker.allow_request():
+            raise CircuitOpenError(breaker.retry_after)
+        try:
+            await self._post(url, body, headers)
+        except BaseException as e:
+            breaker.record(e)
+            raise
+        breaker.record()
+
+    async def _post(self, url: str, body: bytes, headers: typing.Dict[str, str]) -> None:
+        resp = await self._client.post(url, content=body, headers=headers)
+
+        if resp.status_code == 403:
+            raise InvalidCredentials
+
+        try:
+            resp_data = resp.json()
+        except ValueError:
+            resp_data = {}
+
+        if not (200 <= resp.status_code < 300) or resp_data.get("status") != "success":
+            raise DashgramApiError(
+                resp.status_code,
+                resp_data.get("details"),
+                retry_after=parse_retry_after(resp.headers.get("Retry-After")),
+            )
+
     @auto_async
     async def track_event(self, event, handler_type: typing.Optional[HandlerType] = None, suppress_exceptions: typing.Optional[bool] = None) -> bool:
         """
         Track a Telegram event or update.
         
-        This method can handle both framework objects (like aiogram Update) and
-        raw dictionaries. It automatically converts framework objects to the
-        proper format for the Dashgram API.
+        This method can handle framework objects (like aiogram Update), raw
+        dictionaries and already-encoded update JSON. It automatically converts
+        framework objects to the proper format for the Dashgram API. Encoded
+        `bytes` are sent as-is, unless a `projection` has to be applied to them.
+        
+        Duplicate updates (with `deduplicate`) and events dropped by
+        `sampling` are not sent and count as tracked.
+        
+        When the `track` rate limit is saturated and exceptions are
+        suppressed, the event is queued like with track_event_nowait(), so
+        bursts are sent in batches instead of more concurrent requests.
         
         Args:
-            event: The event to track. Can be a framework object or dictionary
+            event: The event to track. Can be a framework object, dictionary or encoded JSON bytes
             handler_type: The type of handler (optional if event is a framework object)
             suppress_exceptions: Whether to suppress exceptions and return False
         
@@ -135,6 +418,7 @@ class Dashgram:
         Raises:
             InvalidCredentials: If the API credentials are invalid
             DashgramApiError: If the API returns an error response
+            CircuitOpenError: If the circuit breaker is open
         
         Example:
             >>> # Track an aiogram update
@@ -146,22 +430,503 @@ class Dashgram:
             >>> # Track a raw dictionary
             >>> await sdk.track_event({"text": "hello"}, HandlerType.MESSAGE)
             
+            >>> # Track raw update JSON received by a webhook
+            >>> await sdk.track_event(request_body)
+            
             >>> # Track with exception handling
             >>> try:
             ...     await sdk.track_event(event, suppress_exceptions=False)
             ... except DashgramApiError as e:
             ...     print(f"API Error: {e.status_code}")
         """
+        if self._skip_event(event, handler_type):
+            return True
+
+        event_type = self._event_type(event, handler_type)
+        event = self._prepare_event(event, handler_type)
+
+        if suppress_exceptions is None:
+            suppress_exceptions = self.suppress_exceptions
+        limit = self.rate_limits.get("track")
+        if limit is not None and suppress_exceptions and not self.closed and limit.saturated:
+            return self._enqueue(self._encode_event(event), event_type)
+
+        body = encode_track_body(self._json_encoder, self.origin, [event])
+
+        return await self._request("track", json=body, suppress_exceptions=suppress_exceptions)
+
+    def track_event_nowait(self, event, handler_type: typing.Optional[HandlerType] = None) -> bool:
+        """
+        Queue a Telegram event or update for background sending.
+        
+        The event is converted and encoded immediately and put into an
+        in-process queue; with `lazy_serialization`, framework objects are
+        queued as they are and converted by the background sender right
+        before batching. When the queue is full, the `overflow` policy
+        decides whether the event is dropped, replaces the oldest queued
+        events, waits for room or is written to the spool.
+        A background task sends queued events in batches of up to
+        `max_batch_size` events, waiting at most `max_batch_delay_ms` for a
+        batch to fill up. Transient failures are retried in the background
+        according to the `retry` policy. Batches that still cannot be
+        delivered are written to the `spool`, if configured, and sent once the
+        API recovers; otherwise delivery errors are reported as warnings.
+        
+        When called without a running event loop (e.g. from a synchronous
+        bot), the background sender runs on the SDK's background loop thread,
+        see start_sender_thread().
+        
+        With `agent_socket`, the encoded event is written to the local agent
+        instead, which batches and sends it.
+        
+        Args:
+            event: The event to track. Can be a framework object, dictionary or encoded JSON bytes
+            handler_type: The type of handler (optional if event is a framework object)
+        
+        Returns:
+            True if the event was queued or skipped as a duplicate or by sampling,
+            False if it was dropped because the queue is full or the client is closed
+        
+        Example:
+            >>> # Inside a handler, returns immediately
+            >>> sdk.track_event_nowait(update)
+            
+            >>> # Wait for queued events to be delivered
+            >>> await sdk.flush()
+        """
+        if self.closed:
+            warnings.warn("Dashgram client is closed, event dropped")
+            return False
+        if self._skip_event(event, handler_type):
+            return True
+
+        event_type = self._event_type(event, handler_type)
+        if (self.lazy_serialization and self._agent is None
+                and not isinstance(event, (dict, bytes, bytearray, memoryview))):
+            return self._enqueue(_DeferredEvent(event, handler_type), event_type)
+
+        event = self._prepare_event(event, handler_type)
+        return self._enqueue(self._encode_event(event), event_type)
+
+    def capture_raw_update(self, update: typing.Union[bytes, bytearray, memoryview, str, typing.Dict[str, typing.Any]]) -> bool:
+        """
+        Remember the original JSON of an update received by the bot.
+        
+        When the framework object of the update is tracked afterwards, its
+        captured JSON is sent instead of converting the object, so tracking
+        costs no serialization. Call it with the body of the webhook request
+        (or the decoded dictionary) before passing the update to the
+        framework. With `raw_updates`, bind_aiogram() captures updates fed to
+        `Dispatcher.feed_raw_update()` and `feed_webhook_update()` itself.
+        
+        Updates are matched by `update_id`, so the captured JSON must hold a
+        full update starting with its `update_id`, as sent by Telegram.
+        
+        Args:
+            update: The update JSON as received from Telegram, or the dictionary it was decoded to
+        
+        Returns:
+            True if the update was captured, False if `raw_updates` is disabled
+            or the update has no update_id
+        
+        Example:
+            >>> sdk = Dashgram(project_id="123", access_key="key", raw_updates=True)
+            >>> sdk.bind_telegram(application)
+            
+            >>> # In a custom webhook handler
+            >>> body = await request.body()
+            >>> sdk.capture_raw_update(body)
+            >>> await application.update_queue.put(Update.de_json(json.loads(body), application.bot))
+        """
+        if self.raw_updates is None:
+            return False
+        return self.raw_updates.add(update)
+
+    def _enqueue(self, event: typing.Union[bytes, _DeferredEvent], event_type: typing.Optional[str] = None) -> bool:
+        if self._agent is not None:
+            return self._agent.send(event, event_type)
+
+        if not self._sender.running:
+            try:
+                asyncio.get_running_loop()
+            except RuntimeError:
+                self.start_sender_thread()
+
+        return self._sender.put_nowait(event, event_type)
+
+    async def flush(self, timeout: typing.Optional[float] = 5.0) -> int:
+        """
+        Wait until all events queued by track_event_nowait() have been sent.
+        
+        Can be awaited from any event loop, also when the sender runs on the
+        SDK's loop thread after start_sender_thread(). With `agent_socket`,
+        waits until they are written to the agent.
+        
+        Args:
+            timeout: Maximum time in seconds to wait (None to wait until all are sent)
+        
+        Returns:
+            The number of events still waiting to be sent or written to the agent
+        
+        Example:
+            >>> sdk.track_event_nowait(update)
+            >>> await sdk.flush()
+            0
+        """
+        if self._agent is not None:
+            await asyncio.to_thread(self._agent.flush, timeout)
+            return self._agent.pending
+
+        sender_thread = self._sender_thread
+        if sender_thread is not None and sender_thread.running and sender_thread.loop is not asyncio.get_running_loop():
+            flushed = asyncio.wrap_future(sender_thread.submit(self._sender.flush()))
+        else:
+            flushed = self._sender.flush()
+        try:
+            await asyncio.wait_for(flushed, timeout)
+        except asyncio.TimeoutError:
+            pass
+        return self._sender.unsent
+
+    def pool_stats(self) -> typing.Dict[str, typing.Optional[int]]:
+        """
+        Get statistics of the HTTP connection pool.
+        
+        Useful to size max_connections and max_keepalive_connections for
+        the bot's update rate.
+        
+        Returns:
+            A dictionary with the number of active and queued requests, active
+            and idle connections, and the configured pool limits
+        
+        Example:
+            >>> sdk.pool_stats()
+            {'active_requests': 2, 'queued_requests': 0, 'active_connections': 2,
+             'idle_connections': 3, 'max_connections': 100, 'max_keepalive_connections': 20}
+        """
+        return get_pool_stats(self._client)
+
+    def sender_stats(self) -> typing.Dict[str, typing.Any]:
+        """
+        Get statistics of the background sender used by track_event_nowait().
+        
+        With `agent_socket`, `sent` counts the events written to the agent
+        and the batching values are those of the unused local sender.
+        
+        Returns:
+            A dictionary with the number of sent, failed, dropped and spooled
+            events, the number and total size of the queued events, the
+            dropped events per update type, the current batch size and
+            maximum batches in flight, and the batches being sent
+        
+        Example:
+            >>> sdk.sender_stats()
+            {'sent': 1200, 'failed': 0, 'dropped': 3, 'spooled': 0, 'pending': 12,
+             'pending_bytes': 8450, 'dropped_by_type': {'message': 2, 'callback_query': 1},
+             'batch_size': 100, 'max_in_flight': 1, 'in_flight': 0}
+        """
+        sender = self._sender
+        stats = {
+            "sent": sender.sent,
+            "failed": sender.failed,
+            "dropped": sender.dropped,
+            "spooled": sender.spooled,
+            "pending": sender.pending,
+            "pending_bytes": sender.pending_bytes,
+            "dropped_by_type": dict(sender.dropped_by_type),
+        }
+        if self._agent is not None:
+            agent = self._agent
+            stats.update(
+                sent=agent.sent,
+                dropped=agent.dropped,
+                pending=agent.pending,
+                pending_bytes=agent.pending_bytes,
+                dropped_by_type=dict(agent.dropped_by_type),
+            )
+        stats.update(batch_size=sender.batch_size, max_in_flight=sender.max_in_flight, in_flight=sender.in_flight)
+        return stats
+
+    def start_sender_thread(self) -> None:
+        """
+        Run the background sender on the SDK's background loop thread.
+        
+        Used by synchronous bots: track_event_nowait() then only hands the
+        event over to the thread and returns. The thread keeps one event loop
+        and one connection pool for its whole lifetime, shared with the
+        synchronous calls of the other SDK methods.
+        
+        Example:
+            >>> sdk.start_sender_thread()
+            >>> sdk.track_event_nowait(update)  # from any thread
+            >>> sdk.stop_sender_thread()
+        """
+        if self._sender.running:
+            return
+
+        self._sender_thread = get_loop_thread()
+        self._sender_thread.call(self._sender.start)
+
+    def stop_sender_thread(self, timeout: typing.Optional[float] = 5.0) -> int:
+        """
+        Send the queued events and stop the sender started by start_sender_thread().
+        
+        The background loop thread itself keeps running and serves later
+        synchronous calls.
+        
+        Args:
+            timeout: Maximum time in seconds to wait for queued events to be sent
+        
+        Returns:
+            The number of events that were neither delivered nor spooled
+        """
+        sender_thread, self._sender_thread = self._sender_thread, None
+        if sender_thread is None or not sender_thread.running:
+            return 0
+
+        undelivered = sender_thread.submit(self._sender.close(timeout)).result()
+        if undelivered:
+            warnings.warn(f"Dashgram sender stopped with {undelivered} events not sent")
+        return undelivered
+
+    async def aclose(self, timeout: typing.Optional[float] = 5.0) -> int:
+        """
+        Send the queued events and close the SDK's connections.
+        
+        Events queued by track_event_nowait() are sent within the timeout.
+        Events that could not be sent in time are written to the spool if one
+        is configured; otherwise they are lost and reported in a warning.
+        
+        Args:
+            timeout: Maximum time in seconds to wait for queued events to be sent
+        
+        Returns:
+            The number of events that were neither delivered nor spooled
+        
+        Example:
+            >>> async with Dashgram(project_id="123", access_key="key") as sdk:
+            ...     sdk.track_event_nowait(update)
+            
+            >>> # or explicitly, e.g. in an on_shutdown hook
+            >>> await sdk.aclose(timeout=10)
+        """
+        if self.closed:
+            return 0
+        self.closed = True
+
+        sender_thread, self._sender_thread = self._sender_thread, None
+        if sender_thread is not None and sender_thread.running and sender_thread.loop is not asyncio.get_running_loop():
+            undelivered = await asyncio.wrap_future(sender_thread.submit(self._sender.close(timeout)))
+        else:
+            undelivered = await self._sender.close(timeout)
+        if self._agent is not None:
+            undelivered += await asyncio.to_thread(self._agent.close, timeout)
+
+        if undelivered:
+            warnings.warn(f"Dashgram closed with {undelivered} events not sent")
+
+        try:
+            await self._client.aclose()
+        except Exception as e:
+            warnings.warn(f"{type(e).__name__}: {e}")
+        return undelivered
+
+    def close(self, timeout: typing.Optional[float] = 5.0) -> int:
+        """
+        Send the queued events and close the SDK's connections from synchronous code.
+        
+        Runs aclose() on the SDK's background loop thread. In async code, use
+        `await sdk.aclose()` instead.
+        
+        Args:
+            timeout: Maximum time in seconds to wait for queued events to be sent
+        
+        Returns:
+            The number of events that were neither delivered nor spooled
+        
+        Raises:
+            RuntimeError: If called while an event loop is running in this thread
+        
+        Example:
+            >>> with Dashgram(project_id="123", access_key="key") as sdk:
+            ...     sdk.bind_telebot(bot)
+            ...     bot.infinity_polling()
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return get_loop_thread().submit(self.aclose(timeout)).result()
+        raise RuntimeError("close() cannot be called from a running event loop, use await sdk.aclose()")
+
+    def close_on_exit(self, timeout: typing.Optional[float] = 5.0, sigterm: bool = True) -> None:
+        """
+        Close the SDK when the process exits, sending the queued events.
+        
+        Registers close() with atexit and, when called from the main thread,
+        a SIGTERM handler that closes the SDK and then runs the previous
+        handler, or exits the process if there was none. Meant for
+        synchronous bots that have no shutdown hook.
+        
+        Args:
+            timeout: Maximum time in seconds to wait for queued events to be sent
+            sigterm: Whether to also close the SDK on SIGTERM
+        
+        Example:
+            >>> sdk = Dashgram(project_id="123", access_key="key")
+            >>> sdk.close_on_exit(timeout=10)
+        """
+        atexit.register(self._close_at_exit, timeout)
+
+        if not sigterm or threading.current_thread() is not threading.main_thread():
+            return
+
+        previous = signal.getsignal(signal.SIGTERM)
+
+        def handle_sigterm(signum, frame):
+            self._close_at_exit(timeout)
+            if callable(previous):
+                previous(signum, frame)
+            elif previous != signal.SIG_IGN:
+                raise SystemExit(128 + signum)
+
+        signal.signal(signal.SIGTERM, handle_sigterm)
+
+    def _close_at_exit(self, timeout: typing.Optional[float]) -> None:
+        if self.closed:
+            return
+        try:
+            self.close(timeout)
+        except Exception as e:
+            warnings.warn(f"{type(e).__name__}: {e}")
+
+    async def __aenter__(self) -> "Dashgram":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    def __enter__(self) -> "Dashgram":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _skip_event(self, event, handler_type: typing.Optional[HandlerType] = None) -> bool:
+        if self.deduplicator is not None and self.deduplicator.is_duplicate(event, handler_type):
+            return True
+        return self.sampler is not None and not self.sampler.should_track(event, handler_type)
+
+    def _prepare_event(self, event, handler_type: typing.Optional[HandlerType] = None) -> typing.Union[dict, bytes]:
+        if isinstance(event, (bytes, bytearray, memoryview)):
+            if self._projection is None:
+                return wrap_raw_event(event, handler_type)
+            # Decoded to be projected, like captured raw updates
+            event = json.loads(bytes(event))
+        if self.raw_updates is not None and not isinstance(event, dict):
+            raw = self.raw_updates.pop(event, handler_type)
+            if isinstance(raw, bytes):
+                if self._projection is None:
+                    return raw
+                raw = json.loads(raw)
+            if raw is not None:
+                event = raw
         if not isinstance(event, dict):
+            if self._projection is None:
+                # Encoded straight to the wire form when the framework supports it
+                encoded = object_to_json(event, handler_type)
+                if encoded is not None:
+                    return encoded
             event = object_to_dict(event, handler_type)
         else:
             event = wrap_event(event, handler_type)
 
-        req_data = {"origin": self.origin, "updates": [event]}
+        if self._projection is not None:
+            event = project_update(event, self._projection)
+        return event
+
+    @staticmethod
+    def _event_type(event, handler_type: typing.Optional[HandlerType] = None) -> typing.Optional[str]:
+        if handler_type is not None:
+            return str(handler_type)
+        if isinstance(event, dict):
+            return next((key for key in event if key != "update_id"), None)
+        return resolve_update(event)[0]
+
+    def _encode_event(self, event: typing.Union[dict, bytes]) -> bytes:
+        if isinstance(event, bytes):
+            return event
+        return self._json_encoder(event)
+
+    def _encode_deferred(self, deferred: _DeferredEvent) -> bytes:
+        return self._encode_event(self._prepare_event(deferred.event, deferred.handler_type))
+
+    async def _send_batch(self, events: typing.List[typing.Union[dict, bytes]]) -> BatchResult:
+        updates, requests = split_requests(events)
+        result = BatchResult([], [])
+
+        if updates:
+            body = encode_track_body(self._json_encoder, self.origin, updates)
+            try:
+                await self._request("track", json=body, suppress_exceptions=False, retry=self.retry)
+            except Exception as e:
+                self._undelivered(result, updates, e)
+        if requests:
+            results = await self._request_many(requests, suppress_exceptions=False, retry=self.retry)
+            for (url, body), outcome in zip(requests, results):
+                if isinstance(outcome, Exception):
+                    self._undelivered(result, [encode_request(url, body)], outcome)
+        return result
+
+    def _undelivered(self, result: BatchResult, events: typing.List[typing.Any], error: Exception) -> None:
+        # Failures the retry policy considers transient and an open circuit
+        # are worth sending again later; other rejections are permanent.
+        warnings.warn(f"{type(error).__name__}: {error}")
+        retry = self.retry if self.retry is not None else _DEFAULT_RETRY
+        if isinstance(error, CircuitOpenError) or retry.is_retryable(error):
+            result.retry.extend(events)
+        else:
+            result.failed.extend(events)
+
+    def _enqueue_request(self, url: str, body: typing.Dict[str, typing.Any]) -> bool:
+        if self.closed:
+            warnings.warn("Dashgram client is closed, request dropped")
+            return False
+        return self._enqueue(encode_request(url, self._json_encoder(body)), url)
+
+    def _invited_by_body(self, user_id: int, invited_by: int) -> typing.Dict[str, typing.Any]:
+        return {"user_id": user_id, "invited_by": invited_by, "origin": self.origin}
+
+    def _payment_body(self, user_id: int, payment_id: str, currency: str, amount: float,
+                      invoice_payload: typing.Optional[str] = None,
+                      event_time: typing.Optional[int] = None) -> typing.Dict[str, typing.Any]:
+        req_data: typing.Dict[str, typing.Any] = {
+            "user_id": user_id,
+            "payment_id": payment_id,
+            "currency": currency,
+            "amount": amount,
+            "origin": self.origin,
+        }
+        if invoice_payload is not None:
+            req_data["invoice_payload"] = invoice_payload
+        if event_time is not None:
+            req_data["event_time"] = event_time
+        return req_data
+
+    def _refund_body(self, payment_id: str, currency: str, amount: float,
+                     invoice_payload: typing.Optional[str] = None,
+                     event_time: typing.Optional[int] = None) -> typing.Dict[str, typing.Any]:
+        req_data: typing.Dict[str, typing.Any] = {
+            "payment_id": payment_id,
+            "currency": currency,
+            "amount": amount,
+            "origin": self.origin,
+        }
+        if invoice_payload is not None:
+            req_data["invoice_payload"] = invoice_payload
+        if event_time is not None:
+            req_data["event_time"] = event_time
+        return req_data
 
-        return await self._request("track", json=req_data, suppress_exceptions=suppress_exceptions)
-            
-        
     @auto_async
     async def invited_by(self, user_id: int, invited_by: int, suppress_exceptions: typing.Optional[bool] = None) -> bool:
         """
@@ -181,6 +946,7 @@ class Dashgram:
         Raises:
             InvalidCredentials: If the API credentials are invalid
             DashgramApiError: If the API returns an error response
+            CircuitOpenError: If the circuit breaker is open
         
         Example:
             >>> # Track a user invitation
@@ -193,10 +959,61 @@ class Dashgram:
             ...     suppress_exceptions=False
             ... )
         """
-        req_data = {"user_id": user_id, "invited_by": invited_by, "origin": self.origin}
+        req_data = self._invited_by_body(user_id, invited_by)
             
         return await self._request("invited_by", json=req_data, suppress_exceptions=suppress_exceptions)
 
+    def invited_by_nowait(self, user_id: int, invited_by: int) -> bool:
+        """
+        Queue a user invitation for background sending.
+        
+        The invitation goes through the same background queue, retries,
+        spool and agent as events queued by track_event_nowait().
+        
+        Args:
+            user_id: The ID of the invited user
+            invited_by: The ID of the user who sent the invitation
+        
+        Returns:
+            True if the invitation was queued, False if it was dropped
+        
+        Example:
+            >>> sdk.invited_by_nowait(user_id=123456, invited_by=789012)
+        """
+        return self._enqueue_request("invited_by", self._invited_by_body(user_id, invited_by))
+
+    @auto_async
+    async def invited_by_many(self, invitations: typing.Iterable[typing.Mapping[str, typing.Any]], *,
+                              concurrency: typing.Optional[int] = None,
+                              suppress_exceptions: typing.Optional[bool] = None) -> typing.List[typing.Union[bool, Exception]]:
+        """
+        Track many user invitations, e.g. when importing a referral campaign.
+        
+        Invitations are sent with up to `concurrency` requests in flight and
+        transient failures are retried according to the `retry` policy.
+        
+        Args:
+            invitations: Mappings with the arguments of invited_by(): `user_id` and `invited_by`
+            concurrency: Maximum number of requests in flight (defaults to max_concurrent_requests)
+            suppress_exceptions: Whether failed invitations return False instead of their exception
+        
+        Returns:
+            The result of each invitation, in order: True if it was tracked,
+            otherwise False or the exception it raised
+        
+        Raises:
+            TypeError: If an invitation has missing or unknown fields
+        
+        Example:
+            >>> results = await sdk.invited_by_many([
+            ...     {"user_id": 123456, "invited_by": 789012},
+            ...     {"user_id": 123457, "invited_by": 789012},
+            ... ])
+            >>> failed = [i for i, result in enumerate(results) if result is not True]
+        """
+        requests = (("invited_by", self._invited_by_body(**invitation)) for invitation in invitations)
+        return await self._request_many(requests, concurrency, suppress_exceptions, retry=self.retry)
+
     @auto_async
     async def payment(
         self,
@@ -223,20 +1040,72 @@ class Dashgram:
         Returns:
             True if the payment was tracked successfully, False otherwise
         """
-        req_data: typing.Dict[str, typing.Any] = {
-            "user_id": user_id,
-            "payment_id": payment_id,
-            "currency": currency,
-            "amount": amount,
-            "origin": self.origin,
-        }
-        if invoice_payload is not None:
-            req_data["invoice_payload"] = invoice_payload
-        if event_time is not None:
-            req_data["event_time"] = event_time
+        req_data = self._payment_body(user_id, payment_id, currency, amount, invoice_payload, event_time)
 
         return await self._request("payment", json=req_data, suppress_exceptions=suppress_exceptions)
 
+    def payment_nowait(
+        self,
+        user_id: int,
+        payment_id: str,
+        currency: str,
+        amount: float,
+        invoice_payload: typing.Optional[str] = None,
+        event_time: typing.Optional[int] = None,
+    ) -> bool:
+        """
+        Queue a manual payment for background sending.
+
+        The payment goes through the same background queue, retries, spool
+        and agent as events queued by track_event_nowait().
+
+        Args:
+            user_id: Telegram user ID associated with the payment
+            payment_id: Unique payment or charge identifier
+            currency: Payment currency (XTR/stars, TON, USD, or USDT)
+            amount: Payment amount in full decimal units
+            invoice_payload: Optional invoice payload associated with the payment
+            event_time: Optional Unix timestamp for when the payment happened
+
+        Returns:
+            True if the payment was queued, False if it was dropped
+        """
+        return self._enqueue_request(
+            "payment", self._payment_body(user_id, payment_id, currency, amount, invoice_payload, event_time)
+        )
+
+    @auto_async
+    async def payments(self, payments: typing.Iterable[typing.Mapping[str, typing.Any]], *,
+                       concurrency: typing.Optional[int] = None,
+                       suppress_exceptions: typing.Optional[bool] = None) -> typing.List[typing.Union[bool, Exception]]:
+        """
+        Track many manual payments, e.g. when reconciling a day of transactions.
+
+        Payments are sent with up to `concurrency` requests in flight and
+        transient failures are retried according to the `retry` policy.
+
+        Args:
+            payments: Mappings with the arguments of payment(): `user_id`, `payment_id`,
+                `currency`, `amount` and optionally `invoice_payload` and `event_time`
+            concurrency: Maximum number of requests in flight (defaults to max_concurrent_requests)
+            suppress_exceptions: Whether failed payments return False instead of their exception
+
+        Returns:
+            The result of each payment, in order: True if it was tracked,
+            otherwise False or the exception it raised
+
+        Raises:
+            TypeError: If a payment has missing or unknown fields
+
+        Example:
+            >>> results = await sdk.payments(
+            ...     {"user_id": tx.user_id, "payment_id": tx.id, "currency": "XTR", "amount": tx.amount}
+            ...     for tx in transactions
+            ... )
+        """
+        requests = (("payment", self._payment_body(**payment)) for payment in payments)
+        return await self._request_many(requests, concurrency, suppress_exceptions, retry=self.retry)
+
     @auto_async
     async def refund_payment(
         self,
@@ -261,20 +1130,65 @@ class Dashgram:
         Returns:
             True if the refund was tracked successfully, False otherwise
         """
-        req_data: typing.Dict[str, typing.Any] = {
-            "payment_id": payment_id,
-            "currency": currency,
-            "amount": amount,
-            "origin": self.origin,
-        }
-        if invoice_payload is not None:
-            req_data["invoice_payload"] = invoice_payload
-        if event_time is not None:
-            req_data["event_time"] = event_time
+        req_data = self._refund_body(payment_id, currency, amount, invoice_payload, event_time)
 
         return await self._request("payment/refund", json=req_data, suppress_exceptions=suppress_exceptions)
 
-    def bind_aiogram(self, dp) -> None:
+    def refund_payment_nowait(
+        self,
+        payment_id: str,
+        currency: str,
+        amount: float,
+        invoice_payload: typing.Optional[str] = None,
+        event_time: typing.Optional[int] = None,
+    ) -> bool:
+        """
+        Queue a payment refund for background sending.
+
+        The refund goes through the same background queue, retries, spool
+        and agent as events queued by track_event_nowait().
+
+        Args:
+            payment_id: Unique payment or charge identifier being refunded
+            currency: Refund currency (XTR/stars, TON, USD, or USDT)
+            amount: Refund amount in full decimal units
+            invoice_payload: Optional invoice payload associated with the payment
+            event_time: Optional Unix timestamp for when the refund happened
+
+        Returns:
+            True if the refund was queued, False if it was dropped
+        """
+        return self._enqueue_request(
+            "payment/refund", self._refund_body(payment_id, currency, amount, invoice_payload, event_time)
+        )
+
+    @auto_async
+    async def refund_payments(self, refunds: typing.Iterable[typing.Mapping[str, typing.Any]], *,
+                              concurrency: typing.Optional[int] = None,
+                              suppress_exceptions: typing.Optional[bool] = None) -> typing.List[typing.Union[bool, Exception]]:
+        """
+        Track many payment refunds.
+
+        Refunds are sent with up to `concurrency` requests in flight and
+        transient failures are retried according to the `retry` policy.
+
+        Args:
+            refunds: Mappings with the arguments of refund_payment(): `payment_id`,
+                `currency`, `amount` and optionally `invoice_payload` and `event_time`
+            concurrency: Maximum number of requests in flight (defaults to max_concurrent_requests)
+            suppress_exceptions: Whether failed refunds return False instead of their exception
+
+        Returns:
+            The result of each refund, in order: True if it was tracked,
+            otherwise False or the exception it raised
+
+        Raises:
+            TypeError: If a refund has missing or unknown fields
+        """
+        requests = (("payment/refund", self._refund_body(**refund)) for refund in refunds)
+        return await self._request_many(requests, concurrency, suppress_exceptions, retry=self.retry)
+
+    def bind_aiogram(self, dp, background: bool = False) -> None:
         """
         Bind the SDK to an aiogram dispatcher for automatic event tracking.
         
@@ -284,6 +1198,8 @@ class Dashgram:
         
         Args:
             dp: The aiogram Dispatcher instance to bind to
+            background: Queue updates with track_event_nowait() instead of awaiting
+                the request before the handler runs (default: False)
         
         Example:
             >>> from aiogram import Bot, Dispatcher
@@ -298,8 +1214,11 @@ class Dashgram:
             >>> async def handle_message(message):
             ...     # This message will be automatically tracked
             ...     await message.answer("Hello!")
+            
+            >>> # Track in the background without delaying handlers
+            >>> sdk.bind_aiogram(dp, background=True)
         """
-        aiogram.bind(self, dp)
+        aiogram.bind(self, dp, background)
 
     def bind_telegram(self, app, group: int = -1, block: bool = False) -> None:
         """
@@ -348,6 +1267,9 @@ class Dashgram:
             >>> sdk = Dashgram(project_id="123", access_key="key")
             >>> sdk.bind_telebot(bot)
             
+            >>> # With a synchronous TeleBot, events are sent by a background
+            >>> # thread which stops together with bot.stop_polling()
+            
             >>> # Now all events will be automatically tracked
             >>> @bot.message_handler(func=lambda message: True)
             >>> def handle_message(message):
@@ -0,0 +1,97 @@
+"""
+Dashgram SDK Compression Module.
+
+This module provides request body compression for the Dashgram API.
+Telegram updates are highly repetitive JSON, so batched /track payloads
+compress several-fold with gzip or zstd.
+
+zstd support requires the optional `zstandard` package
+(`pip install dashgram[zstd]`).
+"""
+
+import typing
+import zlib
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+GZIP = "gzip"
+ZSTD = "zstd"
+AUTO = "auto"
+
+
+def zstd_available() -> bool:
+    """
+    Check whether zstd compression can be used.
+
+    Returns:
+        True if the `zstandard` package is installed
+    """
+    return zstandard is not None
+
+
+class Compressor:
+    """
+    Compresses request bodies above a minimum size.
+
+    Bodies smaller than `min_size` bytes are sent uncompressed, because the
+    compression overhead outweighs the saved bytes.
+
+    Attributes:
+        encoding: The content encoding used ("gzip" or "zstd")
+        min_size: Minimum body size in bytes to compress
+        level: Compression level
+
+    Example:
+        >>> compressor = Compressor("gzip", min_size=1024)
+        >>> body, content_encoding = compressor.compress(b'{"updates": [...]}')
+    """
+
+    def __init__(self, encoding: str = AUTO, min_size: int = 1024, level: typing.Optional[int] = None) -> None:
+        """
+        Initialize the compressor.
+
+        Args:
+            encoding: "gzip", "zstd", or "auto" to use zstd when installed and gzip otherwise
+            min_size: Minimum body size in bytes to compress
+            level: Compression level (defaults to 6 for gzip and 3 for zstd)
+
+        Raises:
+            ValueError: If the encoding is not supported
+            ImportError: If zstd is requested but `zstandard` is not installed
+        """
+        if encoding == AUTO:
+            encoding = ZSTD if zstd_available() else GZIP
+        if encoding not in (GZIP, ZSTD):
+            raise ValueError(f"Unsupported compression: {encoding}")
+        if encoding == ZSTD and not zstd_available():
+            raise ImportError("zstandard is not installed")
+
+        self.encoding = encoding
+        self.min_size = min_size
+
+        if level is None:
+            level = 3 if encoding == ZSTD else 6
+        self.level = level
+
+    def compress(self, body: bytes) -> typing.Tuple[bytes, typing.Optional[str]]:
+        """
+        Compress a request body if it is large enough.
+
+        Args:
+            body: The encoded request body
+
+        Returns:
+            A tuple of the body to send and its content encoding, or None if
+            the body was left uncompressed
+        """
+        if len(body) < self.min_size:
+            return body, None
+
+        if self.encoding == ZSTD:
+            return zstandard.ZstdCompressor(level=self.level).compress(body), ZSTD
+
+        compressor = zlib.compressobj(self.level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+        return compressor.compress(body) + compressor.flush(), GZIP
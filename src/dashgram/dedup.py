@@ -0,0 +1,127 @@
+"""
+Dashgram SDK Deduplication Module.
+
+This module suppresses duplicate updates. Telegram retries webhook
+deliveries, and rolling deployments may process an update twice; updates
+whose `update_id` was already tracked within a time window are skipped
+before they are converted or sent.
+"""
+
+import collections
+import re
+import threading
+import time
+import typing
+
+from dashgram.enums import HandlerType
+
+_RAW_UPDATE_ID = re.compile(rb'\s*\{\s*"update_id"\s*:\s*(-?\d+)')
+
+
+def get_update_id(event: typing.Any, handler_type: typing.Optional[HandlerType] = None) -> typing.Optional[int]:
+    """
+    Get the update_id of an event without converting it.
+
+    Args:
+        event: A framework object, dictionary or encoded JSON bytes
+        handler_type: The type of handler for this event (optional)
+
+    Returns:
+        The update_id, or None if the event is not a full update or it has
+        the synthetic update_id -1
+
+    Example:
+        >>> get_update_id(b'{"update_id":42,"message":{}}')
+        42
+    """
+    if handler_type is not None:
+        return None
+
+    if isinstance(event, (bytes, bytearray, memoryview)):
+        match = _RAW_UPDATE_ID.match(event)
+        update_id = int(match.group(1)) if match else None
+    elif isinstance(event, dict):
+        update_id = event.get("update_id")
+    else:
+        update_id = getattr(event, "update_id", None)
+
+    if not isinstance(update_id, int) or update_id == -1:
+        return None
+    return update_id
+
+
+class Deduplicator:
+    """
+    Time-windowed set of recently tracked update ids.
+
+    Ids are kept in insertion order for `window` seconds and at most
+    `max_size` ids are kept, the oldest being evicted first, so memory is
+    bounded and each lookup is O(1). The deduplicator is thread-safe.
+
+    Attributes:
+        window: Time in seconds an update_id is remembered
+        max_size: Maximum number of remembered ids
+        duplicates: Number of duplicate updates detected
+
+    Example:
+        >>> dedup = Deduplicator(window=300)
+        >>> dedup.is_duplicate(update)
+        False
+        >>> dedup.is_duplicate(update)
+        True
+    """
+
+    def __init__(self, window: float = 600.0, max_size: int = 100000) -> None:
+        """
+        Initialize the deduplicator.
+
+        Args:
+            window: Time in seconds an update_id is remembered
+            max_size: Maximum number of remembered ids
+        """
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+
+        self.window = window
+        self.max_size = max_size
+        self.duplicates = 0
+
+        self._seen: "collections.OrderedDict[int, float]" = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._seen)
+
+    def is_duplicate(self, event: typing.Any, handler_type: typing.Optional[HandlerType] = None) -> bool:
+        """
+        Check whether an update was already seen within the window, and remember it.
+
+        Events without an update_id, such as payloads passed with a
+        handler_type, are never duplicates.
+
+        Args:
+            event: A framework object, dictionary or encoded JSON bytes
+            handler_type: The type of handler for this event (optional)
+
+        Returns:
+            True if the update is a duplicate
+        """
+        update_id = get_update_id(event, handler_type)
+        if update_id is None:
+            return False
+
+        now = time.monotonic()
+        with self._lock:
+            seen = self._seen
+            while seen:
+                oldest, seen_at = next(iter(seen.items()))
+                if now - seen_at < self.window and len(seen) < self.max_size:
+                    break
+                del seen[oldest]
+
+            if update_id in seen:
+                self.duplicates += 1
+                return True
+
+            seen[update_id] = now
+            return False
@@ -57,3 +57,36 @@ class HandlerType(Enum):
             ['message', 'edited_message', 'channel_post', ...]
         """
         return [e.value for e in cls]
+
+
+class OverflowPolicy(Enum):
+    """
+    Enumeration of the policies applied when the background queue is full.
+
+    The queue is full when it holds `max_queue_size` events or
+    `max_queue_bytes` bytes of encoded events.
+    """
+
+    DROP_NEWEST = "drop_newest"
+    DROP_OLDEST = "drop_oldest"
+    BLOCK = "block"
+    SPILL = "spill"
+
+    def __str__(self) -> str:
+        return self.value
+
+
+class CircuitState(Enum):
+    """
+    Enumeration of the states of the circuit breaker around the Dashgram API.
+
+    Requests pass while the circuit is closed, fail fast while it is open,
+    and a limited number of probe requests pass while it is half-open.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __str__(self) -> str:
+        return self.value
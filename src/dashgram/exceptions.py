@@ -5,6 +5,8 @@ This module contains all custom exceptions used by the Dashgram SDK
 for error handling and debugging.
 """
 
+import typing
+
 
 class DashgramError(Exception):
     """
@@ -66,6 +68,7 @@ class DashgramApiError(DashgramError):
     Attributes:
         status_code: The HTTP status code returned by the API
         details: Additional error details from the API response
+        retry_after: Delay in seconds requested by the API's Retry-After header, if any
         message: The formatted error message combining status code and details
     
     Example:
@@ -75,14 +78,45 @@ class DashgramApiError(DashgramError):
         ...     print(f"API Error {e.status_code}: {e.details}")
     """
     
-    def __init__(self, status_code: int, details: str):
+    def __init__(self, status_code: int, details: str, retry_after: typing.Optional[float] = None):
         """
         Initialize the DashgramApiError exception.
         
         Args:
             status_code: The HTTP status code from the API response
             details: Additional error details from the API response
+            retry_after: Delay in seconds from the Retry-After header (optional)
         """
         self.status_code = status_code
         self.details = details
+        self.retry_after = retry_after
         super().__init__(f"{self.details} - Status Code: {self.status_code}")
+
+
+class CircuitOpenError(DashgramError):
+    """
+    Exception raised when a request is rejected by the open circuit breaker.
+    
+    While the circuit breaker is open, requests to the Dashgram API fail
+    immediately instead of waiting for timeouts of a degraded API.
+    
+    Attributes:
+        retry_after: Time in seconds until the circuit breaker lets probe requests through
+        message: The error message
+    
+    Example:
+        >>> try:
+        ...     await sdk.track_event(event, suppress_exceptions=False)
+        ... except CircuitOpenError as e:
+        ...     print(f"Dashgram API unavailable, retry in {e.retry_after:.0f}s")
+    """
+    
+    def __init__(self, retry_after: float = 0.0):
+        """
+        Initialize the CircuitOpenError exception.
+        
+        Args:
+            retry_after: Time in seconds until probe requests are let through
+        """
+        self.retry_after = retry_after
+        super().__init__("Dashgram API circuit breaker is open")
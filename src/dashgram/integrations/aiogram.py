@@ -1,21 +1,28 @@
 # aiogram integration
+import functools
 import typing
+import warnings
 
 from dashgram.enums import HandlerType
 
 try:
-    from aiogram.utils.serialization import deserialize_telegram_object_to_python
     from aiogram import types, Dispatcher
     aiogram = True
 except ImportError as e:
     aiogram = False
     types = None
     Dispatcher = typing.Any
-    deserialize_telegram_object_to_python = None
 
+# aiogram types are pydantic models whose aliases ("from", "bot") are the
+# Telegram field names, so one model_dump() pass produces the wire form.
+# Fields left unset are skipped: they include the `Default` placeholders of
+# bot-level defaults, which are not JSON-serializable, and for updates
+# received from Telegram the set fields are exactly the ones it sent.
+_DUMP_OPTIONS: typing.Dict[str, typing.Any] = {"by_alias": True, "exclude_none": True, "exclude_unset": True}
 
-def object_to_dict(obj, handler_type: typing.Optional[HandlerType] = None) -> dict:
-    if not aiogram or not deserialize_telegram_object_to_python or not types:
+
+def _as_update(obj, handler_type: typing.Optional[HandlerType] = None):
+    if not aiogram or not types:
         raise ImportError("aiogram is not installed")
 
     if not isinstance(obj, types.Update):
@@ -23,13 +30,20 @@ def object_to_dict(obj, handler_type: typing.Optional[HandlerType] = None) -> di
             raise TypeError("specify handler_type or pass instance of aiogram.types.Update as an event")
 
         obj = types.Update(update_id=-1, **{str(handler_type): obj})
+    return obj
+
+
+def object_to_dict(obj, handler_type: typing.Optional[HandlerType] = None) -> dict:
+    return _as_update(obj, handler_type).model_dump(mode="json", **_DUMP_OPTIONS)
 
-    raw_data = deserialize_telegram_object_to_python(obj)
-    data = rename_key(raw_data, "from_user", "from")
 
-    return data
+def object_to_json(obj, handler_type: typing.Optional[HandlerType] = None) -> bytes:
+    return _as_update(obj, handler_type).model_dump_json(**_DUMP_OPTIONS).encode("utf-8")
 
 
+# Deprecated: no longer used by the SDK since object_to_dict() relies on the
+# pydantic aliases. Kept unchanged for existing imports and the benchmark
+# baseline; it will be removed in a future release.
 def rename_key(d, old_key, new_key):
     nd = {}
 
@@ -46,10 +60,46 @@ def rename_key(d, old_key, new_key):
     return nd
 
 
-def bind(sdk, dp):
+def capture_raw_updates(sdk, dp) -> None:
+    feed_raw_update = dp.feed_raw_update
+    feed_webhook_update = dp.feed_webhook_update
+
+    @functools.wraps(feed_raw_update)
+    async def capturing_feed_raw_update(bot, update, **kwargs):
+        sdk.capture_raw_update(update)
+        return await feed_raw_update(bot, update, **kwargs)
+
+    @functools.wraps(feed_webhook_update)
+    async def capturing_feed_webhook_update(bot, update, *args, **kwargs):
+        if isinstance(update, dict):
+            sdk.capture_raw_update(update)
+        return await feed_webhook_update(bot, update, *args, **kwargs)
+
+    dp.feed_raw_update = capturing_feed_raw_update
+    dp.feed_webhook_update = capturing_feed_webhook_update
+
+
+def bind(sdk, dp, background: bool = False):
     if not aiogram:
         raise ImportError("aiogram is not installed")
 
+    if sdk.raw_updates is not None:
+        capture_raw_updates(sdk, dp)
+
+    if background:
+        @dp.update.outer_middleware()
+        async def track_event_background_middleware(
+                handler,
+                event,
+                data
+        ):
+            try:
+                sdk.track_event_nowait(event)
+            except Exception as e:
+                warnings.warn(f"{type(e).__name__}: {e}")
+            return await handler(event, data)
+        return
+
     @dp.update.outer_middleware()
     async def track_event_middleware(
             handler,
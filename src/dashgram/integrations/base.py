@@ -5,6 +5,11 @@ This module provides base functionality for framework detection and object
 conversion across different Telegram bot frameworks. It automatically
 detects which framework is being used and routes object conversion
 to the appropriate framework-specific module.
+
+Converters are resolved once per class and cached, so routing a tracked
+event costs one dictionary lookup. Converters for other classes, such as
+an application's own wrappers of updates, are added with
+register_converter().
 """
 
 import typing
@@ -19,6 +24,66 @@ _MAPPING = {
     "telebot": telebot.object_to_dict,
 }
 
+# Frameworks whose objects can be encoded to JSON without an intermediate dictionary
+_JSON_MAPPING = {
+    "aiogram": aiogram.object_to_json,
+}
+
+Converter = typing.Callable[[typing.Any, typing.Optional[HandlerType]], dict]
+JsonConverter = typing.Callable[[typing.Any, typing.Optional[HandlerType]], bytes]
+
+# Converters registered with register_converter(), applying to subclasses too
+_REGISTERED: typing.Dict[type, typing.Tuple[Converter, typing.Optional[JsonConverter]]] = {}
+
+# Converters resolved per class, (None, None) for unsupported classes
+_CONVERTERS: typing.Dict[type, typing.Tuple[typing.Optional[Converter], typing.Optional[JsonConverter]]] = {}
+
+
+def register_converter(cls: type, converter: Converter, json_converter: typing.Optional[JsonConverter] = None) -> None:
+    """
+    Register how to convert objects of a class, and of its subclasses, for the Dashgram API.
+    
+    Registered converters take precedence over the framework detection, so
+    they can also replace the converter of a framework class.
+    
+    Args:
+        cls: The class of the objects
+        converter: Function called with an object and the handler type (or None),
+            returning the Telegram update as a dictionary
+        json_converter: Function called with the same arguments returning the
+            update encoded as JSON bytes, used instead of converter when no
+            projection is configured (optional)
+    
+    Example:
+        >>> class TrackedUpdate:
+        ...     def __init__(self, update: dict, received_at: float):
+        ...         self.update = update
+        ...         self.received_at = received_at
+        
+        >>> register_converter(TrackedUpdate, lambda obj, handler_type: obj.update)
+        >>> await sdk.track_event(TrackedUpdate(update, time.time()))
+    """
+    _REGISTERED[cls] = (converter, json_converter)
+    _CONVERTERS.clear()
+
+
+def _get_converters(cls: type) -> typing.Tuple[typing.Optional[Converter], typing.Optional[JsonConverter]]:
+    try:
+        return _CONVERTERS[cls]
+    except KeyError:
+        pass
+
+    for base in cls.__mro__:
+        if base in _REGISTERED:
+            converters = _REGISTERED[base]
+            break
+    else:
+        package = cls.__module__.split(".")[0]
+        converters = (_MAPPING.get(package), _JSON_MAPPING.get(package))
+
+    _CONVERTERS[cls] = converters
+    return converters
+
 
 def get_package(obj) -> typing.Optional[str]:
     """
@@ -64,10 +129,7 @@ def determine_object_source(obj):
         >>> conv_func = determine_object_source(message)
         >>> # conv_func will be aiogram.object_to_dict
     """
-    package = get_package(obj)
-    if package is None:
-        return None
-    return _MAPPING[package]
+    return _get_converters(type(obj))[0]
 
 
 def object_to_dict(obj, handler_type: typing.Optional[HandlerType] = None):
@@ -98,6 +160,32 @@ def object_to_dict(obj, handler_type: typing.Optional[HandlerType] = None):
     return conv(obj, handler_type)
 
 
+def object_to_json(obj, handler_type: typing.Optional[HandlerType] = None) -> typing.Optional[bytes]:
+    """
+    Encode a framework object directly to the JSON of a Telegram update.
+    
+    Frameworks built on pydantic (aiogram) encode their objects to JSON in a
+    single pass, which is faster than converting them to a dictionary first.
+    
+    Args:
+        obj: The framework object to encode
+        handler_type: The type of handler (optional, used for validation)
+    
+    Returns:
+        The encoded update, or None if the class of the object has no JSON
+        converter and object_to_dict() should be used instead
+    
+    Example:
+        >>> object_to_json(message, HandlerType.MESSAGE)
+        b'{"update_id":-1,"message":{...}}'
+    """
+    conv = _get_converters(type(obj))[1]
+    if conv is None:
+        return None
+
+    return conv(obj, handler_type)
+
+
 def resolve_framework() -> typing.Optional[str]:
     """
     Automatically detect which Telegram bot framework is being used.
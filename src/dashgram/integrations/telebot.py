@@ -1,5 +1,8 @@
 # pyTelegramBotAPI integration
+import functools
+import inspect
 import typing
+import warnings
 
 from dashgram.enums import HandlerType
 
@@ -22,9 +25,12 @@ try:
         def post_process_event(self, event_type: str, message, data, exception):
             try:
                 handler_type = HandlerType[event_type.upper()]
-                self.sdk.track_event(message, handler_type)
             except KeyError:
-                pass
+                return
+            try:
+                self.sdk.track_event_nowait(message, handler_type)
+            except Exception as e:
+                warnings.warn(f"{type(e).__name__}: {e}")
 
         def post_process_message(self, message, data, exception):
             self.post_process_event('message', message, data, exception)
@@ -316,6 +322,15 @@ except ImportError:
     TeleBot = None
     AsyncTeleBot = None
 
+# Payload attributes of telebot.types.Update, computed once instead of
+# scanning the __dict__ of every update
+_UPDATE_FIELDS: typing.Tuple[str, ...] = ()
+if telebot:
+    _UPDATE_FIELDS = tuple(
+        name for name, param in inspect.signature(types.Update.__init__).parameters.items()
+        if name not in ("self", "update_id") and param.kind is param.POSITIONAL_OR_KEYWORD
+    )
+
 
 def object_to_dict(obj, handler_type: typing.Optional[HandlerType] = None) -> dict:
     if not telebot or not types:
@@ -328,12 +343,12 @@ def object_to_dict(obj, handler_type: typing.Optional[HandlerType] = None) -> di
     update_id = -1
     if isinstance(obj, types.Update):
         update_id = obj.update_id
-        for k, v in obj.__dict__.items():
-            if k == "update_id":
-                continue
-            if v is not None and hasattr(v, "json"):
-                handler_name = k
-                data = v
+        attrs = obj.__dict__
+        for name in _UPDATE_FIELDS:
+            value = attrs.get(name)
+            if value is not None and hasattr(value, "json"):
+                handler_name = name
+                data = value
                 break
     else:
         data = obj
@@ -349,6 +364,20 @@ def bind(sdk, bot):
         raise ImportError('pyTelegramBotAPI is not installed')
     
     if TeleBot is not None and isinstance(bot, TeleBot):
+        sdk.start_sender_thread()
         bot.setup_middleware(TrackMiddleware(sdk))
+        stop_sender_with_polling(sdk, bot)
     elif AsyncTeleBot is not None and isinstance(bot, AsyncTeleBot):
         bot.setup_middleware(AsyncTrackMiddleware(sdk))
+
+
+def stop_sender_with_polling(sdk, bot):
+    stop_polling = bot.stop_polling
+
+    @functools.wraps(stop_polling)
+    def wrapper(*args, **kwargs):
+        result = stop_polling(*args, **kwargs)
+        sdk.stop_sender_thread()
+        return result
+
+    bot.stop_polling = wrapper
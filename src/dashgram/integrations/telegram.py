@@ -1,16 +1,110 @@
 # python-telegram-bot integration
+import datetime
+import operator
+import typing
+
 try:
+    from telegram import TelegramObject
     from telegram.ext import BaseHandler
     telegram = True
 except ImportError:
     telegram = False
     BaseHandler = None
+    TelegramObject = None
+
+# The fast conversion relies on private helpers of python-telegram-bot;
+# without them objects are converted with their own to_dict()
+try:
+    from telegram._utils.datetime import to_timestamp
+    from telegram._utils.defaultvalue import DefaultValue
+    fast_path = telegram
+except ImportError:
+    fast_path = False
+
+# Serialized attribute names per class and a getter of their values, None
+# for classes left to their own to_dict(). TelegramObject.to_dict() recomputes
+# the names from the MRO of every nested object on every call.
+_FIELDS: typing.Dict[type, typing.Optional[typing.Tuple[typing.Tuple[str, ...], typing.Callable]]] = {}
+
+
+def _get_fields(obj) -> typing.Optional[typing.Tuple[typing.Tuple[str, ...], typing.Callable]]:
+    cls = type(obj)
+    try:
+        return _FIELDS[cls]
+    except KeyError:
+        pass
+
+    if (not fast_path or cls.to_dict is not TelegramObject.to_dict or hasattr(obj, "__dict__")
+            or not hasattr(obj, "_get_attrs_names")):
+        fields = None
+    else:
+        names = tuple(obj._get_attrs_names(include_private=False))
+        getter = operator.attrgetter(*names) if len(names) > 1 else lambda o: tuple(getattr(o, n) for n in names)
+        fields = (names, getter)
+    _FIELDS[cls] = fields
+    return fields
+
+
+def _to_dict(obj) -> dict:
+    # Same output as TelegramObject.to_dict(), with the attribute names of each class computed once
+    fields = _get_fields(obj)
+    if fields is None:
+        return obj.to_dict()
+
+    names, getter = fields
+    try:
+        values = getter(obj)
+    except AttributeError:
+        values = [getattr(obj, key, None) for key in names]
+
+    out = {}
+    timedeltas = {}
+    for key, value in zip(names, values):
+        if value is None:
+            continue
+        if isinstance(value, DefaultValue):
+            value = value.value
+            if value is None:
+                continue
+
+        if isinstance(value, TelegramObject):
+            value = _to_dict(value)
+        elif isinstance(value, (tuple, list)):
+            if not value:
+                continue
+            value = [_item_to_dict(item) for item in value]
+        elif isinstance(value, datetime.datetime):
+            value = to_timestamp(value)
+        elif isinstance(value, datetime.timedelta):
+            seconds = value.total_seconds()
+            timedeltas[key[1:] if key.startswith("_") else key] = int(seconds) if seconds.is_integer() else seconds
+            continue
+        elif hasattr(value, "to_dict"):
+            value = value.to_dict()
+
+        out[key] = value
+
+    if out.get("from_user"):
+        out["from"] = out.pop("from_user")
+    out.update(timedeltas)
+    out.update(out.pop("api_kwargs", {}))
+    return out
+
+
+def _item_to_dict(item):
+    if isinstance(item, TelegramObject):
+        return _to_dict(item)
+    if hasattr(item, "to_dict"):
+        return item.to_dict()
+    if isinstance(item, (tuple, list)):
+        return [_item_to_dict(i) if hasattr(i, "to_dict") else i for i in item]
+    return item
 
 
 def object_to_dict(obj, *args, **kwargs) -> dict:
     if not telegram:
         raise ImportError("python-telegram-bot is not installed")
-    return obj.to_dict()
+    return _to_dict(obj)
 
 
 def bind(sdk, app, group: int = -1, block: bool = False):
@@ -24,4 +118,4 @@ def bind(sdk, app, group: int = -1, block: bool = False):
     async def track_update(update, context) -> None:
         await sdk.track_event(update)
 
-    app.add_handler(UpdateHandler(track_update, block=block), group=group)
\ No newline at end of file
+    app.add_handler(UpdateHandler(track_update, block=block), group=group)
@@ -0,0 +1,212 @@
+"""
+Dashgram SDK Projection Module.
+
+This module provides field projection of tracked events. Converted updates
+contain every photo size, reply chains, entities and keyboards, most of
+which analytics don't use. A `Projection` declares which fields of an update
+payload are kept or removed and how long texts may be, and is compiled once
+into a pruning function applied to every event of its update type.
+
+Field paths are dotted keys relative to the update payload, e.g. `from.id`
+or `reply_to_message`. Paths apply to every element of lists, so
+`photo.file_id` keeps only the `file_id` of each photo size.
+"""
+
+import typing
+
+from dashgram.enums import HandlerType
+
+TEXT_FIELDS = frozenset(("text", "caption"))
+
+# Parsed field paths: a key maps to a nested tree, or to None for the
+# whole value
+_PathTree = typing.Dict[str, typing.Optional["_PathTree"]]
+_Pruner = typing.Callable[[typing.Any], typing.Any]
+
+
+def _parse_paths(paths: typing.Iterable[str]) -> _PathTree:
+    root: _PathTree = {}
+    for path in paths:
+        node = root
+        parts = path.split(".")
+        for i, part in enumerate(parts):
+            if not part:
+                raise ValueError(f"Invalid field path: {path!r}")
+            if part in node and node[part] is None:
+                break
+            if i == len(parts) - 1:
+                node[part] = None
+            else:
+                child = node.get(part)
+                if child is None:
+                    child = node[part] = {}
+                node = child
+    return root
+
+
+def _identity(value: typing.Any) -> typing.Any:
+    return value
+
+
+def _compile(include: typing.Optional[_PathTree], exclude: _PathTree,
+             trim: typing.Optional[int], default: _Pruner) -> _Pruner:
+    if include is None and not exclude:
+        return default
+
+    drop = frozenset(key for key, sub in exclude.items() if sub is None)
+    children: typing.Dict[str, _Pruner] = {}
+    for key in set(include or ()) | set(exclude):
+        if key in drop:
+            continue
+        sub_include = include.get(key) if include is not None else None
+        children[key] = _compile(sub_include, exclude.get(key) or {}, trim, default)
+
+    keys = None if include is None else tuple(key for key in include if key not in drop)
+
+    def prune(value: typing.Any) -> typing.Any:
+        if isinstance(value, list):
+            return [prune(item) for item in value]
+        if not isinstance(value, dict):
+            return value
+
+        result = {}
+        for key in value if keys is None else keys:
+            if key in drop or key not in value:
+                continue
+            item = value[key]
+            if trim is not None and key in TEXT_FIELDS and isinstance(item, str):
+                item = item[:trim]
+            result[key] = children.get(key, default)(item)
+        return result
+
+    return prune
+
+
+def _compile_trimmer(trim: typing.Optional[int]) -> _Pruner:
+    if trim is None:
+        return _identity
+
+    def trim_texts(value: typing.Any) -> typing.Any:
+        if isinstance(value, list):
+            return [trim_texts(item) for item in value]
+        if not isinstance(value, dict):
+            return value
+
+        result = {}
+        for key, item in value.items():
+            if key in TEXT_FIELDS and isinstance(item, str):
+                result[key] = item[:trim]
+            else:
+                result[key] = trim_texts(item)
+        return result
+
+    return trim_texts
+
+
+class Projection:
+    """
+    Declarative projection of an update payload.
+
+    Only the fields in `include` are kept (all fields if not set), then the
+    fields in `exclude` are removed, and `text` and `caption` fields are cut
+    to `max_text_length` characters. Subtrees without rules are kept as-is
+    and are only traversed when texts are trimmed.
+
+    Attributes:
+        include: Field paths to keep, or None to keep all fields
+        exclude: Field paths to remove
+        max_text_length: Maximum length of text and caption fields (None for no limit)
+
+    Example:
+        >>> projection = Projection(
+        ...     include=["message_id", "from", "chat.id", "chat.type", "date", "text"],
+        ...     max_text_length=256,
+        ... )
+        >>> projection({"message_id": 1, "chat": {"id": 2, "title": "x"}, "photo": [...]})
+        {'message_id': 1, 'chat': {'id': 2}}
+    """
+
+    def __init__(self, include: typing.Optional[typing.Iterable[str]] = None,
+                 exclude: typing.Iterable[str] = (),
+                 max_text_length: typing.Optional[int] = None) -> None:
+        """
+        Compile a projection.
+
+        Args:
+            include: Field paths to keep, or None to keep all fields
+            exclude: Field paths to remove
+            max_text_length: Maximum length of text and caption fields (None for no limit)
+
+        Raises:
+            ValueError: If a field path is empty or max_text_length is negative
+        """
+        if max_text_length is not None and max_text_length < 0:
+            raise ValueError("max_text_length must not be negative")
+
+        self.include = None if include is None else tuple(include)
+        self.exclude = tuple(exclude)
+        self.max_text_length = max_text_length
+
+        default = _compile_trimmer(max_text_length)
+        include_tree = None if self.include is None else _parse_paths(self.include)
+        self._prune = _compile(include_tree, _parse_paths(self.exclude), max_text_length, default)
+
+    def __call__(self, payload: typing.Any) -> typing.Any:
+        """
+        Apply the projection to an update payload.
+
+        Args:
+            payload: The update payload as a dictionary
+
+        Returns:
+            A pruned copy of the payload (the payload itself if the projection has no rules)
+        """
+        return self._prune(payload)
+
+
+Projections = typing.Union[Projection, typing.Mapping[typing.Union[HandlerType, str], Projection]]
+
+
+def normalize_projections(projection: Projections) -> typing.Union[Projection, typing.Dict[str, Projection]]:
+    """
+    Key a mapping of projections by update type string.
+
+    Args:
+        projection: A projection for every update type, or a mapping of update types to projections
+
+    Returns:
+        The projection, or a dictionary keyed by update type strings
+
+    Raises:
+        ValueError: If an update type is unknown
+    """
+    if isinstance(projection, Projection):
+        return projection
+    return {str(HandlerType(str(update_type))): project for update_type, project in projection.items()}
+
+
+def project_update(update: typing.Dict[str, typing.Any],
+                   projection: typing.Union[Projection, typing.Mapping[str, Projection]]) -> typing.Dict[str, typing.Any]:
+    """
+    Apply a projection to the payload of an update.
+
+    Args:
+        update: The update dictionary with `update_id` and one payload key
+        projection: A projection applied to every update type, or a dictionary
+            returned by normalize_projections()
+
+    Returns:
+        The update with its payload projected; update_id is always kept
+
+    Example:
+        >>> project_update(update, {"message": Projection(exclude=["reply_markup"])})
+    """
+    for update_type, payload in update.items():
+        if update_type == "update_id":
+            continue
+
+        project = projection if isinstance(projection, Projection) else projection.get(update_type)
+        if project is None:
+            return update
+        return {**update, update_type: project(payload)}
+    return update
@@ -0,0 +1,314 @@
+"""
+Dashgram SDK Rate Limit Module.
+
+This module provides client-side limits on requests to the Dashgram API.
+Bursts, such as a broadcast triggering thousands of callback queries in
+seconds, would otherwise fire unbounded concurrent requests, exhausting the
+connection pool and getting the client throttled by the API.
+
+A `RateLimit` combines a token bucket, capping requests per second, and a
+cap on requests in flight. Limits are configured per endpoint and are
+shared by requests made on different event loops, like the ones of the
+sync bridge and of the application.
+"""
+
+import asyncio
+import collections
+import threading
+import time
+import typing
+
+ENDPOINTS = ("track", "invited_by", "payment", "payment/refund")
+
+
+class TokenBucket:
+    """
+    Token bucket limiting the rate of requests.
+
+    The bucket holds up to `burst` tokens and is refilled at `rate` tokens
+    per second. Each request takes a token, waiting for it when the bucket
+    is empty. The bucket is thread-safe.
+
+    Attributes:
+        rate: Number of tokens added per second
+        burst: Maximum number of tokens in the bucket
+
+    Example:
+        >>> bucket = TokenBucket(20, burst=5)
+        >>> await bucket.acquire()
+    """
+
+    def __init__(self, rate: float, burst: typing.Optional[float] = None) -> None:
+        """
+        Initialize a full bucket.
+
+        Args:
+            rate: Number of tokens added per second
+            burst: Maximum number of tokens in the bucket (defaults to one second of tokens, at least 1)
+
+        Raises:
+            ValueError: If rate or burst is not positive
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        if burst is None:
+            burst = max(1.0, rate)
+        if burst <= 0:
+            raise ValueError("burst must be positive")
+
+        self.rate = rate
+        self.burst = burst
+
+        self._tokens = burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    @property
+    def available(self) -> bool:
+        """Whether a token can be taken without waiting."""
+        with self._lock:
+            self._refill()
+            return self._tokens >= 1
+
+    def try_acquire(self) -> bool:
+        """
+        Take a token if one is available.
+
+        Returns:
+            True if a token was taken
+        """
+        with self._lock:
+            self._refill()
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+    async def acquire(self) -> None:
+        """Take a token, waiting until one is available."""
+        with self._lock:
+            self._refill()
+            # Tokens are reserved in order, so the balance may go negative
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+
+        if wait > 0:
+            try:
+                await asyncio.sleep(wait)
+            except asyncio.CancelledError:
+                with self._lock:
+                    self._tokens += 1
+                raise
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+
+class ConcurrencyLimiter:
+    """
+    Cap on the number of requests in flight.
+
+    Unlike `asyncio.Semaphore`, the limiter is not bound to an event loop:
+    waiters of different loops and threads are woken in FIFO order.
+
+    Attributes:
+        limit: Maximum number of requests in flight
+
+    Example:
+        >>> limiter = ConcurrencyLimiter(10)
+        >>> await limiter.acquire()
+        >>> try:
+        ...     await send()
+        ... finally:
+        ...     limiter.release()
+    """
+
+    def __init__(self, limit: int) -> None:
+        """
+        Initialize the limiter.
+
+        Args:
+            limit: Maximum number of requests in flight
+
+        Raises:
+            ValueError: If limit is less than 1
+        """
+        if limit < 1:
+            raise ValueError("limit must be at least 1")
+
+        self.limit = limit
+
+        self._in_flight = 0
+        self._waiters: typing.Deque[typing.Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = collections.deque()
+        self._lock = threading.Lock()
+
+    @property
+    def in_flight(self) -> int:
+        """Number of requests in flight."""
+        return self._in_flight
+
+    @property
+    def waiting(self) -> int:
+        """Number of requests waiting for a slot."""
+        return len(self._waiters)
+
+    @property
+    def available(self) -> bool:
+        """Whether a slot can be taken without waiting."""
+        return self._in_flight < self.limit and not self._waiters
+
+    async def acquire(self) -> None:
+        """Take a slot, waiting until one is free."""
+        with self._lock:
+            if self._in_flight < self.limit and not self._waiters:
+                self._in_flight += 1
+                return
+            loop = asyncio.get_running_loop()
+            waiter = loop.create_future()
+            self._waiters.append((loop, waiter))
+
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            with self._lock:
+                try:
+                    self._waiters.remove((loop, waiter))
+                    handed_over = False
+                except ValueError:
+                    handed_over = True
+            # A slot handed over to a cancelled waiter is passed on by _wake()
+            if handed_over and waiter.done() and not waiter.cancelled():
+                self.release()
+            raise
+
+    def release(self) -> None:
+        """Release a slot, handing it over to the next waiter."""
+        with self._lock:
+            while self._waiters:
+                loop, waiter = self._waiters.popleft()
+                try:
+                    loop.call_soon_threadsafe(self._wake, waiter)
+                    return
+                except RuntimeError:
+                    # The waiter's loop is closed
+                    continue
+            self._in_flight -= 1
+
+    def _wake(self, waiter: asyncio.Future) -> None:
+        if waiter.cancelled():
+            self.release()
+        else:
+            waiter.set_result(None)
+
+
+class RateLimit:
+    """
+    Limit on the requests to an endpoint of the Dashgram API.
+
+    Requests wait for a slot when `max_in_flight` requests are in flight and
+    for a token when they exceed `requests_per_second`. Each attempt of a
+    retried request counts as a request.
+
+    Attributes:
+        bucket: Token bucket limiting requests per second (None for no limit)
+        concurrency: Limiter of requests in flight (None for no limit)
+        throttled: Number of requests that had to wait
+
+    Example:
+        >>> sdk = Dashgram(
+        ...     project_id="123",
+        ...     access_key="key",
+        ...     rate_limits={
+        ...         "track": RateLimit(requests_per_second=20, max_in_flight=4),
+        ...         "payment": RateLimit(requests_per_second=5),
+        ...     },
+        ... )
+    """
+
+    def __init__(self, requests_per_second: typing.Optional[float] = None, *,
+                 burst: typing.Optional[float] = None,
+                 max_in_flight: typing.Optional[int] = None) -> None:
+        """
+        Initialize the limit.
+
+        Args:
+            requests_per_second: Maximum sustained request rate (None for no limit)
+            burst: Maximum number of requests sent at once above the rate
+                (defaults to one second of requests)
+            max_in_flight: Maximum number of requests in flight (None for no limit)
+        """
+        self.bucket = TokenBucket(requests_per_second, burst) if requests_per_second is not None else None
+        self.concurrency = ConcurrencyLimiter(max_in_flight) if max_in_flight is not None else None
+        self.throttled = 0
+
+    @property
+    def saturated(self) -> bool:
+        """Whether a new request would have to wait."""
+        return ((self.concurrency is not None and not self.concurrency.available)
+                or (self.bucket is not None and not self.bucket.available))
+
+    async def acquire(self) -> None:
+        """Wait until a request may be sent."""
+        if self.saturated:
+            self.throttled += 1
+        if self.concurrency is not None:
+            await self.concurrency.acquire()
+        if self.bucket is not None:
+            try:
+                await self.bucket.acquire()
+            except BaseException:
+                self.release()
+                raise
+
+    def release(self) -> None:
+        """Mark a request as finished."""
+        if self.concurrency is not None:
+            self.concurrency.release()
+
+    async def __aenter__(self) -> "RateLimit":
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        self.release()
+
+    def metrics(self) -> typing.Dict[str, typing.Any]:
+        """
+        Get the state and counters of the limit.
+
+        Returns:
+            A dictionary with the number of requests in flight and waiting
+            for a slot, and the number of throttled requests
+        """
+        return {
+            "in_flight": self.concurrency.in_flight if self.concurrency is not None else None,
+            "waiting": self.concurrency.waiting if self.concurrency is not None else 0,
+            "throttled": self.throttled,
+        }
+
+
+RateLimits = typing.Union[RateLimit, typing.Mapping[str, RateLimit]]
+
+
+def normalize_rate_limits(rate_limits: RateLimits) -> typing.Dict[str, RateLimit]:
+    """
+    Key rate limits by endpoint.
+
+    Args:
+        rate_limits: A limit shared by all endpoints, or a mapping of endpoints to limits
+
+    Returns:
+        A dictionary of endpoints to limits
+
+    Raises:
+        ValueError: If an endpoint is unknown
+    """
+    if isinstance(rate_limits, RateLimit):
+        return dict.fromkeys(ENDPOINTS, rate_limits)
+
+    for endpoint in rate_limits:
+        if endpoint not in ENDPOINTS:
+            raise ValueError(f"Unknown endpoint {endpoint!r}, expected one of {', '.join(ENDPOINTS)}")
+    return dict(rate_limits)
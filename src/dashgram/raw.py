@@ -0,0 +1,125 @@
+"""
+Dashgram SDK Raw Update Module.
+
+This module keeps the original JSON of updates received by the bot. Every
+framework parses the JSON sent by Telegram into objects, which the SDK
+would otherwise convert back into a dictionary and encode again. Updates
+captured at ingestion are looked up by `update_id` when they are tracked
+and their JSON is sent as-is, so the common path costs no conversion.
+"""
+
+import collections
+import threading
+import time
+import typing
+
+from dashgram.dedup import get_update_id
+from dashgram.enums import HandlerType
+
+RawUpdate = typing.Union[bytes, typing.Dict[str, typing.Any]]
+
+
+class RawUpdates:
+    """
+    Time-bounded store of the raw JSON of recently received updates.
+
+    Updates are kept in insertion order for `max_age` seconds and at most
+    `max_size` updates are kept, the oldest being evicted first, so updates
+    that are never tracked (e.g. skipped by sampling) do not accumulate.
+    Each update is returned once. The store is thread-safe.
+
+    Attributes:
+        max_age: Time in seconds an update is kept
+        max_size: Maximum number of kept updates
+        hits: Number of tracked updates sent from their raw JSON
+        misses: Number of tracked updates whose raw JSON was not captured
+
+    Example:
+        >>> sdk = Dashgram(project_id="123", access_key="key", raw_updates=True)
+        >>> sdk.capture_raw_update(request_body)
+        True
+        >>> update = Update.de_json(json.loads(request_body), bot)
+        >>> await sdk.track_event(update)  # sends request_body
+    """
+
+    def __init__(self, max_age: float = 60.0, max_size: int = 10000) -> None:
+        """
+        Initialize the store.
+
+        Args:
+            max_age: Time in seconds an update is kept
+            max_size: Maximum number of kept updates
+
+        Raises:
+            ValueError: If max_size is less than 1
+        """
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+
+        self.max_age = max_age
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+
+        self._updates: "collections.OrderedDict[int, typing.Tuple[RawUpdate, float]]" = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._updates)
+
+    def add(self, update: typing.Union[bytes, bytearray, memoryview, str, typing.Dict[str, typing.Any]]) -> bool:
+        """
+        Remember the raw JSON of a received update.
+
+        Args:
+            update: The update JSON as received from Telegram, or the
+                dictionary it was decoded to
+
+        Returns:
+            True if the update was stored, False if it has no update_id
+        """
+        if isinstance(update, str):
+            update = update.encode("utf-8")
+        elif isinstance(update, (bytearray, memoryview)):
+            update = bytes(update)
+
+        update_id = get_update_id(update)
+        if update_id is None:
+            return False
+
+        now = time.monotonic()
+        with self._lock:
+            updates = self._updates
+            while updates:
+                oldest, (_, added_at) = next(iter(updates.items()))
+                if now - added_at < self.max_age and len(updates) < self.max_size:
+                    break
+                del updates[oldest]
+
+            updates[update_id] = (update, now)
+            updates.move_to_end(update_id)
+        return True
+
+    def pop(self, event: typing.Any, handler_type: typing.Optional[HandlerType] = None) -> typing.Optional[RawUpdate]:
+        """
+        Take the raw JSON of a tracked update.
+
+        Args:
+            event: The framework object of the update
+            handler_type: The type of handler for this event (optional)
+
+        Returns:
+            The captured JSON bytes or dictionary, or None if the event is
+            not a full update or its raw JSON was not captured or expired
+        """
+        update_id = get_update_id(event, handler_type)
+        if update_id is None:
+            return None
+
+        with self._lock:
+            entry = self._updates.pop(update_id, None)
+            if entry is None or time.monotonic() - entry[1] >= self.max_age:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return entry[0]
@@ -0,0 +1,153 @@
+"""
+Dashgram SDK Retry Module.
+
+This module contains the retry policy used by the background sender to
+redeliver events after transient failures: connection errors, timeouts and
+retryable HTTP status codes. Delays grow exponentially with full jitter,
+and `Retry-After` headers sent with 429 and 503 responses are honored.
+"""
+
+import email.utils
+import random
+import time
+import typing
+
+import httpx
+
+from dashgram.exceptions import DashgramApiError, InvalidCredentials
+
+
+def parse_retry_after(value: typing.Optional[str]) -> typing.Optional[float]:
+    """
+    Parse the value of a `Retry-After` header.
+
+    Args:
+        value: The header value, either a number of seconds or an HTTP date
+
+    Returns:
+        The delay in seconds, or None if the value is missing or invalid
+
+    Example:
+        >>> parse_retry_after("120")
+        120.0
+    """
+    if not value or not isinstance(value, str):
+        return None
+
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        date = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, date.timestamp() - time.time())
+
+
+class RetryPolicy:
+    """
+    Retry policy with exponential backoff and full jitter.
+
+    The delay before attempt N+1 is a random value between 0 and
+    `min(max_delay, base_delay * 2 ** (N - 1))`. For 429 and 503 responses
+    with a `Retry-After` header, the server-provided delay is used instead,
+    capped at `max_retry_after`.
+
+    Invalid credentials (403) are never retried.
+
+    Attributes:
+        max_attempts: Maximum number of attempts, including the first one
+        base_delay: Backoff base delay in seconds
+        max_delay: Maximum backoff delay in seconds
+        max_retry_after: Maximum delay in seconds accepted from a Retry-After header
+        retry_statuses: HTTP status codes that are retried
+
+    Example:
+        >>> sdk = Dashgram(project_id="123", access_key="key",
+        ...                retry=RetryPolicy(max_attempts=5, base_delay=1.0))
+    """
+
+    RETRY_AFTER_STATUSES = (429, 503)
+
+    def __init__(self, max_attempts: int = 3, *,
+                 base_delay: float = 0.5,
+                 max_delay: float = 30.0,
+                 max_retry_after: float = 60.0,
+                 retry_statuses: typing.Iterable[int] = (408, 429, 500, 502, 503, 504)) -> None:
+        """
+        Initialize the retry policy.
+
+        Args:
+            max_attempts: Maximum number of attempts, including the first one
+            base_delay: Backoff base delay in seconds
+            max_delay: Maximum backoff delay in seconds
+            max_retry_after: Maximum delay in seconds accepted from a Retry-After header
+            retry_statuses: HTTP status codes that are retried
+        """
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be at least 1")
+
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_retry_after = max_retry_after
+        self.retry_statuses = frozenset(retry_statuses)
+
+    def is_retryable(self, exc: BaseException) -> bool:
+        """
+        Check whether a failure is transient.
+
+        Args:
+            exc: The exception raised by the request
+
+        Returns:
+            True for transport errors and retryable API status codes
+        """
+        if isinstance(exc, InvalidCredentials):
+            return False
+        if isinstance(exc, DashgramApiError):
+            return exc.status_code in self.retry_statuses
+        return isinstance(exc, httpx.TransportError)
+
+    def should_retry(self, exc: BaseException, attempt: int) -> bool:
+        """
+        Check whether a failed attempt should be retried.
+
+        Args:
+            exc: The exception raised by the attempt
+            attempt: The number of the failed attempt, starting at 1
+
+        Returns:
+            True if another attempt should be made
+        """
+        return attempt < self.max_attempts and self.is_retryable(exc)
+
+    def backoff(self, attempt: int) -> float:
+        """
+        Get a backoff delay with full jitter.
+
+        Args:
+            attempt: The number of the failed attempt, starting at 1
+
+        Returns:
+            The delay in seconds before the next attempt
+        """
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+
+    def get_delay(self, exc: BaseException, attempt: int) -> float:
+        """
+        Get the delay before retrying a failed attempt.
+
+        Args:
+            exc: The exception raised by the attempt
+            attempt: The number of the failed attempt, starting at 1
+
+        Returns:
+            The delay in seconds before the next attempt
+        """
+        if (isinstance(exc, DashgramApiError) and exc.retry_after is not None
+                and exc.status_code in self.RETRY_AFTER_STATUSES):
+            return min(exc.retry_after, self.max_retry_after)
+        return self.backoff(attempt)
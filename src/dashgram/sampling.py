@@ -0,0 +1,224 @@
+"""
+Dashgram SDK Sampling Module.
+
+This module provides sampling of tracked events per update type, to send
+only a fraction of high-volume updates like `poll` or `channel_post`.
+
+Events are sampled by a hash of the user id (or chat id), so a user is
+either kept or dropped for all of their events: every user kept at a lower
+rate is also kept at higher rates. The sampling decision only reads a few
+attributes of the event and is made before it is converted, so dropped
+events cost almost nothing.
+"""
+
+import collections
+import random
+import typing
+import zlib
+
+from dashgram.enums import HandlerType
+
+_UPDATE_TYPES = HandlerType.all_types()
+_USER_FIELDS = ("from_user", "from", "user")
+_MASK = (1 << 64) - 1
+
+USER = "user"
+CHAT = "chat"
+
+
+def _field(obj: typing.Any, name: str) -> typing.Any:
+    if isinstance(obj, dict):
+        return obj.get(name)
+    return getattr(obj, name, None)
+
+
+def _hash_fraction(value: typing.Any, seed: int) -> float:
+    # splitmix64 finalizer, stable across processes unlike hash()
+    if isinstance(value, int):
+        x = value & _MASK
+    else:
+        x = zlib.crc32(str(value).encode("utf-8"))
+    x = (x + seed * 0x9E3779B97F4A7C15 + 0x9E3779B97F4A7C15) & _MASK
+    x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & _MASK
+    x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & _MASK
+    x ^= x >> 31
+    return x / (1 << 64)
+
+
+def resolve_update(event: typing.Any,
+                   handler_type: typing.Optional[HandlerType] = None) -> typing.Tuple[typing.Optional[str], typing.Any]:
+    """
+    Find the update type and payload of an event without converting it.
+
+    Args:
+        event: A framework object or dictionary, either a full update or the
+            payload of handler_type
+        handler_type: The type of handler for this event (optional)
+
+    Returns:
+        The update type and its payload, or (None, None) if they cannot be found
+
+    Example:
+        >>> resolve_update({"update_id": 1, "poll": {"id": "5"}})
+        ('poll', {'id': '5'})
+    """
+    if handler_type is not None:
+        return str(handler_type), event
+    if isinstance(event, (bytes, bytearray, memoryview)):
+        return None, None
+
+    for update_type in _UPDATE_TYPES:
+        payload = _field(event, update_type)
+        if payload is not None:
+            return update_type, payload
+    return None, None
+
+
+def get_user_id(payload: typing.Any) -> typing.Any:
+    """
+    Get the id of the user who caused an update.
+
+    Args:
+        payload: The payload of an update, as a framework object or dictionary
+
+    Returns:
+        The user id, or None if the update has no user
+    """
+    for name in _USER_FIELDS:
+        user = _field(payload, name)
+        if user is not None:
+            return _field(user, "id")
+    return None
+
+
+def get_chat_id(payload: typing.Any) -> typing.Any:
+    """
+    Get the id of the chat an update belongs to.
+
+    Args:
+        payload: The payload of an update, as a framework object or dictionary
+
+    Returns:
+        The chat id, or None if the update has no chat
+    """
+    chat = _field(payload, "chat")
+    if chat is None:
+        message = _field(payload, "message")
+        if message is not None:
+            chat = _field(message, "chat")
+    if chat is None:
+        return None
+    return _field(chat, "id")
+
+
+class Sampler:
+    """
+    Samples events per update type by a hash of the user or chat id.
+
+    Events of a type with a rate of 1.0 are always kept and events of a type
+    with a rate of 0.0 are always dropped. For other rates, an event is kept
+    if the hash of its user id (or chat id, depending on `key`) falls below
+    the rate. Events without a user or chat id are sampled randomly.
+
+    Attributes:
+        rates: Sampling rate between 0.0 and 1.0 per update type
+        default_rate: Sampling rate of update types missing from rates
+        key: "user" to sample by user id with the chat id as fallback, or
+            "chat" to sample by chat id with the user id as fallback
+        seed: Seed of the hash, changing it selects a different set of users
+        skipped: Number of events dropped per update type
+
+    Example:
+        >>> sampler = Sampler({HandlerType.POLL: 0.1, HandlerType.CHANNEL_POST: 0.25})
+        >>> sampler.should_track(update)
+        True
+    """
+
+    def __init__(self, rates: typing.Optional[typing.Mapping[typing.Union[HandlerType, str], float]] = None, *,
+                 default_rate: float = 1.0,
+                 key: str = USER,
+                 seed: int = 0) -> None:
+        """
+        Initialize the sampler.
+
+        Args:
+            rates: Sampling rate between 0.0 and 1.0 per update type
+            default_rate: Sampling rate of update types missing from rates
+            key: "user" or "chat", the id events are sampled by
+            seed: Seed of the hash
+
+        Raises:
+            ValueError: If a rate is outside of [0.0, 1.0], an update type or the key is unknown
+        """
+        if key not in (USER, CHAT):
+            raise ValueError(f"Unknown sampling key: {key}")
+
+        self.rates: typing.Dict[str, float] = {}
+        for update_type, rate in (rates or {}).items():
+            self.rates[str(HandlerType(str(update_type)))] = self._check_rate(rate)
+
+        self.default_rate = self._check_rate(default_rate)
+        self.key = key
+        self.seed = seed
+        self.skipped: typing.Counter[str] = collections.Counter()
+
+    @staticmethod
+    def _check_rate(rate: float) -> float:
+        if not 0.0 <= rate <= 1.0:
+            raise ValueError(f"Sampling rate must be between 0.0 and 1.0, got {rate}")
+        return rate
+
+    def rate(self, update_type: typing.Optional[str]) -> float:
+        """
+        Get the sampling rate of an update type.
+
+        Args:
+            update_type: The update type, or None if unknown
+
+        Returns:
+            The sampling rate between 0.0 and 1.0
+        """
+        if update_type is None:
+            return self.default_rate
+        return self.rates.get(update_type, self.default_rate)
+
+    def should_track(self, event: typing.Any, handler_type: typing.Optional[HandlerType] = None) -> bool:
+        """
+        Decide whether an event is tracked.
+
+        Args:
+            event: A framework object, dictionary or encoded JSON bytes
+            handler_type: The type of handler for this event (optional)
+
+        Returns:
+            True if the event should be tracked, False if it is dropped
+        """
+        if not self.rates and self.default_rate >= 1.0:
+            return True
+
+        update_type, payload = resolve_update(event, handler_type)
+        rate = self.rate(update_type)
+        if rate >= 1.0:
+            return True
+
+        if rate > 0.0:
+            sample_id = None
+            if payload is not None:
+                if self.key == USER:
+                    sample_id = get_user_id(payload)
+                    if sample_id is None:
+                        sample_id = get_chat_id(payload)
+                else:
+                    sample_id = get_chat_id(payload)
+                    if sample_id is None:
+                        sample_id = get_user_id(payload)
+
+            if sample_id is None:
+                fraction = random.random()
+            else:
+                fraction = _hash_fraction(sample_id, self.seed)
+            if fraction < rate:
+                return True
+
+        self.skipped[update_type or "unknown"] += 1
+        return False
@@ -0,0 +1,203 @@
+"""
+Dashgram SDK Serialization Module.
+
+This module provides the JSON encoders used to build request bodies.
+The fastest available encoder is picked automatically: `orjson` or
+`msgspec` when installed, the standard library `json` module otherwise.
+
+Request bodies are encoded once to bytes. Events that are already encoded
+(raw Telegram update JSON as `bytes`) are inserted into the body as-is.
+"""
+
+import json
+import typing
+
+from dashgram.enums import HandlerType
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+JsonEncoder = typing.Callable[[typing.Any], bytes]
+
+
+def json_dumps(obj: typing.Any) -> bytes:
+    """
+    Encode an object to compact UTF-8 JSON with the standard library.
+
+    Args:
+        obj: The object to encode
+
+    Returns:
+        The encoded JSON bytes
+    """
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"), allow_nan=False).encode("utf-8")
+
+
+def orjson_dumps(obj: typing.Any) -> bytes:
+    """
+    Encode an object to JSON with orjson.
+
+    Args:
+        obj: The object to encode
+
+    Returns:
+        The encoded JSON bytes
+    """
+    if orjson is None:
+        raise ImportError("orjson is not installed")
+    return orjson.dumps(obj)
+
+
+def msgspec_dumps(obj: typing.Any) -> bytes:
+    """
+    Encode an object to JSON with msgspec.
+
+    Args:
+        obj: The object to encode
+
+    Returns:
+        The encoded JSON bytes
+    """
+    if msgspec is None:
+        raise ImportError("msgspec is not installed")
+    return msgspec.json.encode(obj)
+
+
+_ENCODERS: typing.Dict[str, JsonEncoder] = {
+    "orjson": orjson_dumps,
+    "msgspec": msgspec_dumps,
+    "json": json_dumps,
+}
+
+
+def get_json_encoder(encoder: typing.Union[str, JsonEncoder, None] = None) -> JsonEncoder:
+    """
+    Resolve the JSON encoder to use for request bodies.
+
+    Args:
+        encoder: A callable returning bytes, the name of an encoder ("orjson",
+            "msgspec" or "json"), or None to pick the fastest installed one
+
+    Returns:
+        A callable encoding an object to JSON bytes
+
+    Raises:
+        ValueError: If the encoder name is unknown
+        ImportError: If the named encoder is not installed
+
+    Example:
+        >>> encode = get_json_encoder()
+        >>> encode({"update_id": 1})
+        b'{"update_id":1}'
+    """
+    if callable(encoder):
+        return encoder
+
+    if encoder is None:
+        if orjson is not None:
+            return orjson_dumps
+        if msgspec is not None:
+            return msgspec_dumps
+        return json_dumps
+
+    if encoder not in _ENCODERS:
+        raise ValueError(f"Unknown JSON encoder: {encoder}")
+    if (encoder == "orjson" and orjson is None) or (encoder == "msgspec" and msgspec is None):
+        raise ImportError(f"{encoder} is not installed")
+    return _ENCODERS[encoder]
+
+
+def wrap_raw_event(event: typing.Union[bytes, bytearray, memoryview],
+                   handler_type: typing.Optional[HandlerType] = None) -> bytes:
+    """
+    Prepare an already-encoded event for a request body.
+
+    Without handler_type the bytes must hold a complete Telegram update and
+    are returned as-is. With handler_type they hold the payload of that update
+    type and are wrapped the same way as wrap_event() wraps dictionaries.
+
+    Args:
+        event: The encoded event JSON
+        handler_type: The type of handler for this event (optional)
+
+    Returns:
+        The encoded update JSON
+
+    Example:
+        >>> wrap_raw_event(b'{"text":"hi"}', HandlerType.MESSAGE)
+        b'{"update_id":-1,"message":{"text":"hi"}}'
+    """
+    if handler_type is None:
+        return bytes(event)
+    return b'{"update_id":-1,"' + str(handler_type).encode() + b'":' + bytes(event) + b"}"
+
+
+def encode_track_body(encoder: JsonEncoder, origin: str, events: typing.Iterable[typing.Any]) -> bytes:
+    """
+    Encode a /track request body.
+
+    Dictionaries are encoded with the given encoder, bytes are inserted as-is.
+
+    Args:
+        encoder: The JSON encoder to use
+        origin: The origin string of the SDK
+        events: The events to send, as dictionaries or encoded bytes
+
+    Returns:
+        The encoded request body
+    """
+    updates = b",".join(
+        event if isinstance(event, bytes) else encoder(event)
+        for event in events
+    )
+    return b'{"origin":' + encoder(origin) + b',"updates":[' + updates + b"]}"
+
+
+def encode_request(url: str, body: bytes) -> bytes:
+    """
+    Encode an API request as a record of the background queue.
+
+    Queued track events are JSON objects; other requests are stored as
+    their endpoint followed by a newline and the encoded body, so they can
+    be queued, spooled and forwarded to an agent like events.
+
+    Args:
+        url: The endpoint of the request, e.g. "payment"
+        body: The encoded JSON body
+
+    Returns:
+        The encoded record
+
+    Example:
+        >>> encode_request("invited_by", b'{"user_id":1,"invited_by":2}')
+        b'invited_by\\n{"user_id":1,"invited_by":2}'
+    """
+    return url.encode("ascii") + b"\n" + body
+
+
+def split_requests(events: typing.Iterable[typing.Any]) -> typing.Tuple[typing.List[typing.Any], typing.List[typing.Tuple[str, bytes]]]:
+    """
+    Separate track events from requests encoded with encode_request().
+
+    Args:
+        events: Queued events and request records
+
+    Returns:
+        The track events, and the (endpoint, body) pairs of the other requests
+    """
+    updates = []
+    requests = []
+    for event in events:
+        if isinstance(event, bytes) and event[:1].isalpha():
+            url, _, body = event.partition(b"\n")
+            requests.append((url.decode("ascii"), body))
+        else:
+            updates.append(event)
+    return updates, requests
@@ -0,0 +1,337 @@
+"""
+Dashgram SDK Spool Module.
+
+This module provides a durable on-disk spool for events that could not be
+delivered to the Dashgram API. Events are appended to segment files and
+read back in order once the API recovers, so an outage does not lose data,
+even across process restarts.
+
+On-disk layout of a spool directory:
+- `<sequence>.seg` - append-only segment files with length-prefixed,
+  CRC-checked records
+- `cursor` - the read position (segment and offset) of the first event
+  not yet delivered
+"""
+
+import mmap
+import os
+import struct
+import time
+import typing
+import zlib
+
+_HEADER = struct.Struct("<II")
+_SEGMENT_SUFFIX = ".seg"
+_CURSOR_FILE = "cursor"
+
+
+class SpoolBatch(typing.NamedTuple):
+    """
+    Events read from the spool together with the position after them.
+
+    Attributes:
+        events: The encoded events, oldest first
+        segment: The segment of the position after the last event
+        offset: The offset of the position after the last event
+    """
+
+    events: typing.List[bytes]
+    segment: int
+    offset: int
+
+
+class Spool:
+    """
+    Disk-backed write-ahead spool of encoded events.
+
+    Events are appended to segment files of up to `segment_size` bytes and
+    read back with memory-mapped reads. Writes are flushed to the OS
+    immediately and fsynced at most every `fsync_interval` seconds. The read
+    position is persisted on every commit, so delivered events are not sent
+    again after a restart.
+
+    The spool never grows above `max_bytes`, and segments older than
+    `max_age` seconds are removed; events dropped this way are counted in
+    `dropped`.
+
+    The spool is not thread-safe; it is used by the background sender only.
+
+    Attributes:
+        directory: The directory holding the spool files
+        max_bytes: Maximum total size of the segment files in bytes
+        max_age: Maximum age of a segment in seconds (None for no limit)
+        segment_size: Size in bytes after which a new segment is started
+        fsync_interval: Minimum time in seconds between two fsync calls
+        dropped: Number of events removed because of the size or age limits
+
+    Example:
+        >>> spool = Spool("/var/lib/mybot/dashgram-spool")
+        >>> spool.append([b'{"update_id":1}'])
+        >>> batch = spool.read(100)
+        >>> # ... deliver batch.events ...
+        >>> spool.commit(batch)
+    """
+
+    def __init__(self, directory: typing.Union[str, "os.PathLike[str]"], *,
+                 max_bytes: int = 256 * 1024 * 1024,
+                 max_age: typing.Optional[float] = 7 * 24 * 3600,
+                 segment_size: int = 16 * 1024 * 1024,
+                 fsync_interval: float = 1.0) -> None:
+        """
+        Open or create a spool directory.
+
+        Args:
+            directory: The directory holding the spool files (created if missing)
+            max_bytes: Maximum total size of the segment files in bytes
+            max_age: Maximum age of a segment in seconds (None for no limit)
+            segment_size: Size in bytes after which a new segment is started
+            fsync_interval: Minimum time in seconds between two fsync calls
+        """
+        self.directory = os.fspath(directory)
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.segment_size = segment_size
+        self.fsync_interval = fsync_interval
+        self.dropped = 0
+
+        os.makedirs(self.directory, exist_ok=True)
+
+        self._segments: typing.List[int] = sorted(
+            int(name[:-len(_SEGMENT_SUFFIX)])
+            for name in os.listdir(self.directory)
+            if name.endswith(_SEGMENT_SUFFIX) and name[:-len(_SEGMENT_SUFFIX)].isdigit()
+        )
+        self._sizes: typing.Dict[int, int] = {}
+        self._writer: typing.Optional[typing.BinaryIO] = None
+        self._last_fsync = time.monotonic()
+        self._last_expire = 0.0
+        self._unsynced = False
+
+        self._read_segment, self._read_offset = self._load_cursor()
+        self._recover()
+
+    @property
+    def pending(self) -> int:
+        """Number of events waiting in the spool."""
+        return self._count
+
+    @property
+    def empty(self) -> bool:
+        """Whether the spool holds no events."""
+        return self._count == 0
+
+    @property
+    def size(self) -> int:
+        """Total size of the segment files in bytes."""
+        return sum(self._sizes.values())
+
+    def append(self, events: typing.Iterable[bytes]) -> None:
+        """
+        Append encoded events to the spool.
+
+        Args:
+            events: The encoded events to store
+        """
+        self._expire()
+
+        for event in events:
+            if self._writer is None or self._sizes[self._segments[-1]] >= self.segment_size:
+                self._rotate()
+            assert self._writer is not None
+
+            self._writer.write(_HEADER.pack(len(event), zlib.crc32(event)))
+            self._writer.write(event)
+            self._sizes[self._segments[-1]] += _HEADER.size + len(event)
+            self._count += 1
+
+        if self._writer is not None:
+            self._writer.flush()
+            self._unsynced = True
+            if time.monotonic() - self._last_fsync >= self.fsync_interval:
+                self.sync()
+
+        self._enforce_max_bytes()
+
+    def read(self, max_events: int) -> SpoolBatch:
+        """
+        Read the oldest events without removing them.
+
+        Args:
+            max_events: Maximum number of events to read
+
+        Returns:
+            The events and the position to pass to commit() once they are delivered
+        """
+        self._expire()
+
+        events: typing.List[bytes] = []
+        segment, offset = self._read_segment, self._read_offset
+
+        for seq in self._segments:
+            if seq < segment:
+                continue
+            if seq > segment:
+                segment, offset = seq, 0
+
+            offset, _ = self._read_records(seq, offset, max_events - len(events), events.append)
+            if len(events) >= max_events:
+                break
+
+        later = [seq for seq in self._segments if seq > segment]
+        if later and offset >= self._sizes.get(segment, 0):
+            segment, offset = later[0], 0
+
+        return SpoolBatch(events, segment, offset)
+
+    def commit(self, batch: SpoolBatch) -> None:
+        """
+        Remove delivered events from the spool.
+
+        Args:
+            batch: The batch returned by read() whose events were delivered
+        """
+        self._read_segment, self._read_offset = batch.segment, batch.offset
+        self._count = max(0, self._count - len(batch.events))
+
+        for seq in list(self._segments):
+            if seq < self._read_segment:
+                self._remove_segment(seq)
+
+        self._save_cursor()
+
+    def sync(self) -> None:
+        """Fsync written events to disk."""
+        if self._writer is not None and self._unsynced:
+            os.fsync(self._writer.fileno())
+        self._unsynced = False
+        self._last_fsync = time.monotonic()
+
+    def close(self) -> None:
+        """Fsync pending writes and close the spool files."""
+        if self._writer is not None:
+            self.sync()
+            self._writer.close()
+            self._writer = None
+
+    def _path(self, seq: int) -> str:
+        return os.path.join(self.directory, f"{seq:020d}{_SEGMENT_SUFFIX}")
+
+    def _rotate(self) -> None:
+        if self._writer is not None:
+            self.sync()
+            self._writer.close()
+
+        seq = self._next_segment
+        self._next_segment += 1
+        self._segments.append(seq)
+        self._sizes[seq] = 0
+        self._writer = open(self._path(seq), "ab")
+
+    def _read_records(self, seq: int, offset: int, limit: int,
+                      callback: typing.Optional[typing.Callable[[bytes], None]] = None) -> typing.Tuple[int, int]:
+        size = self._sizes.get(seq, 0)
+        read = 0
+        if offset >= size or limit <= 0:
+            return offset, read
+
+        with open(self._path(seq), "rb") as f, mmap.mmap(f.fileno(), size, access=mmap.ACCESS_READ) as mm:
+            while read < limit and offset + _HEADER.size <= size:
+                length, crc = _HEADER.unpack_from(mm, offset)
+                end = offset + _HEADER.size + length
+                if end > size:
+                    break
+
+                payload = mm[offset + _HEADER.size:end]
+                offset = end
+                if zlib.crc32(payload) != crc:
+                    continue
+
+                if callback is not None:
+                    callback(payload)
+                read += 1
+
+        return offset, read
+
+    def _recover(self) -> None:
+        for seq in self._segments:
+            self._sizes[seq] = os.path.getsize(self._path(seq))
+
+        if self._segments:
+            last = self._segments[-1]
+            valid, _ = self._read_records(last, 0, self._sizes[last] + 1)
+            if valid < self._sizes[last]:
+                with open(self._path(last), "r+b") as f:
+                    f.truncate(valid)
+                self._sizes[last] = valid
+            self._writer = open(self._path(last), "ab")
+
+        self._next_segment = max(self._segments[-1] + 1 if self._segments else 0, self._read_segment)
+        if self._read_segment not in self._sizes:
+            self._read_segment = self._segments[0] if self._segments else self._next_segment
+            self._read_offset = 0
+
+        self._count = 0
+        for seq in self._segments:
+            if seq >= self._read_segment:
+                self._count += self._count_records(seq, self._read_offset if seq == self._read_segment else 0)
+
+    def _count_records(self, seq: int, offset: int) -> int:
+        _, count = self._read_records(seq, offset, self._sizes.get(seq, 0) + 1)
+        return count
+
+    def _remove_segment(self, seq: int) -> None:
+        if seq >= self._read_segment:
+            dropped = self._count_records(seq, self._read_offset if seq == self._read_segment else 0)
+            self._count -= dropped
+            self.dropped += dropped
+
+        if self._segments and seq == self._segments[-1] and self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+        self._segments.remove(seq)
+        self._sizes.pop(seq, None)
+        try:
+            os.remove(self._path(seq))
+        except FileNotFoundError:
+            pass
+
+        if seq == self._read_segment:
+            self._read_segment = self._segments[0] if self._segments else self._next_segment
+            self._read_offset = 0
+            self._save_cursor()
+
+    def _expire(self) -> None:
+        if self.max_age is None or time.monotonic() - self._last_expire < 1.0:
+            return
+        self._last_expire = time.monotonic()
+
+        deadline = time.time() - self.max_age
+        for seq in list(self._segments):
+            try:
+                mtime = os.path.getmtime(self._path(seq))
+            except FileNotFoundError:
+                mtime = 0
+            if mtime < deadline:
+                self._remove_segment(seq)
+
+    def _enforce_max_bytes(self) -> None:
+        while self.size > self.max_bytes and self._segments:
+            if len(self._segments) == 1:
+                self._rotate()
+            self._remove_segment(self._segments[0])
+
+    def _load_cursor(self) -> typing.Tuple[int, int]:
+        try:
+            with open(os.path.join(self.directory, _CURSOR_FILE)) as f:
+                segment, offset = f.read().split()
+            return int(segment), int(offset)
+        except (FileNotFoundError, ValueError):
+            return 0, 0
+
+    def _save_cursor(self) -> None:
+        path = os.path.join(self.directory, _CURSOR_FILE)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w") as f:
+            f.write(f"{self._read_segment} {self._read_offset}")
+        os.replace(tmp_path, path)
@@ -0,0 +1,102 @@
+"""
+Dashgram SDK Transport Module.
+
+This module creates the HTTP client used to talk to the Dashgram API and
+exposes statistics of its connection pool, so the pool can be sized for
+the bot's update rate.
+
+HTTP/2 support requires the optional `h2` package
+(`pip install dashgram[http2]`).
+"""
+
+import typing
+
+import httpx
+
+DEFAULT_TIMEOUT = httpx.Timeout(5.0)
+
+
+def create_client(base_url: str, headers: typing.Dict[str, str], *,
+                  http2: bool = False,
+                  max_connections: typing.Optional[int] = 100,
+                  max_keepalive_connections: typing.Optional[int] = 20,
+                  keepalive_expiry: typing.Optional[float] = 5.0,
+                  timeout: typing.Union[float, httpx.Timeout, None] = DEFAULT_TIMEOUT) -> httpx.AsyncClient:
+    """
+    Create the HTTP client for the Dashgram API.
+
+    Args:
+        base_url: The base URL of the project API
+        headers: Headers sent with every request
+        http2: Whether to enable HTTP/2 multiplexing
+        max_connections: Maximum number of concurrent connections (None for no limit)
+        max_keepalive_connections: Maximum number of idle connections kept open
+        keepalive_expiry: Time in seconds an idle connection is kept open
+        timeout: Timeout in seconds, or an httpx.Timeout with per-phase
+            (connect, read, write, pool) values
+
+    Returns:
+        A configured httpx.AsyncClient
+
+    Raises:
+        ImportError: If HTTP/2 is enabled but the `h2` package is not installed
+
+    Example:
+        >>> client = create_client(
+        ...     "https://api.dashgram.io/v1/123",
+        ...     {"Authorization": "Bearer key"},
+        ...     http2=True,
+        ...     timeout=httpx.Timeout(10.0, connect=2.0),
+        ... )
+    """
+    limits = httpx.Limits(
+        max_connections=max_connections,
+        max_keepalive_connections=max_keepalive_connections,
+        keepalive_expiry=keepalive_expiry,
+    )
+    return httpx.AsyncClient(base_url=base_url, headers=headers, http2=http2, limits=limits, timeout=timeout)
+
+
+def get_pool_stats(client: httpx.AsyncClient) -> typing.Dict[str, typing.Optional[int]]:
+    """
+    Get statistics of the client's connection pool.
+
+    Args:
+        client: The httpx.AsyncClient to inspect
+
+    Returns:
+        A dictionary with the number of active and queued requests, active
+        and idle connections, and the configured pool limits. Counters are 0
+        when the pool cannot be inspected.
+
+    Example:
+        >>> get_pool_stats(client)
+        {'active_requests': 2, 'queued_requests': 0, 'active_connections': 2,
+         'idle_connections': 3, 'max_connections': 100, 'max_keepalive_connections': 20}
+    """
+    stats: typing.Dict[str, typing.Optional[int]] = {
+        "active_requests": 0,
+        "queued_requests": 0,
+        "active_connections": 0,
+        "idle_connections": 0,
+        "max_connections": None,
+        "max_keepalive_connections": None,
+    }
+
+    pool = getattr(getattr(client, "_transport", None), "_pool", None)
+    if pool is None:
+        return stats
+
+    requests = list(getattr(pool, "_requests", []))
+    connections = list(getattr(pool, "_connections", []))
+
+    queued = sum(1 for request in requests if request.is_queued())
+    idle = sum(1 for connection in connections if connection.is_idle())
+
+    stats["active_requests"] = len(requests) - queued
+    stats["queued_requests"] = queued
+    stats["active_connections"] = len(connections) - idle
+    stats["idle_connections"] = idle
+    stats["max_connections"] = getattr(pool, "_max_connections", None)
+    stats["max_keepalive_connections"] = getattr(pool, "_max_keepalive_connections", None)
+    return stats
@@ -8,6 +8,8 @@ and event formatting.
 
 import functools
 import asyncio
+import concurrent.futures
+import threading
 import typing
 
 from dashgram.enums import HandlerType
@@ -18,9 +20,16 @@ def auto_async(func):
     Decorator to automatically handle async/sync function calls.
     
     This decorator allows async functions to be called from both async and sync
-    contexts. If called from an async context, it returns the coroutine directly.
-    If called from a sync context, it creates a new event loop and runs the
-    coroutine to completion.
+    contexts. If called from an async context, the coroutine is scheduled as a
+    task on the running loop and the task is returned, so it runs even if the
+    caller never awaits it. If called from a sync context, the coroutine is
+    submitted to the SDK's shared background loop thread and the call blocks
+    until it completes.
+    
+    Running every sync call on one long-lived loop keeps loop-bound resources,
+    like the connection pool of httpx.AsyncClient, warm between calls. Sync
+    calls from any thread are safe, including threads of an application whose
+    own event loop runs in another thread.
     
     Args:
         func: The async function to decorate
@@ -44,14 +53,141 @@ def auto_async(func):
         coro = func(*args, **kwargs)
         try:
             loop = asyncio.get_running_loop()
-            return coro
         except RuntimeError:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            return loop.run_until_complete(coro)
+            return get_loop_thread().submit(coro).result()
+        return loop.create_task(coro)
     return wrapper
 
 
+class LoopThread:
+    """
+    A daemon thread running a long-lived asyncio event loop.
+    
+    Synchronous code uses it to run coroutines without creating a new event
+    loop for every call, so resources bound to a loop (like the connection
+    pool of httpx.AsyncClient) are reused between calls.
+    
+    Attributes:
+        name: The name of the thread
+        loop: The event loop run by the thread (None until started)
+    
+    Example:
+        >>> loop_thread = LoopThread()
+        >>> loop_thread.start()
+        >>> result = loop_thread.submit(some_coroutine()).result()
+        >>> loop_thread.stop()
+    """
+    
+    def __init__(self, name: str = "dashgram-loop") -> None:
+        """
+        Initialize the loop thread without starting it.
+        
+        Args:
+            name: The name of the thread
+        """
+        self.name = name
+        self.loop: typing.Optional[asyncio.AbstractEventLoop] = None
+        self._thread: typing.Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+    
+    @property
+    def running(self) -> bool:
+        """Whether the thread and its event loop are running."""
+        return self._thread is not None and self._thread.is_alive()
+    
+    def start(self) -> None:
+        """Start the thread and wait until its event loop is running."""
+        with self._lock:
+            if self.running:
+                return
+            
+            started = threading.Event()
+            self.loop = asyncio.new_event_loop()
+            self._thread = threading.Thread(target=self._run, args=(self.loop, started), name=self.name, daemon=True)
+            self._thread.start()
+            started.wait()
+    
+    def submit(self, coro: typing.Coroutine) -> concurrent.futures.Future:
+        """
+        Schedule a coroutine on the loop, starting the thread if needed.
+        
+        Args:
+            coro: The coroutine to run
+        
+        Returns:
+            A concurrent.futures.Future with the result of the coroutine
+        """
+        self.start()
+        assert self.loop is not None
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+    
+    def call(self, func: typing.Callable[..., typing.Any], *args: typing.Any) -> typing.Any:
+        """
+        Call a function inside the loop thread and wait for its result.
+        
+        Args:
+            func: The function to call
+            *args: Positional arguments for the function
+        
+        Returns:
+            The value returned by the function
+        """
+        async def _call():
+            return func(*args)
+        return self.submit(_call()).result()
+    
+    def stop(self, timeout: typing.Optional[float] = None) -> None:
+        """
+        Stop the event loop and wait for the thread to exit.
+        
+        Tasks still pending on the loop are cancelled.
+        
+        Args:
+            timeout: Maximum time in seconds to wait for the thread
+        """
+        with self._lock:
+            thread, loop = self._thread, self.loop
+            if thread is None or loop is None:
+                return
+            self._thread = None
+            
+            if thread.is_alive():
+                loop.call_soon_threadsafe(loop.stop)
+            if thread is not threading.current_thread():
+                thread.join(timeout)
+    
+    @staticmethod
+    def _run(loop: asyncio.AbstractEventLoop, started: threading.Event) -> None:
+        asyncio.set_event_loop(loop)
+        loop.call_soon(started.set)
+        try:
+            loop.run_forever()
+        finally:
+            tasks = asyncio.all_tasks(loop)
+            for task in tasks:
+                task.cancel()
+            if tasks:
+                loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+            loop.run_until_complete(loop.shutdown_asyncgens())
+            loop.close()
+
+
+_loop_thread = LoopThread(name="dashgram")
+
+
+def get_loop_thread() -> LoopThread:
+    """
+    Get the SDK's shared background loop thread.
+    
+    The thread is started lazily by the first coroutine submitted to it and
+    runs for the lifetime of the process.
+    
+    Returns:
+        The shared LoopThread instance
+    """
+    return _loop_thread
+
+
 def wrap_event(event: dict, handler_type: typing.Optional[HandlerType] = None) -> dict:
     """
     Wrap a raw event dictionary in the proper format for the Dashgram API.
@@ -1,5 +1,6 @@
 import pytest
 import httpx
+import json
 from unittest.mock import Mock, AsyncMock
 from dashgram.client import Dashgram
 from datetime import datetime
@@ -35,12 +36,21 @@ def mock_httpx_client(sample_api_success_response, sample_api_error_response_400
     return mock_client
 
 
+@pytest.fixture
+def posted_json(mock_httpx_client):
+    """Decode the requests posted through the mocked httpx client as (url, payload) pairs"""
+    def posted_json():
+        return [(call.args[0], json.loads(call.kwargs["content"])) for call in mock_httpx_client.post.await_args_list]
+    return posted_json
+
+
 @pytest.fixture
 def dashgram_client(mock_httpx_client):
     """Basic Dashgram client instance for testing"""
     sdk = Dashgram(project_id="test_project", access_key="test_key", origin="Python + Dashgram SDK")
     sdk._client = mock_httpx_client
-    return sdk
+    yield sdk
+    sdk.stop_sender_thread(timeout=1)
 
 
 @pytest.fixture
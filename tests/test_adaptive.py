@@ -0,0 +1,63 @@
+import pytest
+
+from dashgram.adaptive import AdaptiveBatching
+
+
+def test_adaptive_batching_grows_batch_size_then_in_flight():
+    """Test healthy full batches grow the batch size additively, then the batches in flight"""
+    adaptive = AdaptiveBatching(min_batch_size=10, max_batch_size=30, max_in_flight=2, target_latency=1.0)
+    assert adaptive.metrics() == {"batch_size": 10, "in_flight": 1, "latency": None, "error_rate": 0.0}
+
+    for _ in range(5):
+        adaptive.record(0.1, delivered=True, full=True)
+
+    assert (adaptive.batch_size, adaptive.in_flight) == (30, 2)
+
+
+def test_adaptive_batching_keeps_values_without_load():
+    """Test batches that are not full do not grow the values"""
+    adaptive = AdaptiveBatching(min_batch_size=10)
+    adaptive.record(0.1, delivered=True, full=False)
+
+    assert (adaptive.batch_size, adaptive.in_flight) == (10, 1)
+
+
+def test_adaptive_batching_backs_off_on_errors(mocker):
+    """Test a failed batch halves both values, once per observed latency"""
+    monotonic = mocker.patch("dashgram.adaptive.time.monotonic", return_value=100.0)
+    adaptive = AdaptiveBatching(min_batch_size=10, max_batch_size=100, max_in_flight=8, batch_size_step=90)
+    adaptive.batch_size, adaptive.in_flight = 100, 8
+
+    adaptive.record(0.2, delivered=False, full=True)
+    assert (adaptive.batch_size, adaptive.in_flight) == (50, 4)
+    assert adaptive.error_rate == pytest.approx(0.3)
+
+    adaptive.record(0.2, delivered=False, full=True)
+    assert (adaptive.batch_size, adaptive.in_flight) == (50, 4)
+
+    monotonic.return_value = 101.0
+    adaptive.record(0.2, delivered=False, full=True)
+    assert (adaptive.batch_size, adaptive.in_flight) == (25, 2)
+
+
+def test_adaptive_batching_backs_off_on_latency():
+    """Test a smoothed latency above the target backs off down to the lower bounds"""
+    adaptive = AdaptiveBatching(min_batch_size=10, max_batch_size=100, min_in_flight=2, max_in_flight=4,
+                                target_latency=0.5, smoothing=1.0)
+    adaptive.batch_size, adaptive.in_flight = 15, 4
+
+    adaptive.record(0.0, delivered=True, full=True)
+    adaptive.record(2.0, delivered=True, full=True)
+
+    assert (adaptive.batch_size, adaptive.in_flight) == (12, 2)
+    assert adaptive.latency == 2.0
+
+
+def test_adaptive_batching_validation():
+    """Test invalid bounds are rejected"""
+    with pytest.raises(ValueError):
+        AdaptiveBatching(min_batch_size=10, max_batch_size=5)
+    with pytest.raises(ValueError):
+        AdaptiveBatching(min_in_flight=0)
+    with pytest.raises(ValueError):
+        AdaptiveBatching(decrease_factor=1.0)
@@ -0,0 +1,196 @@
+import pytest
+import asyncio
+import json
+
+from unittest.mock import AsyncMock
+
+from dashgram import Dashgram
+from dashgram.agent import Agent, AgentWriter, encode_frame, read_frame
+from dashgram.agent.__main__ import parse_args
+
+
+async def _read_all(data: bytes):
+    reader = asyncio.StreamReader()
+    reader.feed_data(data)
+    reader.feed_eof()
+    frames = []
+    while True:
+        frame = await read_frame(reader)
+        if frame is None:
+            return frames
+        frames.append(frame)
+
+
+def _agent_sdk(**kwargs):
+    sdk = Dashgram(project_id="test_project", access_key="test_key", max_batch_delay_ms=10, **kwargs)
+    sdk._send_batch = AsyncMock(return_value=True)
+    sdk._sender._send_batch = sdk._send_batch
+    return sdk
+
+
+def _sent_updates(sdk):
+    return [json.loads(event) for call in sdk._send_batch.await_args_list for event in call.args[0]]
+
+
+async def _wait_for(condition, timeout=2.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not condition():
+        assert asyncio.get_running_loop().time() < deadline
+        await asyncio.sleep(0.01)
+
+
+@pytest.mark.asyncio
+async def test_frame_roundtrip():
+    """Test frames are decoded with their event and update type"""
+    data = encode_frame(b'{"update_id":1}', "message") + encode_frame(b'{"update_id":2}')
+
+    assert await _read_all(data) == [(b'{"update_id":1}', "message"), (b'{"update_id":2}', None)]
+
+
+@pytest.mark.asyncio
+async def test_read_frame_truncated():
+    """Test a truncated frame ends the stream"""
+    data = encode_frame(b'{"update_id":1}', "message")
+    assert await _read_all(data + data[:-3]) == [(b'{"update_id":1}', "message")]
+
+
+@pytest.mark.asyncio
+async def test_writer_sends_events_through_agent(tmp_path, sample_event_dict):
+    """Test events written by the agent writer are sent by the agent's client"""
+    sdk = _agent_sdk()
+    agent = Agent(sdk, tmp_path / "agent.sock")
+    await agent.start()
+
+    writer = AgentWriter(tmp_path / "agent.sock")
+    assert writer.send(json.dumps(sample_event_dict).encode(), "message") is True
+    assert writer.send(b'{"update_id":-1,"callback_query":{"data":"x"}}', "callback_query") is True
+    assert await asyncio.to_thread(writer.flush, 2.0) is True
+    assert writer.sent == 2
+
+    await _wait_for(lambda: agent.received == 2)
+    assert await agent.aclose() == 0
+    assert writer.close() == 0
+
+    assert _sent_updates(sdk) == [sample_event_dict, {"update_id": -1, "callback_query": {"data": "x"}}]
+    assert not (tmp_path / "agent.sock").exists()
+
+
+@pytest.mark.asyncio
+async def test_writer_buffers_until_agent_starts(tmp_path, mocker):
+    """Test events are buffered while the agent is unavailable"""
+    warn = mocker.patch("dashgram.agent.writer.warnings.warn")
+    writer = AgentWriter(tmp_path / "agent.sock", reconnect_interval=0)
+
+    assert writer.send(b'{"update_id":1}', "message") is True
+    assert writer.pending == 1
+    assert not writer.connected
+    warn.assert_called_once()
+
+    sdk = _agent_sdk()
+    agent = Agent(sdk, tmp_path / "agent.sock")
+    await agent.start()
+
+    assert await asyncio.to_thread(writer.flush, 2.0) is True
+    await _wait_for(lambda: agent.received == 1)
+    await agent.aclose()
+    writer.close()
+
+    assert _sent_updates(sdk) == [{"update_id": 1}]
+
+
+@pytest.mark.asyncio
+async def test_writer_retries_buffered_events_without_traffic(tmp_path, mocker):
+    """Test buffered events are written once the agent starts, without another send() or flush()"""
+    mocker.patch("dashgram.agent.writer.warnings.warn")
+    writer = AgentWriter(tmp_path / "agent.sock", reconnect_interval=0, retry_interval=0.01)
+    assert writer.send(b'{"update_id":1}', "message") is True
+    assert writer.pending == 1
+
+    sdk = _agent_sdk()
+    agent = Agent(sdk, tmp_path / "agent.sock")
+    await agent.start()
+
+    await _wait_for(lambda: agent.received == 1)
+    assert writer.pending == 0
+    await agent.aclose()
+    writer.close()
+
+    assert _sent_updates(sdk) == [{"update_id": 1}]
+
+
+def test_writer_drops_events_when_buffer_is_full(tmp_path, mocker):
+    """Test events beyond the buffer size are dropped and counted per type"""
+    mocker.patch("dashgram.agent.writer.warnings.warn")
+    frame_size = len(encode_frame(b'{"update_id":1}', "message"))
+    writer = AgentWriter(tmp_path / "agent.sock", max_buffer_bytes=frame_size)
+
+    assert writer.send(b'{"update_id":1}', "message") is True
+    assert writer.send(b'{"update_id":2}', "message") is False
+    assert writer.dropped_by_type == {"message": 1}
+    assert writer.close(timeout=0) == 1
+
+
+@pytest.mark.asyncio
+async def test_agent_skips_duplicate_updates(tmp_path):
+    """Test the agent skips updates tracked by several processes"""
+    sdk = _agent_sdk(deduplicate=True)
+    agent = Agent(sdk, tmp_path / "agent.sock")
+    await agent.start()
+
+    writers = [AgentWriter(tmp_path / "agent.sock") for _ in range(2)]
+    for writer in writers:
+        writer.send(b'{"update_id":7,"message":{}}', "message")
+        await asyncio.to_thread(writer.flush, 2.0)
+
+    await _wait_for(lambda: agent.received == 2)
+    await agent.aclose()
+    for writer in writers:
+        writer.close()
+
+    assert _sent_updates(sdk) == [{"update_id": 7, "message": {}}]
+    assert sdk.deduplicator.duplicates == 1
+
+
+@pytest.mark.asyncio
+async def test_client_agent_mode(tmp_path, sample_event_dict):
+    """Test track_event_nowait writes events to the agent when agent_socket is set"""
+    agent_sdk = _agent_sdk()
+    agent = Agent(agent_sdk, tmp_path / "agent.sock")
+    await agent.start()
+
+    sdk = Dashgram(project_id="test_project", access_key="test_key", agent_socket=tmp_path / "agent.sock")
+    assert sdk.track_event_nowait(sample_event_dict) is True
+    assert await sdk.flush() == 0
+    assert sdk.sender_stats()["sent"] == 1
+    assert not sdk._sender.running
+    assert await sdk.aclose() == 0
+
+    await _wait_for(lambda: agent.received == 1)
+    await agent.aclose()
+
+    assert _sent_updates(agent_sdk) == [sample_event_dict]
+
+
+@pytest.mark.asyncio
+async def test_client_agent_flush_is_bounded(tmp_path, sample_event_dict, mocker):
+    """Test flush() returns the buffered events after its timeout while the agent is unavailable"""
+    mocker.patch("dashgram.agent.writer.warnings.warn")
+    sdk = Dashgram(project_id="test_project", access_key="test_key", agent_socket=tmp_path / "agent.sock")
+    assert sdk.track_event_nowait(sample_event_dict) is True
+
+    assert await asyncio.wait_for(sdk.flush(timeout=0.1), 1) == 1
+    mocker.patch("dashgram.client.warnings.warn")
+    assert await sdk.aclose(timeout=0) == 1
+
+
+def test_parse_args_requires_credentials(monkeypatch):
+    """Test the agent refuses to start without credentials"""
+    monkeypatch.delenv("DASHGRAM_PROJECT_ID", raising=False)
+    monkeypatch.delenv("DASHGRAM_ACCESS_KEY", raising=False)
+    with pytest.raises(SystemExit):
+        parse_args(["--socket", "/tmp/agent.sock"])
+
+    monkeypatch.setenv("DASHGRAM_PROJECT_ID", "123")
+    monkeypatch.setenv("DASHGRAM_ACCESS_KEY", "key")
+    args = parse_args(["--socket-mode", "660"])
+    assert (args.project_id, args.access_key, args.socket_mode) == ("123", "key", 0o660)
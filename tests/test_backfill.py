@@ -0,0 +1,164 @@
+import pytest
+import asyncio
+import gzip
+import json
+
+from unittest.mock import AsyncMock
+
+from dashgram import Dashgram
+from dashgram.backfill import Checkpoint, LineReader, backfill, parse_args
+
+
+def _write_updates(path, count, compress=False):
+    lines = b"".join(json.dumps({"update_id": i, "message": {"text": str(i)}}).encode() + b"\n" for i in range(count))
+    path.write_bytes(gzip.compress(lines) if compress else lines)
+
+
+def _sdk(send_batch):
+    sdk = Dashgram(project_id="test_project", access_key="test_key")
+    sdk._send_batch = send_batch
+    return sdk
+
+
+def _sent_ids(send_batch):
+    return sorted(json.loads(event)["update_id"] for call in send_batch.await_args_list for event in call.args[0])
+
+
+@pytest.mark.parametrize("compress", [False, True])
+def test_line_reader_batches_and_resumes(tmp_path, compress):
+    """Test updates are read in batches from plain and gzip files and reading resumes at an offset"""
+    path = tmp_path / "updates.jsonl"
+    _write_updates(path, 5, compress)
+    with open(path, "ab") as f:
+        tail = b'\nnot json\n{"update_id": 5}}\n{"update_id": 6, "mess'
+        f.write(gzip.compress(tail) if compress else tail)
+
+    reader = LineReader(path)
+    first = reader.read_batch(2)
+    assert [json.loads(event)["update_id"] for event in first.events] == [0, 1]
+    assert (first.seq, first.lines) == (1, 2)
+    reader.close()
+
+    reader = LineReader(path, first.offset)
+    rest = reader.read_batch(10)
+    assert [json.loads(event)["update_id"] for event in rest.events] == [2, 3, 4]
+    assert rest.lines == 7
+    assert reader.skipped == 3
+    assert reader.read_batch(10) is None
+    reader.close()
+
+
+@pytest.mark.asyncio
+async def test_backfill_sends_all_updates(tmp_path):
+    """Test all updates are sent in batches by concurrent uploads"""
+    path = tmp_path / "updates.jsonl.gz"
+    _write_updates(path, 95, compress=True)
+    in_flight = max_in_flight = 0
+
+    async def send_batch(events):
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return True
+
+    send_batch = AsyncMock(side_effect=send_batch)
+    checkpoint = Checkpoint(tmp_path / "updates.checkpoint")
+    progress = []
+
+    stats = await backfill(_sdk(send_batch), path, batch_size=10, concurrency=3, checkpoint=checkpoint,
+                           progress=progress.append, progress_interval=0.001)
+
+    assert stats.completed
+    assert (stats.sent, stats.failed, stats.lines) == (95, 0, 95)
+    assert _sent_ids(send_batch) == list(range(95))
+    assert send_batch.await_count == 10
+    assert max_in_flight == 3
+    assert progress
+    assert Checkpoint(tmp_path / "updates.checkpoint").lines == 95
+
+
+@pytest.mark.asyncio
+async def test_backfill_stops_on_failure_and_resumes(tmp_path, mocker):
+    """Test a failed batch stops the run and the next run resumes at that batch"""
+    path = tmp_path / "updates.jsonl"
+    _write_updates(path, 30)
+    send_batch = AsyncMock(side_effect=[True, False, True])
+
+    stats = await backfill(_sdk(send_batch), path, batch_size=10, concurrency=1,
+                           checkpoint=Checkpoint(tmp_path / "checkpoint"))
+
+    assert not stats.completed
+    assert (stats.sent, stats.failed, stats.lines) == (10, 10, 10)
+    checkpoint = Checkpoint(tmp_path / "checkpoint")
+    assert checkpoint.lines == 10
+
+    send_batch = AsyncMock(return_value=True)
+    stats = await backfill(_sdk(send_batch), path, batch_size=10, concurrency=2, checkpoint=checkpoint)
+
+    assert stats.completed
+    assert (stats.sent, stats.lines) == (20, 30)
+    assert _sent_ids(send_batch) == list(range(10, 30))
+
+
+@pytest.mark.asyncio
+async def test_backfill_writes_failed_batches(tmp_path):
+    """Test failed batches are written to the failed file and the run continues"""
+    path = tmp_path / "updates.jsonl"
+    _write_updates(path, 6)
+    send_batch = AsyncMock(side_effect=[True, False, True])
+
+    stats = await backfill(_sdk(send_batch), path, batch_size=2, concurrency=1,
+                           failed_path=tmp_path / "failed.jsonl")
+
+    assert stats.completed
+    assert (stats.sent, stats.failed) == (4, 2)
+    assert [json.loads(line)["update_id"] for line in (tmp_path / "failed.jsonl").read_bytes().splitlines()] == [2, 3]
+
+
+@pytest.mark.asyncio
+async def test_backfill_cancels_uploads_when_one_raises(tmp_path):
+    """Test an upload error stops the reader and the other uploads before it is raised"""
+    path = tmp_path / "updates.jsonl"
+    _write_updates(path, 100)
+    calls = 0
+
+    async def send_batch(events):
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            raise RuntimeError("boom")
+        await asyncio.sleep(10)
+        return True
+
+    with pytest.raises(RuntimeError):
+        await asyncio.wait_for(backfill(_sdk(send_batch), path, batch_size=10, concurrency=3), 1)
+
+    assert [task for task in asyncio.all_tasks() if task is not asyncio.current_task()] == []
+
+
+@pytest.mark.asyncio
+async def test_backfill_rate_limit(tmp_path):
+    """Test requests are spaced by the rate limit"""
+    path = tmp_path / "updates.jsonl"
+    _write_updates(path, 4)
+
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    stats = await backfill(_sdk(AsyncMock(return_value=True)), path, batch_size=1, concurrency=4,
+                           max_requests_per_second=50)
+
+    assert stats.sent == 4
+    assert loop.time() - started >= 0.05
+
+
+def test_parse_args(monkeypatch):
+    """Test the backfill requires credentials and defaults the checkpoint next to the input"""
+    monkeypatch.delenv("DASHGRAM_PROJECT_ID", raising=False)
+    monkeypatch.delenv("DASHGRAM_ACCESS_KEY", raising=False)
+    with pytest.raises(SystemExit):
+        parse_args(["updates.jsonl"])
+
+    args = parse_args(["updates.jsonl", "--project-id", "123", "--access-key", "key", "--concurrency", "8"])
+    assert (args.checkpoint, args.concurrency, args.batch_size) == ("updates.jsonl.checkpoint", 8, 500)
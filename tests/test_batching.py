@@ -0,0 +1,524 @@
+import pytest
+import asyncio
+from unittest.mock import AsyncMock
+
+from dashgram.adaptive import AdaptiveBatching
+from dashgram.batching import BatchResult, BatchSender
+from dashgram.enums import OverflowPolicy
+from dashgram.spool import Spool
+
+
+@pytest.mark.asyncio
+async def test_batch_sender_flushes_on_max_batch_size():
+    """Test that a full batch is sent without waiting for the delay"""
+    send_batch = AsyncMock(return_value=True)
+    sender = BatchSender(send_batch, max_batch_size=3, max_batch_delay_ms=60000)
+
+    for i in range(6):
+        assert sender.put_nowait({"update_id": i}) is True
+
+    await asyncio.wait_for(sender.flush(), 1)
+
+    assert send_batch.await_count == 2
+    assert send_batch.await_args_list[0].args[0] == [{"update_id": 0}, {"update_id": 1}, {"update_id": 2}]
+    assert send_batch.await_args_list[1].args[0] == [{"update_id": 3}, {"update_id": 4}, {"update_id": 5}]
+    assert sender.sent == 6
+
+    await sender.close()
+
+
+@pytest.mark.asyncio
+async def test_batch_sender_flushes_on_max_batch_delay():
+    """Test that a partial batch is sent once the delay expires"""
+    send_batch = AsyncMock(return_value=True)
+    sender = BatchSender(send_batch, max_batch_size=100, max_batch_delay_ms=10)
+
+    sender.put_nowait({"update_id": 1})
+    sender.put_nowait({"update_id": 2})
+    await asyncio.sleep(0.05)
+
+    send_batch.assert_awaited_once_with([{"update_id": 1}, {"update_id": 2}])
+
+    await sender.close()
+    assert not sender.running
+
+
+@pytest.mark.asyncio
+async def test_batch_sender_drops_when_queue_is_full(mocker):
+    """Test that events are dropped once the queue is full"""
+    mocker.patch("dashgram.batching.warnings.warn")
+    sender = BatchSender(AsyncMock(return_value=True), max_queue_size=2)
+
+    assert sender.put_nowait(1) is True
+    assert sender.put_nowait(2) is True
+    assert sender.put_nowait(3) is False
+    assert sender.dropped == 1
+
+    await sender.close()
+
+
+@pytest.mark.asyncio
+async def test_batch_sender_counts_failed_batches(mocker):
+    """Test that failed and raising batches are counted without stopping the sender"""
+    mock_warn = mocker.patch("dashgram.batching.warnings.warn")
+    send_batch = AsyncMock(side_effect=[False, ValueError("boom"), True])
+    sender = BatchSender(send_batch, max_batch_size=1, max_batch_delay_ms=0)
+
+    for i in range(3):
+        sender.put_nowait(i)
+    await asyncio.wait_for(sender.flush(), 1)
+
+    assert sender.failed == 2
+    assert sender.sent == 1
+    mock_warn.assert_called_once_with("ValueError: boom")
+
+    await sender.close()
+
+
+def test_batch_sender_invalid_arguments():
+    """Test that invalid batch settings are rejected"""
+    with pytest.raises(ValueError):
+        BatchSender(AsyncMock(), max_batch_size=0)
+    with pytest.raises(ValueError):
+        BatchSender(AsyncMock(), max_batch_delay_ms=-1)
+
+
+@pytest.mark.asyncio
+async def test_batch_sender_spools_failed_batches_and_drains_in_order(tmp_path, mocker):
+    """Test undelivered batches go to the spool and are drained in order once the API recovers"""
+    mocker.patch("dashgram.batching.warnings.warn")
+    spool = Spool(tmp_path)
+    delivered = []
+    api_up = False
+
+    async def send_batch(batch):
+        if not api_up:
+            return False
+        delivered.extend(batch)
+        return True
+
+    sender = BatchSender(send_batch, max_batch_size=10, max_batch_delay_ms=0, spool=spool, drain_interval=0.01)
+
+    sender.put_nowait(b"1")
+    await asyncio.wait_for(sender.flush(), 1)
+    assert spool.pending == 1
+
+    sender.put_nowait(b"2")
+    await asyncio.wait_for(sender.flush(), 1)
+    assert spool.pending == 2
+
+    api_up = True
+    sender.put_nowait(b"3")
+    await asyncio.wait_for(sender.flush(), 1)
+    for _ in range(100):
+        if spool.empty:
+            break
+        await asyncio.sleep(0.01)
+
+    assert delivered == [b"1", b"2", b"3"]
+    assert sender.spooled == 3
+    assert sender.sent == 3
+    assert sender.failed == 0
+
+    await sender.close()
+
+
+@pytest.mark.asyncio
+async def test_batch_sender_drains_spool_left_by_previous_run(tmp_path):
+    """Test events spooled before a restart are sent once the sender starts"""
+    previous = Spool(tmp_path)
+    previous.append([b"1", b"2"])
+    previous.close()
+
+    send_batch = AsyncMock(return_value=True)
+    sender = BatchSender(send_batch, max_batch_size=10, max_batch_delay_ms=0, spool=Spool(tmp_path))
+    sender.put_nowait(b"3")
+    await asyncio.wait_for(sender.flush(), 1)
+    for _ in range(100):
+        if sender.spool.empty:
+            break
+        await asyncio.sleep(0.01)
+
+    assert [event for call in send_batch.await_args_list for event in call.args[0]] == [b"1", b"2", b"3"]
+
+    await sender.close()
+
+
+@pytest.mark.asyncio
+async def test_batch_sender_does_not_spool_rejected_events(tmp_path):
+    """Test permanently rejected events are counted as failed instead of blocking the spool"""
+    previous = Spool(tmp_path)
+    previous.append([b"bad", b"1"])
+    previous.close()
+    delivered = []
+
+    async def send_batch(batch):
+        delivered.extend(event for event in batch if event != b"bad")
+        return BatchResult([], [event for event in batch if event == b"bad"])
+
+    sender = BatchSender(send_batch, max_batch_size=10, max_batch_delay_ms=0, spool=Spool(tmp_path))
+    sender.put_nowait(b"2")
+    await asyncio.wait_for(sender.flush(), 1)
+    for _ in range(100):
+        if sender.spool.empty:
+            break
+        await asyncio.sleep(0.01)
+
+    sender.put_nowait(b"bad")
+    sender.put_nowait(b"3")
+    await asyncio.wait_for(sender.flush(), 1)
+
+    assert delivered == [b"1", b"2", b"3"]
+    assert sender.spool.empty
+    assert sender.spooled == 1
+    assert sender.sent == 3
+    assert sender.failed == 2
+
+    await sender.close()
+
+
+@pytest.mark.asyncio
+async def test_batch_sender_drain_respools_only_undelivered_events(tmp_path):
+    """Test a partly delivered spooled batch is committed and only its undelivered events are spooled again"""
+    previous = Spool(tmp_path)
+    previous.append([b"1", b"2", b"3"])
+    previous.close()
+    calls = []
+
+    async def send_batch(batch):
+        calls.append(list(batch))
+        return BatchResult([b"2"] if len(calls) == 1 else [])
+
+    sender = BatchSender(send_batch, max_batch_size=10, max_batch_delay_ms=0, spool=Spool(tmp_path), drain_interval=0.01)
+    sender.put_nowait(b"4")
+    await asyncio.wait_for(sender.flush(), 1)
+    for _ in range(100):
+        if sender.spool.empty:
+            break
+        await asyncio.sleep(0.01)
+
+    assert calls == [[b"1", b"2", b"3", b"4"], [b"2"]]
+    assert sender.sent == 4
+
+    await sender.close()
+
+
+@pytest.mark.asyncio
+async def test_batch_sender_survives_spool_write_errors(tmp_path, mocker):
+    """Test a batch that cannot be spooled is counted as failed and later batches are still sent"""
+    mock_warn = mocker.patch("dashgram.batching.warnings.warn")
+    spool = Spool(tmp_path)
+    mocker.patch.object(spool, "append", side_effect=OSError("No space left on device"))
+    send_batch = AsyncMock(side_effect=[False, True])
+    sender = BatchSender(send_batch, max_batch_size=1, max_batch_delay_ms=0, spool=spool)
+
+    sender.put_nowait(b"1")
+    await asyncio.wait_for(sender.flush(), 1)
+    sender.put_nowait(b"2")
+    await asyncio.wait_for(sender.flush(), 1)
+
+    assert (sender.sent, sender.failed, sender.unsent, sender.in_flight) == (1, 1, 0, 0)
+    mock_warn.assert_called_once_with("OSError: No space left on device")
+
+    await sender.close()
+
+
+@pytest.mark.asyncio
+async def test_batch_sender_limits_queued_bytes(mocker):
+    """Test that events are dropped once the queued events reach max_queue_bytes"""
+    mocker.patch("dashgram.batching.warnings.warn")
+    sender = BatchSender(AsyncMock(return_value=True), max_batch_delay_ms=10, max_queue_bytes=10)
+
+    assert sender.put_nowait(b"12345", "message") is True
+    assert sender.put_nowait(b"67890", "message") is True
+    assert sender.pending_bytes == 10
+    assert sender.put_nowait(b"x", "callback_query") is False
+    assert sender.put_nowait(b"x" * 11, "message") is False
+
+    assert sender.dropped == 2
+    assert sender.dropped_by_type == {"callback_query": 1, "message": 1}
+
+    await sender.close()
+
+
+@pytest.mark.asyncio
+async def test_batch_sender_drop_oldest_policy(mocker):
+    """Test that the drop_oldest policy makes room by dropping the oldest events"""
+    mocker.patch("dashgram.batching.warnings.warn")
+    send_batch = AsyncMock(return_value=True)
+    sender = BatchSender(send_batch, max_batch_delay_ms=10, max_queue_size=2, overflow="drop_oldest")
+
+    assert sender.put_nowait(b"1", "message") is True
+    assert sender.put_nowait(b"2", "poll") is True
+    assert sender.put_nowait(b"3", "poll") is True
+    await asyncio.wait_for(sender.flush(), 1)
+
+    send_batch.assert_awaited_once_with([b"2", b"3"])
+    assert sender.dropped_by_type == {"message": 1}
+
+    await sender.close()
+
+
+@pytest.mark.asyncio
+async def test_batch_sender_block_policy_waits_for_room(mocker):
+    """Test that the block policy makes other threads wait until the sender takes events"""
+    mock_warn = mocker.patch("dashgram.batching.warnings.warn")
+    send_batch = AsyncMock(return_value=True)
+    sender = BatchSender(send_batch, max_batch_size=1, max_batch_delay_ms=0, max_queue_size=1,
+                         overflow=OverflowPolicy.BLOCK, block_timeout=1.0)
+    sender.start()
+
+    results = await asyncio.to_thread(lambda: [sender.put_nowait(i) for i in range(5)])
+    await asyncio.wait_for(sender.flush(), 1)
+
+    assert results == [True] * 5
+    assert [call.args[0] for call in send_batch.await_args_list] == [[i] for i in range(5)]
+    mock_warn.assert_not_called()
+
+    await sender.close()
+
+
+@pytest.mark.asyncio
+async def test_batch_sender_block_policy_drops_in_sender_loop(mocker):
+    """Test that the block policy does not block the sender's own event loop"""
+    mocker.patch("dashgram.batching.warnings.warn")
+    sender = BatchSender(AsyncMock(return_value=True), max_batch_delay_ms=10, max_queue_size=1,
+                         overflow="block", block_timeout=10.0)
+
+    assert sender.put_nowait(1) is True
+    assert sender.put_nowait(2) is False
+    assert sender.dropped == 1
+
+    await sender.close()
+
+
+@pytest.mark.asyncio
+async def test_batch_sender_spill_policy(tmp_path):
+    """Test that the spill policy writes events to the spool when the queue is full"""
+    delivered = []
+
+    async def send_batch(batch):
+        delivered.extend(batch)
+        return True
+
+    sender = BatchSender(send_batch, max_batch_delay_ms=10, max_queue_size=1, overflow="spill",
+                         spool=Spool(tmp_path))
+
+    assert sender.put_nowait(b"1") is True
+    assert sender.put_nowait(b"2") is True
+    assert sender.spooled == 1
+    assert sender.dropped == 0
+
+    await asyncio.wait_for(sender.flush(), 1)
+    for _ in range(100):
+        if sender.spool.empty:
+            break
+        await asyncio.sleep(0.01)
+
+    assert sorted(delivered) == [b"1", b"2"]
+
+    await sender.close()
+
+
+@pytest.mark.asyncio
+async def test_batch_sender_drops_events_on_spool_errors(tmp_path, mocker):
+    """Test spool I/O errors drop the events instead of raising in put_nowait(), the sender task or close()"""
+    mocker.patch("dashgram.batching.warnings.warn")
+    spool = Spool(tmp_path)
+    spool.append([b"0"])
+    mocker.patch.object(spool, "append", side_effect=OSError("No space left on device"))
+    mocker.patch.object(spool, "read", side_effect=OSError("Input/output error"))
+    mocker.patch.object(spool, "sync", side_effect=OSError("Input/output error"))
+
+    sender = BatchSender(AsyncMock(return_value=True), max_batch_delay_ms=0, max_queue_size=1, overflow="spill",
+                         spool=spool, drain_interval=0.01)
+
+    assert sender.put_nowait(b"1") is True
+    assert sender.put_nowait(b"2") is False
+    await asyncio.wait_for(sender.flush(), 1)
+    await asyncio.sleep(0.05)
+
+    assert sender.running
+    assert spool.read.call_count > 1
+    assert (sender.failed, sender.spooled) == (2, 0)
+    assert await sender.close() == 0
+
+
+@pytest.mark.asyncio
+async def test_batch_sender_close_reports_events_it_cannot_spool(tmp_path, mocker):
+    """Test close() reports the events left when the spool cannot be written instead of raising"""
+    mocker.patch("dashgram.batching.warnings.warn")
+    spool = Spool(tmp_path)
+    mocker.patch.object(spool, "append", side_effect=OSError("No space left on device"))
+
+    async def send_batch(batch):
+        await asyncio.sleep(10)
+        return True
+
+    sender = BatchSender(send_batch, max_batch_size=2, max_batch_delay_ms=0, spool=spool)
+    for i in range(3):
+        sender.put_nowait(str(i).encode())
+    await asyncio.sleep(0.01)
+
+    assert await sender.close(timeout=0.01) == 3
+    assert sender.failed == 3
+
+
+def test_batch_sender_spill_policy_requires_spool():
+    """Test that the spill policy cannot be used without a spool"""
+    with pytest.raises(ValueError):
+        BatchSender(AsyncMock(), overflow="spill")
+    with pytest.raises(ValueError):
+        BatchSender(AsyncMock(), overflow="unknown")
+
+
+@pytest.mark.asyncio
+async def test_batch_sender_close_reports_undelivered_events():
+    """Test that close() gives up after the timeout and reports the events not sent"""
+    async def send_batch(batch):
+        await asyncio.sleep(10)
+        return True
+
+    sender = BatchSender(send_batch, max_batch_size=2, max_batch_delay_ms=0)
+    for i in range(5):
+        sender.put_nowait(i)
+    await asyncio.sleep(0.01)
+
+    assert await sender.close(timeout=0.05) == 5
+    assert not sender.running
+    assert sender.pending == 0
+
+
+@pytest.mark.asyncio
+async def test_batch_sender_close_spools_undelivered_events(tmp_path):
+    """Test that events not sent before the timeout, including the in-flight batch, are spooled"""
+    async def send_batch(batch):
+        await asyncio.sleep(10)
+        return True
+
+    sender = BatchSender(send_batch, max_batch_size=2, max_batch_delay_ms=0, spool=Spool(tmp_path))
+    for i in range(5):
+        sender.put_nowait(str(i).encode())
+    await asyncio.sleep(0.01)
+
+    assert await sender.close(timeout=0.05) == 0
+    assert sender.spool.read(10).events == [b"0", b"1", b"2", b"3", b"4"]
+
+
+@pytest.mark.asyncio
+async def test_batch_sender_adaptive_batching_grows_under_load():
+    """Test the adaptive controller grows the batch size, then sends batches concurrently"""
+    in_flight = max_in_flight = 0
+    sizes = []
+
+    async def send_batch(batch):
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        sizes.append(len(batch))
+        await asyncio.sleep(0.005)
+        in_flight -= 1
+        return True
+
+    adaptive = AdaptiveBatching(min_batch_size=2, max_batch_size=6, batch_size_step=2, max_in_flight=3)
+    sender = BatchSender(send_batch, max_batch_delay_ms=60000, max_queue_size=0, adaptive=adaptive)
+    for i in range(200):
+        sender.put_nowait(i)
+
+    await asyncio.wait_for(sender.flush(), 5)
+
+    assert sizes[:3] == [2, 4, 6]
+    assert max(sizes) == 6
+    assert max_in_flight == 3
+    assert (sender.batch_size, sender.max_in_flight) == (6, 3)
+    assert sender.sent == 200
+
+    await sender.close()
+
+
+@pytest.mark.asyncio
+async def test_batch_sender_drains_spool_with_adaptive_batch_size(tmp_path):
+    """Test the spool is drained in batches of the current adaptive size, and drains feed the controller"""
+    previous = Spool(tmp_path)
+    previous.append([str(i).encode() for i in range(10)])
+    previous.close()
+    sizes = []
+
+    async def send_batch(batch):
+        sizes.append(len(batch))
+        return True
+
+    adaptive = AdaptiveBatching(min_batch_size=2, max_batch_size=6, batch_size_step=2)
+    sender = BatchSender(send_batch, max_batch_delay_ms=0, spool=Spool(tmp_path), adaptive=adaptive)
+    sender.start()
+    for _ in range(100):
+        if sender.spool.empty:
+            break
+        await asyncio.sleep(0.01)
+
+    assert sizes == [2, 4, 4]
+    assert adaptive.batch_size == 6
+    assert sender.sent == 10
+
+    await sender.close()
+
+
+@pytest.mark.asyncio
+async def test_batch_sender_close_spools_concurrent_batches(tmp_path):
+    """Test that close() spools every batch in flight"""
+    async def send_batch(batch):
+        await asyncio.sleep(10)
+        return True
+
+    adaptive = AdaptiveBatching(min_batch_size=1, max_batch_size=1, min_in_flight=3, max_in_flight=3)
+    sender = BatchSender(send_batch, max_batch_delay_ms=0, spool=Spool(tmp_path), adaptive=adaptive)
+    for i in range(5):
+        sender.put_nowait(str(i).encode())
+    await asyncio.sleep(0.01)
+    assert sender.in_flight == 3
+
+    assert await sender.close(timeout=0.05) == 0
+    assert sorted(sender.spool.read(10).events) == [b"0", b"1", b"2", b"3", b"4"]
+
+
+@pytest.mark.asyncio
+async def test_batch_sender_encodes_events_in_sender(mocker):
+    """Test that unencoded events are encoded by the sender and encoding errors only drop the event"""
+    mock_warn = mocker.patch("dashgram.batching.warnings.warn")
+    send_batch = AsyncMock(return_value=True)
+
+    def encode(event):
+        if event is None:
+            raise TypeError("cannot encode")
+        return str(event).encode()
+
+    encode = mocker.Mock(side_effect=encode)
+    sender = BatchSender(send_batch, max_batch_size=10, max_batch_delay_ms=60000, encode=encode)
+    for event in (1, b"2", None, 3):
+        sender.put_nowait(event)
+    encode.assert_not_called()
+
+    await asyncio.wait_for(sender.flush(), 1)
+
+    send_batch.assert_awaited_once_with([b"1", b"2", b"3"])
+    assert (sender.sent, sender.failed) == (3, 1)
+    mock_warn.assert_called_once_with("TypeError: cannot encode")
+
+    await sender.close()
+
+
+@pytest.mark.asyncio
+async def test_batch_sender_spools_encoded_events(tmp_path):
+    """Test that unencoded events left at close() are encoded before being spooled"""
+    async def send_batch(batch):
+        await asyncio.sleep(10)
+        return True
+
+    sender = BatchSender(send_batch, max_batch_size=2, max_batch_delay_ms=0, spool=Spool(tmp_path),
+                         encode=lambda event: str(event).encode())
+    for i in range(5):
+        sender.put_nowait(i)
+    await asyncio.sleep(0.01)
+
+    assert await sender.close(timeout=0.05) == 0
+    assert sender.spool.read(10).events == [b"0", b"1", b"2", b"3", b"4"]
@@ -0,0 +1,97 @@
+import pytest
+import asyncio
+
+import httpx
+
+from dashgram.circuit import CircuitBreaker
+from dashgram.enums import CircuitState
+from dashgram.exceptions import DashgramApiError, InvalidCredentials
+
+
+def test_circuit_breaker_opens_after_consecutive_failures():
+    """Test that the circuit opens after failure_threshold consecutive failures"""
+    breaker = CircuitBreaker(failure_threshold=3)
+
+    for _ in range(2):
+        assert breaker.allow_request()
+        breaker.record(httpx.ConnectError("reset"))
+    assert breaker.allow_request()
+    breaker.record()
+    assert breaker.consecutive_failures == 0
+
+    for _ in range(3):
+        assert breaker.allow_request()
+        breaker.record(httpx.ReadTimeout("timeout"))
+
+    assert breaker.state == CircuitState.OPEN
+    assert not breaker.allow_request()
+    assert breaker.rejected == 1
+    assert breaker.opened == 1
+
+
+def test_circuit_breaker_ignores_client_errors():
+    """Test that client errors show the API is reachable and do not open the circuit"""
+    breaker = CircuitBreaker(failure_threshold=1)
+
+    assert breaker.is_failure(DashgramApiError(503, "Unavailable"))
+    assert breaker.is_failure(DashgramApiError(429, "Too many requests"))
+    assert not breaker.is_failure(DashgramApiError(400, "Invalid request"))
+    assert not breaker.is_failure(InvalidCredentials())
+
+    breaker.record(DashgramApiError(400, "Invalid request"))
+    assert breaker.state == CircuitState.CLOSED
+
+
+def test_circuit_breaker_half_opens_and_probes(mocker):
+    """Test the open, half-open and closed transitions with probe requests"""
+    mock_time = mocker.patch("dashgram.circuit.time.monotonic", return_value=100.0)
+    changes = []
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10,
+                             on_state_change=lambda old, new: changes.append((old, new)))
+
+    breaker.allow_request()
+    breaker.record(httpx.ConnectError("reset"))
+    assert breaker.retry_after == 10
+
+    mock_time.return_value = 111.0
+    assert breaker.allow_request() is True
+    assert breaker.allow_request() is False
+    breaker.record(DashgramApiError(502, "Bad gateway"))
+    assert breaker.state == CircuitState.OPEN
+
+    mock_time.return_value = 122.0
+    assert breaker.allow_request() is True
+    breaker.record()
+
+    assert breaker.state == CircuitState.CLOSED
+    assert changes == [
+        (CircuitState.CLOSED, CircuitState.OPEN),
+        (CircuitState.OPEN, CircuitState.HALF_OPEN),
+        (CircuitState.HALF_OPEN, CircuitState.OPEN),
+        (CircuitState.OPEN, CircuitState.HALF_OPEN),
+        (CircuitState.HALF_OPEN, CircuitState.CLOSED),
+    ]
+    assert breaker.metrics() == {"state": "closed", "consecutive_failures": 0, "opened": 2, "rejected": 1,
+                                 "retry_after": 0.0}
+
+
+def test_circuit_breaker_releases_cancelled_probes(mocker):
+    """Test that a cancelled probe frees its slot without changing the state"""
+    mock_time = mocker.patch("dashgram.circuit.time.monotonic", return_value=0.0)
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=1)
+    breaker.record(httpx.ConnectError("reset"))
+
+    mock_time.return_value = 2.0
+    assert breaker.allow_request()
+    breaker.record(asyncio.CancelledError())
+
+    assert breaker.state == CircuitState.HALF_OPEN
+    assert breaker.allow_request()
+
+
+def test_circuit_breaker_invalid_arguments():
+    """Test that invalid thresholds are rejected"""
+    with pytest.raises(ValueError):
+        CircuitBreaker(failure_threshold=0)
+    with pytest.raises(ValueError):
+        CircuitBreaker(half_open_max_calls=0)
@@ -1,10 +1,22 @@
 import pytest
+import asyncio
+import gzip
+import json
 
-from unittest.mock import Mock
+import aiogram
+import httpx
+
+from unittest.mock import Mock, AsyncMock
 
 from dashgram import Dashgram, __version__
-from dashgram.enums import HandlerType
-from dashgram.exceptions import InvalidCredentials, DashgramApiError
+from dashgram.adaptive import AdaptiveBatching
+from dashgram.batching import BatchResult
+from dashgram.circuit import CircuitBreaker
+from dashgram.enums import CircuitState, HandlerType
+from dashgram.exceptions import InvalidCredentials, DashgramApiError, CircuitOpenError
+from dashgram.projection import Projection
+from dashgram.ratelimit import RateLimit
+from dashgram.retry import RetryPolicy
 
 
 def test_client_initialization_with_required_params(mocker):
@@ -44,6 +56,14 @@ def test_client_httpx_client_initialization():
     assert sdk._client.headers["Authorization"] == "Bearer test"
 
 
+def test_client_transport_options():
+    """Test HTTP transport options are passed to the client"""
+    sdk = Dashgram(project_id=123, access_key="test", max_connections=8, max_keepalive_connections=4, timeout=3.0)
+    assert sdk._client.timeout.read == 3.0
+    assert sdk.pool_stats()["max_connections"] == 8
+    assert sdk.pool_stats()["max_keepalive_connections"] == 4
+
+
 @pytest.mark.asyncio
 async def test_client_request_without_suppress_exceptions(dashgram_client, sample_event_dict):
     res = await dashgram_client.track_event(sample_event_dict, suppress_exceptions=False)
@@ -87,45 +107,472 @@ async def test_track_event_with_dict_input(dashgram_client, sample_event_dict, m
 
 
 @pytest.mark.asyncio
-async def test_track_event_with_object_input(dashgram_client, sample_aiogram_message, sample_event_dict, mocker):
+async def test_track_event_with_object_input(dashgram_client, sample_telegram_message, sample_event_dict, mocker):
     """Test track_event with object input"""
     mock_object_to_dict = mocker.patch("dashgram.client.object_to_dict", return_value=sample_event_dict)
     
-    await dashgram_client.track_event(sample_aiogram_message, HandlerType.MESSAGE)
+    await dashgram_client.track_event(sample_telegram_message, HandlerType.MESSAGE)
     
-    mock_object_to_dict.assert_called_once_with(sample_aiogram_message, HandlerType.MESSAGE)
+    mock_object_to_dict.assert_called_once_with(sample_telegram_message, HandlerType.MESSAGE)
+
+
+@pytest.mark.asyncio
+async def test_track_event_encodes_aiogram_objects_directly(dashgram_client, sample_aiogram_message, sample_message_dict,
+                                                            posted_json, mocker):
+    """Test aiogram objects are encoded to JSON without a dictionary unless a projection is configured"""
+    mock_object_to_dict = mocker.patch("dashgram.client.object_to_dict")
+
+    await dashgram_client.track_event(sample_aiogram_message, HandlerType.MESSAGE)
+
+    mock_object_to_dict.assert_not_called()
+    assert posted_json()[0][1]["updates"] == [{"update_id": -1, "message": sample_message_dict}]
 
 
 @pytest.mark.asyncio
-async def test_track_event(mock_httpx_client, dashgram_client, sample_event_dict):
+async def test_track_event(mock_httpx_client, dashgram_client, sample_event_dict, posted_json):
     """Test track_event with successful API response"""
     res = await dashgram_client.track_event(sample_event_dict, suppress_exceptions=False)
     
     assert res is True
     
-    mock_httpx_client.post.assert_awaited_once_with(
+    assert posted_json() == [(
         "track",
-        json={
+        {
             "origin": "Python + Dashgram SDK",
             "updates": [sample_event_dict],
         },
-    )
+    )]
         
         
 @pytest.mark.asyncio
-async def test_invited_by(mock_httpx_client, dashgram_client):
+async def test_send_batch_retries_transient_errors(mock_httpx_client, sample_api_success_response, sample_event_dict, mocker):
+    """Test background batches are retried after transient errors and 429 with Retry-After"""
+    mock_sleep = mocker.patch("dashgram.client.asyncio.sleep")
+    sdk = Dashgram(project_id="test_project", access_key="test_key", retry=RetryPolicy(max_attempts=3))
+    mock_httpx_client.post.side_effect = [
+        httpx.ConnectError("reset"),
+        httpx.Response(status_code=429, headers={"Retry-After": "2"}, json={"status": "error"}),
+        sample_api_success_response,
+    ]
+    sdk._client = mock_httpx_client
+
+    assert await sdk._send_batch([sample_event_dict]) == BatchResult([], [])
+
+    assert mock_httpx_client.post.await_count == 3
+    assert mock_sleep.await_args_list[1].args == (2.0,)
+
+
+@pytest.mark.asyncio
+async def test_send_batch_does_not_retry_invalid_credentials(mock_httpx_client, sample_api_error_response_403, sample_event_dict, mocker):
+    """Test 403 responses are never retried"""
+    mocker.patch("dashgram.client.warnings.warn")
+    sdk = Dashgram(project_id="test_project", access_key="test_key", retry=RetryPolicy(max_attempts=3))
+    mock_httpx_client.post.side_effect = [sample_api_error_response_403]
+    sdk._client = mock_httpx_client
+
+    assert await sdk._send_batch([sample_event_dict]) == BatchResult([], [sample_event_dict])
+    assert mock_httpx_client.post.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_track_event_is_not_retried(dashgram_client, sample_event_dict, mocker):
+    """Test direct track_event calls make a single attempt"""
+    mocker.patch("dashgram.client.warnings.warn")
+    dashgram_client._client.post.side_effect = [httpx.ConnectError("reset")]
+
+    assert await dashgram_client.track_event(sample_event_dict) is False
+    assert dashgram_client._client.post.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_track_event_with_bytes_input(mock_httpx_client, dashgram_client, sample_event_dict, posted_json, mocker):
+    """Test track_event sends encoded update bytes without converting them"""
+    mock_object_to_dict = mocker.patch("dashgram.client.object_to_dict")
+
+    assert await dashgram_client.track_event(json.dumps(sample_event_dict).encode()) is True
+
+    mock_object_to_dict.assert_not_called()
+    assert posted_json() == [("track", {"origin": "Python + Dashgram SDK", "updates": [sample_event_dict]})]
+
+
+@pytest.mark.asyncio
+async def test_track_event_with_custom_json_encoder(mock_httpx_client, sample_event_dict):
+    """Test a custom JSON encoder is used for request bodies"""
+    encoder = Mock(side_effect=lambda obj: json.dumps(obj).encode())
+    sdk = Dashgram(project_id="test_project", access_key="test_key", origin="Python + Dashgram SDK",
+                   json_encoder=encoder)
+    sdk._client = mock_httpx_client
+
+    await sdk.track_event(sample_event_dict)
+
+    encoder.assert_any_call(sample_event_dict)
+    assert mock_httpx_client.post.await_args.kwargs["headers"] == {"Content-Type": "application/json"}
+
+
+@pytest.mark.asyncio
+async def test_track_event_nowait(mock_httpx_client, sample_api_success_response, sample_event_dict, posted_json):
+    """Test track_event_nowait sends queued events in one batch"""
+    sdk = Dashgram(project_id="test_project", access_key="test_key", origin="Python + Dashgram SDK",
+                   max_batch_delay_ms=10)
+    mock_httpx_client.post.side_effect = None
+    mock_httpx_client.post.return_value = sample_api_success_response
+    sdk._client = mock_httpx_client
+
+    assert sdk.track_event_nowait(sample_event_dict) is True
+    assert sdk.track_event_nowait({"text": "hi"}, HandlerType.MESSAGE) is True
+    await sdk.flush()
+
+    assert posted_json() == [(
+        "track",
+        {
+            "origin": "Python + Dashgram SDK",
+            "updates": [sample_event_dict, {"update_id": -1, "message": {"text": "hi"}}],
+        },
+    )]
+
+    await sdk._sender.close()
+
+
+def test_track_event_nowait_without_running_loop(mock_httpx_client, sample_api_success_response, sample_event_dict, posted_json):
+    """Test track_event_nowait starts the sender thread when no event loop is running"""
+    sdk = Dashgram(project_id="test_project", access_key="test_key", origin="Python + Dashgram SDK")
+    mock_httpx_client.post.side_effect = None
+    mock_httpx_client.post.return_value = sample_api_success_response
+    sdk._client = mock_httpx_client
+
+    assert sdk.track_event_nowait(sample_event_dict) is True
+    assert sdk._sender_thread is not None and sdk._sender_thread.running
+
+    sdk.stop_sender_thread()
+
+    assert posted_json() == [(
+        "track",
+        {"origin": "Python + Dashgram SDK", "updates": [sample_event_dict]},
+    )]
+
+
+@pytest.mark.asyncio
+async def test_track_event_nowait_lazy_serialization(mock_httpx_client, sample_api_success_response, sample_event_dict,
+                                                     sample_aiogram_message, sample_message_dict, posted_json, mocker):
+    """Test framework objects are converted by the sender with lazy_serialization"""
+    sdk = Dashgram(project_id="test_project", access_key="test_key", max_batch_delay_ms=10, lazy_serialization=True)
+    mock_httpx_client.post.side_effect = None
+    mock_httpx_client.post.return_value = sample_api_success_response
+    sdk._client = mock_httpx_client
+    prepare_event = mocker.spy(sdk, "_prepare_event")
+
+    assert sdk.track_event_nowait(sample_aiogram_message, HandlerType.MESSAGE) is True
+    assert sdk.track_event_nowait(sample_event_dict) is True
+    assert prepare_event.call_count == 1
+    assert sdk.sender_stats()["pending"] == 2
+
+    await sdk.flush()
+
+    assert prepare_event.call_count == 2
+    assert posted_json()[0][1]["updates"] == [{"update_id": -1, "message": sample_message_dict}, sample_event_dict]
+
+
+@pytest.mark.asyncio
+async def test_track_event_nowait_counts_dropped_events_per_type(sample_event_dict, mocker):
+    """Test events dropped by a full queue are counted per update type"""
+    mocker.patch("dashgram.batching.warnings.warn")
+    sdk = Dashgram(project_id="test_project", access_key="test_key", max_queue_size=1,
+                   max_batch_delay_ms=10)
+    sdk._send_batch = AsyncMock(return_value=True)
+    sdk._sender._send_batch = sdk._send_batch
+
+    assert sdk.track_event_nowait(sample_event_dict) is True
+    assert sdk.track_event_nowait(sample_event_dict) is False
+    assert sdk.track_event_nowait({"data": "x"}, HandlerType.CALLBACK_QUERY) is False
+
+    stats = sdk.sender_stats()
+    assert stats["dropped"] == 2
+    assert stats["dropped_by_type"] == {"message": 1, "callback_query": 1}
+    assert stats["pending"] == 1
+    assert stats["pending_bytes"] > 0
+
+    await sdk._sender.close()
+
+
+@pytest.mark.asyncio
+async def test_track_event_skips_sampled_out_events(mock_httpx_client, sample_aiogram_message, mocker):
+    """Test that events dropped by sampling are neither converted nor sent"""
+    sdk = Dashgram(project_id="test_project", access_key="test_key", sampling={HandlerType.MESSAGE: 0.0})
+    sdk._client = mock_httpx_client
+    mock_object_to_dict = mocker.patch("dashgram.client.object_to_dict")
+
+    assert await sdk.track_event(sample_aiogram_message, HandlerType.MESSAGE) is True
+    assert sdk.track_event_nowait(sample_aiogram_message, HandlerType.MESSAGE) is True
+
+    mock_object_to_dict.assert_not_called()
+    mock_httpx_client.post.assert_not_awaited()
+    assert sdk.sampler.skipped == {"message": 2}
+    assert sdk._sender.pending == 0
+
+
+@pytest.mark.asyncio
+async def test_track_event_with_projection(mock_httpx_client, sample_aiogram_message, posted_json):
+    """Test that projections are applied to converted events"""
+    sdk = Dashgram(project_id="test_project", access_key="test_key", origin="Python + Dashgram SDK",
+                   projection={HandlerType.MESSAGE: Projection(include=["message_id", "from.id"], max_text_length=5)})
+    sdk._client = mock_httpx_client
+
+    await sdk.track_event(sample_aiogram_message, HandlerType.MESSAGE)
+
+    assert posted_json() == [(
+        "track",
+        {"origin": "Python + Dashgram SDK", "updates": [{"update_id": -1, "message": {"message_id": 1, "from": {"id": 123}}}]},
+    )]
+
+
+@pytest.mark.asyncio
+async def test_track_event_sends_captured_raw_updates(mock_httpx_client, sample_aiogram_message, posted_json, mocker):
+    """Test that the captured JSON of an update is sent instead of converting its object"""
+    sdk = Dashgram(project_id="test_project", access_key="test_key", raw_updates=True)
+    sdk._client = mock_httpx_client
+    mock_object_to_json = mocker.patch("dashgram.client.object_to_json")
+    body = b'{"update_id":7,"message":{"message_id":1,"text":"hi","new_field":true}}'
+
+    assert sdk.capture_raw_update(body) is True
+    await sdk.track_event(aiogram.types.Update(update_id=7, message=sample_aiogram_message))
+
+    mock_object_to_json.assert_not_called()
+    assert body in mock_httpx_client.post.await_args.kwargs["content"]
+    assert sdk.raw_updates.hits == 1
+    assert not Dashgram(project_id="test_project", access_key="test_key").capture_raw_update(body)
+
+
+@pytest.mark.asyncio
+async def test_track_event_projects_captured_raw_updates(mock_httpx_client, sample_aiogram_message, posted_json):
+    """Test that projections are applied to captured raw updates"""
+    sdk = Dashgram(project_id="test_project", access_key="test_key", raw_updates=True,
+                   projection=Projection(include=["message_id"]))
+    sdk._client = mock_httpx_client
+
+    sdk.capture_raw_update(b'{"update_id":7,"message":{"message_id":1,"text":"hi"}}')
+    await sdk.track_event(aiogram.types.Update(update_id=7, message=sample_aiogram_message))
+
+    assert posted_json()[0][1]["updates"] == [{"update_id": 7, "message": {"message_id": 1}}]
+
+
+@pytest.mark.asyncio
+async def test_track_event_projects_encoded_events(mock_httpx_client, sample_api_success_response, posted_json):
+    """Test that projections are applied to events passed as encoded JSON"""
+    sdk = Dashgram(project_id="test_project", access_key="test_key", projection=Projection(include=["message_id"]))
+    mock_httpx_client.post.side_effect = None
+    mock_httpx_client.post.return_value = sample_api_success_response
+    sdk._client = mock_httpx_client
+
+    await sdk.track_event(b'{"update_id":7,"message":{"message_id":1,"text":"hi"}}')
+    await sdk.track_event(memoryview(b'{"message_id":2,"text":"hi"}'), HandlerType.MESSAGE)
+
+    assert [request[1]["updates"] for request in posted_json()] == [
+        [{"update_id": 7, "message": {"message_id": 1}}],
+        [{"update_id": -1, "message": {"message_id": 2}}],
+    ]
+
+
+@pytest.mark.asyncio
+async def test_track_event_skips_duplicate_updates(mock_httpx_client, sample_event_dict, posted_json, mocker):
+    """Test that updates already tracked are neither converted nor sent again"""
+    sdk = Dashgram(project_id="test_project", access_key="test_key", origin="Python + Dashgram SDK",
+                   deduplicate=True)
+    sdk._client = mock_httpx_client
+    mock_wrap_event = mocker.patch("dashgram.client.wrap_event", side_effect=lambda event, handler_type: event)
+
+    assert await sdk.track_event(sample_event_dict) is True
+    assert await sdk.track_event(sample_event_dict) is True
+    assert sdk.track_event_nowait(sample_event_dict) is True
+
+    mock_wrap_event.assert_called_once()
+    assert posted_json() == [("track", {"origin": "Python + Dashgram SDK", "updates": [sample_event_dict]})]
+    assert sdk.deduplicator.duplicates == 2
+    assert sdk._sender.pending == 0
+
+
+@pytest.mark.asyncio
+async def test_circuit_breaker_fails_fast(mock_httpx_client, sample_event_dict):
+    """Test that requests fail fast without reaching the API while the circuit is open"""
+    sdk = Dashgram(project_id="test_project", access_key="test_key",
+                   circuit_breaker=CircuitBreaker(failure_threshold=2, reset_timeout=60))
+    sdk._client = mock_httpx_client
+    mock_httpx_client.post.side_effect = httpx.ConnectTimeout("timeout")
+
+    for _ in range(2):
+        with pytest.raises(httpx.ConnectTimeout):
+            await sdk.track_event(sample_event_dict, suppress_exceptions=False)
+
+    with pytest.raises(CircuitOpenError) as exc_info:
+        await sdk.track_event(sample_event_dict, suppress_exceptions=False)
+
+    assert 0 < exc_info.value.retry_after <= 60
+    assert mock_httpx_client.post.await_count == 2
+    assert sdk.circuit_breaker.state == CircuitState.OPEN
+
+
+@pytest.mark.asyncio
+async def test_send_batch_does_not_retry_open_circuit(mock_httpx_client, sample_event_dict, mocker):
+    """Test that background sends fail fast instead of retrying while the circuit is open"""
+    mocker.patch("dashgram.client.warnings.warn")
+    mock_sleep = mocker.patch("dashgram.client.asyncio.sleep")
+    breaker = CircuitBreaker(failure_threshold=1)
+    breaker.record(httpx.ConnectError("reset"))
+    sdk = Dashgram(project_id="test_project", access_key="test_key", circuit_breaker=breaker)
+    sdk._client = mock_httpx_client
+
+    assert await sdk._send_batch([sample_event_dict]) == BatchResult([sample_event_dict], [])
+
+    mock_httpx_client.post.assert_not_awaited()
+    mock_sleep.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_async_context_manager_sends_queued_events(mock_httpx_client, sample_api_success_response,
+                                                        sample_event_dict, posted_json):
+    """Test that leaving the async context sends queued events and closes the HTTP client"""
+    mock_httpx_client.post.side_effect = None
+    mock_httpx_client.post.return_value = sample_api_success_response
+
+    async with Dashgram(project_id="test_project", access_key="test_key", origin="Python + Dashgram SDK",
+                        max_batch_delay_ms=60000) as sdk:
+        sdk._client = mock_httpx_client
+        sdk.track_event_nowait(sample_event_dict)
+
+    assert posted_json() == [("track", {"origin": "Python + Dashgram SDK", "updates": [sample_event_dict]})]
+    mock_httpx_client.aclose.assert_awaited_once()
+    assert sdk.closed
+    assert await sdk.aclose() == 0
+
+
+@pytest.mark.asyncio
+async def test_aclose_reports_undelivered_events(mock_httpx_client, sample_event_dict, mocker):
+    """Test that aclose() gives up after the timeout and reports the events not sent"""
+    mock_warn = mocker.patch("dashgram.client.warnings.warn")
+    sdk = Dashgram(project_id="test_project", access_key="test_key", max_batch_delay_ms=0)
+    sdk._client = mock_httpx_client
+
+    async def slow_post(*args, **kwargs):
+        await asyncio.sleep(10)
+
+    mock_httpx_client.post.side_effect = slow_post
+    sdk.track_event_nowait(sample_event_dict)
+    sdk.track_event_nowait(sample_event_dict)
+
+    assert await sdk.aclose(timeout=0.05) == 2
+    mock_warn.assert_called_once_with("Dashgram closed with 2 events not sent")
+    assert sdk.track_event_nowait(sample_event_dict) is False
+
+
+@pytest.mark.asyncio
+async def test_flush_from_another_loop_waits_for_sender_thread(mock_httpx_client, sample_api_success_response,
+                                                              sample_event_dict, posted_json):
+    """Test flush() awaited in an application loop waits for the sender running on the loop thread"""
+    sdk = Dashgram(project_id="test_project", access_key="test_key", origin="Python + Dashgram SDK",
+                   max_batch_delay_ms=60000)
+    mock_httpx_client.post.side_effect = None
+    mock_httpx_client.post.return_value = sample_api_success_response
+    sdk._client = mock_httpx_client
+    sdk.start_sender_thread()
+
+    sdk.track_event_nowait(sample_event_dict)
+    started = asyncio.get_running_loop().time()
+    await asyncio.wait_for(sdk.flush(), 2)
+
+    assert asyncio.get_running_loop().time() - started < 1
+    assert posted_json() == [("track", {"origin": "Python + Dashgram SDK", "updates": [sample_event_dict]})]
+    await sdk.aclose()
+
+
+def test_sync_context_manager_stops_sender_thread(mock_httpx_client, sample_api_success_response,
+                                                  sample_event_dict, posted_json):
+    """Test that leaving the sync context sends the events queued for the sender thread"""
+    mock_httpx_client.post.side_effect = None
+    mock_httpx_client.post.return_value = sample_api_success_response
+
+    with Dashgram(project_id="test_project", access_key="test_key", origin="Python + Dashgram SDK") as sdk:
+        sdk._client = mock_httpx_client
+        sdk.track_event_nowait(sample_event_dict)
+
+    assert posted_json() == [("track", {"origin": "Python + Dashgram SDK", "updates": [sample_event_dict]})]
+    mock_httpx_client.aclose.assert_awaited_once()
+    assert not sdk._sender.running
+
+
+@pytest.mark.asyncio
+async def test_close_in_event_loop_raises():
+    """Test that the sync close() refuses to block a running event loop"""
+    sdk = Dashgram(project_id="test_project", access_key="test_key")
+
+    with pytest.raises(RuntimeError):
+        sdk.close()
+
+    await sdk.aclose()
+
+
+def test_close_on_exit(mocker):
+    """Test that close_on_exit registers an atexit hook and a chaining SIGTERM handler"""
+    mock_register = mocker.patch("dashgram.client.atexit.register")
+    mock_signal = mocker.patch("dashgram.client.signal.signal")
+    previous = Mock()
+    mocker.patch("dashgram.client.signal.getsignal", return_value=previous)
+    sdk = Dashgram(project_id="test_project", access_key="test_key")
+    mock_close = mocker.patch.object(sdk, "close")
+
+    sdk.close_on_exit(timeout=3)
+
+    mock_register.assert_called_once_with(sdk._close_at_exit, 3)
+    handler = mock_signal.call_args.args[1]
+    handler(15, None)
+    mock_close.assert_called_once_with(3)
+    previous.assert_called_once_with(15, None)
+
+
+@pytest.mark.asyncio
+async def test_track_event_with_compression(mock_httpx_client, sample_event_dict):
+    """Test track_event sends gzip-compressed body with Content-Encoding header"""
+    sdk = Dashgram(project_id="test_project", access_key="test_key", origin="Python + Dashgram SDK",
+                   compression="gzip", compression_min_size=0)
+    sdk._client = mock_httpx_client
+
+    assert await sdk.track_event(sample_event_dict) is True
+
+    call = mock_httpx_client.post.await_args
+    assert call.args == ("track",)
+    assert call.kwargs["headers"] == {"Content-Type": "application/json", "Content-Encoding": "gzip"}
+    assert json.loads(gzip.decompress(call.kwargs["content"])) == {
+        "origin": "Python + Dashgram SDK",
+        "updates": [sample_event_dict],
+    }
+
+
+@pytest.mark.asyncio
+async def test_track_event_with_compression_below_min_size(mock_httpx_client, sample_event_dict):
+    """Test small bodies are sent uncompressed without Content-Encoding"""
+    sdk = Dashgram(project_id="test_project", access_key="test_key", origin="Python + Dashgram SDK",
+                   compression="gzip", compression_min_size=1024 * 1024)
+    sdk._client = mock_httpx_client
+
+    assert await sdk.track_event(sample_event_dict) is True
+
+    call = mock_httpx_client.post.await_args
+    assert call.kwargs["headers"] == {"Content-Type": "application/json"}
+    assert json.loads(call.kwargs["content"]) == {"origin": "Python + Dashgram SDK", "updates": [sample_event_dict]}
+
+
+@pytest.mark.asyncio
+async def test_invited_by(mock_httpx_client, dashgram_client, posted_json):
     """Test invited_by with successful API response"""
     res = await dashgram_client.invited_by(user_id=123, invited_by=456)
     assert res is True
     
-    mock_httpx_client.post.assert_awaited_once_with(
+    assert posted_json() == [(
         "invited_by",
-        json={"user_id": 123, "invited_by": 456, "origin": "Python + Dashgram SDK"},
-    )
+        {"user_id": 123, "invited_by": 456, "origin": "Python + Dashgram SDK"},
+    )]
 
 
 @pytest.mark.asyncio
-async def test_payment(mock_httpx_client, dashgram_client):
+async def test_payment(mock_httpx_client, dashgram_client, posted_json):
     """Test payment with successful API response"""
     res = await dashgram_client.payment(
         user_id=123456,
@@ -137,9 +584,9 @@ async def test_payment(mock_httpx_client, dashgram_client):
     )
     assert res is True
 
-    mock_httpx_client.post.assert_awaited_once_with(
+    assert posted_json() == [(
         "payment",
-        json={
+        {
             "user_id": 123456,
             "payment_id": "unique-charge-id",
             "currency": "XTR",
@@ -148,11 +595,11 @@ async def test_payment(mock_httpx_client, dashgram_client):
             "event_time": 1700000000,
             "origin": "Python + Dashgram SDK",
         },
-    )
+    )]
 
 
 @pytest.mark.asyncio
-async def test_payment_omits_optional_fields(mock_httpx_client, dashgram_client):
+async def test_payment_omits_optional_fields(mock_httpx_client, dashgram_client, posted_json):
     """Test payment omits optional fields when not provided"""
     res = await dashgram_client.payment(
         user_id=123456,
@@ -162,20 +609,20 @@ async def test_payment_omits_optional_fields(mock_httpx_client, dashgram_client)
     )
     assert res is True
 
-    mock_httpx_client.post.assert_awaited_once_with(
+    assert posted_json() == [(
         "payment",
-        json={
+        {
             "user_id": 123456,
             "payment_id": "unique-charge-id",
             "currency": "TON",
             "amount": 1.5,
             "origin": "Python + Dashgram SDK",
         },
-    )
+    )]
 
 
 @pytest.mark.asyncio
-async def test_refund_payment(mock_httpx_client, dashgram_client):
+async def test_refund_payment(mock_httpx_client, dashgram_client, posted_json):
     """Test refund_payment with successful API response"""
     res = await dashgram_client.refund_payment(
         payment_id="unique-charge-id",
@@ -186,9 +633,9 @@ async def test_refund_payment(mock_httpx_client, dashgram_client):
     )
     assert res is True
 
-    mock_httpx_client.post.assert_awaited_once_with(
+    assert posted_json() == [(
         "payment/refund",
-        json={
+        {
             "payment_id": "unique-charge-id",
             "currency": "stars",
             "amount": 100.0,
@@ -196,11 +643,11 @@ async def test_refund_payment(mock_httpx_client, dashgram_client):
             "event_time": 1700000000,
             "origin": "Python + Dashgram SDK",
         },
-    )
+    )]
 
 
 @pytest.mark.asyncio
-async def test_refund_payment_omits_optional_fields(mock_httpx_client, dashgram_client):
+async def test_refund_payment_omits_optional_fields(mock_httpx_client, dashgram_client, posted_json):
     """Test refund_payment omits optional fields when not provided"""
     res = await dashgram_client.refund_payment(
         payment_id="unique-charge-id",
@@ -209,15 +656,15 @@ async def test_refund_payment_omits_optional_fields(mock_httpx_client, dashgram_
     )
     assert res is True
 
-    mock_httpx_client.post.assert_awaited_once_with(
+    assert posted_json() == [(
         "payment/refund",
-        json={
+        {
             "payment_id": "unique-charge-id",
             "currency": "USD",
             "amount": 0.99,
             "origin": "Python + Dashgram SDK",
         },
-    )
+    )]
 
 
 @pytest.mark.asyncio
@@ -240,6 +687,186 @@ async def test_payment_unsupported_currency_error(dashgram_client):
     assert exc_info.value.details == "Unsupported currency"
 
 
+@pytest.mark.asyncio
+async def test_payments_bounded_concurrency(mock_httpx_client, sample_api_success_response, posted_json):
+    """Test payments sends items concurrently up to the limit and returns per-item results"""
+    sdk = Dashgram(project_id="test_project", access_key="test_key", origin="Python + Dashgram SDK", retry=None)
+    sdk._client = mock_httpx_client
+    in_flight = max_in_flight = 0
+
+    async def post(url, content, headers):
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        if json.loads(content)["payment_id"] == "p3":
+            return httpx.Response(status_code=400, json={"status": "error", "details": "Unsupported currency"})
+        return sample_api_success_response
+
+    mock_httpx_client.post.side_effect = post
+    items = [{"user_id": i, "payment_id": f"p{i}", "currency": "XTR", "amount": 10} for i in range(10)]
+
+    results = await sdk.payments(iter(items), concurrency=3, suppress_exceptions=False)
+
+    assert max_in_flight == 3
+    assert results[:3] == [True] * 3 and results[4:] == [True] * 6
+    assert isinstance(results[3], DashgramApiError)
+    assert sorted(payload["payment_id"] for _, payload in posted_json()) == sorted(f"p{i}" for i in range(10))
+
+
+@pytest.mark.asyncio
+async def test_bulk_methods_suppress_exceptions(mock_httpx_client, sample_api_success_response,
+                                                sample_api_error_response_400, posted_json, mocker):
+    """Test failed items of bulk methods are reported as False when exceptions are suppressed"""
+    mocker.patch("dashgram.client.warnings.warn")
+    sdk = Dashgram(project_id="test_project", access_key="test_key", origin="Python + Dashgram SDK", retry=None)
+    sdk._client = mock_httpx_client
+    mock_httpx_client.post.side_effect = [sample_api_success_response, sample_api_error_response_400,
+                                          sample_api_success_response]
+
+    assert await sdk.invited_by_many([{"user_id": 1, "invited_by": 2}, {"user_id": 3, "invited_by": 2}],
+                                     concurrency=1) == [True, False]
+    assert await sdk.refund_payments([{"payment_id": "p1", "currency": "XTR", "amount": 5}]) == [True]
+    assert posted_json()[2] == (
+        "payment/refund",
+        {"payment_id": "p1", "currency": "XTR", "amount": 5, "origin": "Python + Dashgram SDK"},
+    )
+
+    with pytest.raises(TypeError):
+        await sdk.payments([{"user_id": 1}])
+
+
+@pytest.mark.asyncio
+async def test_nowait_requests_share_background_batches(mock_httpx_client, sample_api_success_response,
+                                                        sample_event_dict, posted_json):
+    """Test payments, refunds and referrals queued in the background are sent with track batches"""
+    sdk = Dashgram(project_id="test_project", access_key="test_key", origin="Python + Dashgram SDK",
+                   max_batch_delay_ms=10)
+    mock_httpx_client.post.side_effect = None
+    mock_httpx_client.post.return_value = sample_api_success_response
+    sdk._client = mock_httpx_client
+
+    assert sdk.track_event_nowait(sample_event_dict) is True
+    assert sdk.payment_nowait(user_id=1, payment_id="p1", currency="XTR", amount=10) is True
+    assert sdk.refund_payment_nowait(payment_id="p1", currency="XTR", amount=10) is True
+    assert sdk.invited_by_nowait(user_id=1, invited_by=2) is True
+    await sdk.flush()
+
+    assert sorted(posted_json(), key=lambda request: request[0]) == [
+        ("invited_by", {"user_id": 1, "invited_by": 2, "origin": "Python + Dashgram SDK"}),
+        ("payment", {"user_id": 1, "payment_id": "p1", "currency": "XTR", "amount": 10,
+                     "origin": "Python + Dashgram SDK"}),
+        ("payment/refund", {"payment_id": "p1", "currency": "XTR", "amount": 10, "origin": "Python + Dashgram SDK"}),
+        ("track", {"origin": "Python + Dashgram SDK", "updates": [sample_event_dict]}),
+    ]
+    assert sdk.sender_stats()["sent"] == 4
+
+    await sdk.aclose()
+
+
+@pytest.mark.asyncio
+async def test_background_batches_resend_only_undelivered_requests(mock_httpx_client, sample_api_success_response,
+                                                                   sample_event_dict, tmp_path, mocker):
+    """Test only the failed requests of a mixed background batch are spooled and sent again"""
+    mocker.patch("dashgram.client.warnings.warn")
+    sdk = Dashgram(project_id="test_project", access_key="test_key", retry=None, spool=tmp_path,
+                   max_batch_delay_ms=10)
+    sdk._sender.drain_interval = 0.01
+    mock_httpx_client.post.side_effect = [
+        httpx.Response(status_code=503, json={"status": "error"}),
+        sample_api_success_response,
+        sample_api_success_response,
+        httpx.Response(status_code=503, json={"status": "error"}),
+        sample_api_success_response,
+    ]
+    sdk._client = mock_httpx_client
+
+    sdk.track_event_nowait(sample_event_dict)
+    sdk.payment_nowait(user_id=1, payment_id="p1", currency="XTR", amount=10)
+    sdk.invited_by_nowait(user_id=1, invited_by=2)
+    await sdk.flush()
+    for _ in range(100):
+        if mock_httpx_client.post.await_count == 5:
+            break
+        await asyncio.sleep(0.01)
+
+    urls = [call.args[0] for call in mock_httpx_client.post.await_args_list]
+    assert sorted(urls[:3]) == ["invited_by", "payment", "track"]
+    assert urls[3:] == ["track", "track"]
+    assert sdk.sender_stats()["sent"] == 3
+    assert sdk.sender_stats()["spooled"] == 1
+
+    await sdk.aclose()
+
+
+@pytest.mark.asyncio
+async def test_rate_limit_caps_concurrent_requests(mock_httpx_client, sample_api_success_response, sample_event_dict):
+    """Test requests to an endpoint wait for a slot when max_in_flight requests are in flight"""
+    sdk = Dashgram(project_id="test_project", access_key="test_key",
+                   rate_limits={"track": RateLimit(max_in_flight=2)})
+    sdk._client = mock_httpx_client
+    in_flight = max_in_flight = 0
+
+    async def post(url, content, headers):
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return sample_api_success_response
+
+    mock_httpx_client.post.side_effect = post
+
+    results = await asyncio.gather(*(sdk.track_event(sample_event_dict, suppress_exceptions=False) for _ in range(6)))
+
+    assert results == [True] * 6
+    assert max_in_flight == 2
+    assert sdk.rate_limits["track"].throttled == 4
+
+
+@pytest.mark.asyncio
+async def test_rate_limited_track_event_is_queued(mock_httpx_client, sample_api_success_response, sample_event_dict,
+                                                  posted_json):
+    """Test track_event queues events in the background while the track limit is saturated"""
+    sdk = Dashgram(project_id="test_project", access_key="test_key", origin="Python + Dashgram SDK",
+                   max_batch_delay_ms=10, rate_limits=RateLimit(max_in_flight=1))
+    sdk._client = mock_httpx_client
+    release = asyncio.Event()
+
+    async def post(url, content, headers):
+        await release.wait()
+        return sample_api_success_response
+
+    mock_httpx_client.post.side_effect = post
+
+    first = asyncio.ensure_future(sdk.track_event(sample_event_dict))
+    await asyncio.sleep(0)
+    assert await sdk.track_event({"update_id": 2}) is True
+    assert await sdk.track_event({"update_id": 3}) is True
+    assert mock_httpx_client.post.await_count == 1
+
+    release.set()
+    assert await first is True
+    await sdk.flush()
+
+    assert posted_json()[1] == (
+        "track", {"origin": "Python + Dashgram SDK", "updates": [{"update_id": 2}, {"update_id": 3}]},
+    )
+    await sdk.aclose()
+
+
+def test_sender_stats_report_adaptive_batching():
+    """Test sender_stats exposes the current values of the adaptive controller"""
+    adaptive = AdaptiveBatching(min_batch_size=20, max_in_flight=4)
+    sdk = Dashgram(project_id="test_project", access_key="test_key", adaptive_batching=adaptive)
+    adaptive.record(0.1, delivered=True, full=True)
+
+    stats = sdk.sender_stats()
+    assert (stats["batch_size"], stats["max_in_flight"], stats["in_flight"]) == (40, 1, 0)
+    assert Dashgram(project_id="test_project", access_key="test_key").sender_stats()["batch_size"] == 100
+
+
 def test_client_bind_aiogram(dashgram_client, mocker):
     """Test client bind_aiogram function"""
     mock_bind = mocker.patch("dashgram.client.aiogram.bind")
@@ -247,7 +874,11 @@ def test_client_bind_aiogram(dashgram_client, mocker):
     
     dashgram_client.bind_aiogram(mock_dp)
     
-    mock_bind.assert_called_once_with(dashgram_client, mock_dp)
+    mock_bind.assert_called_once_with(dashgram_client, mock_dp, False)
+
+    dashgram_client.bind_aiogram(mock_dp, background=True)
+
+    mock_bind.assert_called_with(dashgram_client, mock_dp, True)
 
 
 def test_client_bind_telegram(dashgram_client, mocker):
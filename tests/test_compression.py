@@ -0,0 +1,54 @@
+import pytest
+import gzip
+
+from dashgram.compression import Compressor, zstd_available
+
+
+def test_compressor_gzip():
+    """Test gzip compression of a large body"""
+    body = b'{"update_id": 1, "message": {"text": "hello"}}' * 100
+    compressor = Compressor("gzip", min_size=1024)
+
+    compressed, content_encoding = compressor.compress(body)
+
+    assert content_encoding == "gzip"
+    assert len(compressed) < len(body)
+    assert gzip.decompress(compressed) == body
+
+
+def test_compressor_skips_small_bodies():
+    """Test bodies below min_size are sent uncompressed"""
+    body = b'{"update_id": 1}'
+    compressor = Compressor("gzip", min_size=1024)
+
+    assert compressor.compress(body) == (body, None)
+
+
+def test_compressor_zstd():
+    """Test zstd compression of a large body"""
+    zstandard = pytest.importorskip("zstandard")
+    body = b'{"update_id": 1, "message": {"text": "hello"}}' * 100
+    compressor = Compressor("zstd", min_size=0)
+
+    compressed, content_encoding = compressor.compress(body)
+
+    assert content_encoding == "zstd"
+    assert zstandard.ZstdDecompressor().decompress(compressed) == body
+
+
+def test_compressor_auto(mocker):
+    """Test auto picks zstd when installed and gzip otherwise"""
+    assert Compressor("auto").encoding == ("zstd" if zstd_available() else "gzip")
+
+    mocker.patch("dashgram.compression.zstandard", None)
+    assert Compressor("auto").encoding == "gzip"
+
+
+def test_compressor_errors(mocker):
+    """Test unsupported and unavailable encodings are rejected"""
+    with pytest.raises(ValueError):
+        Compressor("brotli")
+
+    mocker.patch("dashgram.compression.zstandard", None)
+    with pytest.raises(ImportError):
+        Compressor("zstd")
@@ -0,0 +1,49 @@
+from dashgram.dedup import Deduplicator, get_update_id
+from dashgram.enums import HandlerType
+
+
+def test_get_update_id(sample_event_dict, sample_aiogram_message):
+    """Test that update ids are read from dictionaries, objects and raw JSON"""
+    assert get_update_id(sample_event_dict) == 123456
+    assert get_update_id(b' {"update_id": 42, "message": {}}') == 42
+    assert get_update_id(b'{"message": {}, "update_id": 42}') is None
+    assert get_update_id({"update_id": -1, "message": {}}) is None
+    assert get_update_id({"text": "hi"}, HandlerType.MESSAGE) is None
+    assert get_update_id(sample_aiogram_message) is None
+
+
+def test_deduplicator_detects_duplicates(sample_event_dict):
+    """Test that an update is a duplicate only after it was seen"""
+    dedup = Deduplicator()
+
+    assert dedup.is_duplicate(sample_event_dict) is False
+    assert dedup.is_duplicate(b'{"update_id":123456}') is True
+    assert dedup.is_duplicate({"update_id": 1}) is False
+    assert dedup.is_duplicate({"update_id": -1}) is False
+    assert dedup.is_duplicate({"update_id": -1}) is False
+    assert dedup.duplicates == 1
+
+
+def test_deduplicator_forgets_after_window(mocker):
+    """Test that ids are forgotten once the window has passed"""
+    mock_time = mocker.patch("dashgram.dedup.time.monotonic", return_value=0.0)
+    dedup = Deduplicator(window=10)
+
+    assert dedup.is_duplicate({"update_id": 1}) is False
+    mock_time.return_value = 5.0
+    assert dedup.is_duplicate({"update_id": 1}) is True
+    mock_time.return_value = 11.0
+    assert dedup.is_duplicate({"update_id": 1}) is False
+    assert len(dedup) == 1
+
+
+def test_deduplicator_is_bounded():
+    """Test that the oldest ids are evicted beyond max_size"""
+    dedup = Deduplicator(max_size=3)
+
+    for update_id in range(5):
+        dedup.is_duplicate({"update_id": update_id})
+
+    assert len(dedup) == 3
+    assert dedup.is_duplicate({"update_id": 4}) is True
+    assert dedup.is_duplicate({"update_id": 0}) is False
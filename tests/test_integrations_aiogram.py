@@ -1,7 +1,10 @@
 import pytest
 from unittest.mock import Mock, AsyncMock
 
-from dashgram.integrations.aiogram import object_to_dict, rename_key, bind
+import json
+
+from dashgram.integrations.aiogram import object_to_dict, object_to_json, rename_key, bind
+from dashgram import Dashgram
 from dashgram.enums import HandlerType
 
 import aiogram
@@ -51,6 +54,40 @@ def test_object_to_dict_import_error(mocker, sample_aiogram_message):
         object_to_dict(sample_aiogram_message)
 
 
+def test_object_to_dict_renames_aliases_inside_lists():
+    """Test aliased fields are renamed at any depth, including dicts inside lists"""
+    update = aiogram.types.Update.model_validate({
+        "update_id": 1,
+        "message": {
+            "message_id": 1,
+            "date": 1640995200,
+            "chat": {"id": 456, "type": "private"},
+            "from": {"id": 123, "first_name": "Test", "is_bot": False},
+            "text": "hi @test",
+            "entities": [{"type": "text_mention", "offset": 3, "length": 5,
+                          "user": {"id": 7, "first_name": "Mentioned", "is_bot": False}}],
+            "link_preview_options": {"url": "https://example.com"},
+        },
+    })
+    result = object_to_dict(update)
+
+    assert result["message"]["entities"][0]["user"] == {"id": 7, "first_name": "Mentioned", "is_bot": False}
+    assert "from_user" not in json.dumps(result)
+    # Bot-level defaults left unset are not sent
+    assert result["message"]["link_preview_options"] == {"url": "https://example.com"}
+
+
+def test_object_to_json(sample_aiogram_message, sample_message_dict):
+    """Test objects are encoded to the same update as object_to_dict"""
+    result = object_to_json(sample_aiogram_message, HandlerType.MESSAGE)
+
+    assert isinstance(result, bytes)
+    assert json.loads(result) == {"update_id": -1, "message": sample_message_dict}
+    assert json.loads(result) == object_to_dict(sample_aiogram_message, HandlerType.MESSAGE)
+    with pytest.raises(TypeError):
+        object_to_json(sample_aiogram_message)
+
+
 def test_rename_key_basic_functionality():
     """Test basic rename_key functionality"""
     test_dict = {"old_key": "value1", "other_key": "value2"}
@@ -82,6 +119,24 @@ def test_bind_function(dashgram_client, mocker):
     mock_register.assert_called_once()
 
 
+@pytest.mark.asyncio
+async def test_bind_captures_raw_updates(mock_httpx_client, sample_api_success_response, sample_message_dict, posted_json):
+    """Test updates fed as dictionaries are captured and sent without conversion"""
+    mock_httpx_client.post.side_effect = None
+    mock_httpx_client.post.return_value = sample_api_success_response
+    sdk = Dashgram(project_id="test_project", access_key="test_key", raw_updates=True)
+    sdk._client = mock_httpx_client
+    dp = aiogram.Dispatcher()
+    bind(sdk, dp)
+
+    update = {"update_id": 5, "message": sample_message_dict}
+    await dp.feed_raw_update(Mock(), update)
+    await dp.feed_webhook_update(Mock(), {"update_id": 6, "message": sample_message_dict})
+
+    assert sdk.raw_updates.hits == 2
+    assert [body["updates"] for _, body in posted_json()] == [[update], [{"update_id": 6, "message": sample_message_dict}]]
+
+
 def test_bind_function_import_error(mocker):
     """Test bind function when aiogram is not installed"""
     mocker.patch("dashgram.integrations.aiogram.aiogram", False)
@@ -115,16 +170,62 @@ async def test_full_aiogram_integration_workflow(dashgram_client, sample_aiogram
     
     
 @pytest.mark.asyncio
-async def test_aiogram_track_update(dashgram_client, sample_aiogram_message, sample_message_dict, mock_httpx_client):
+async def test_full_aiogram_background_integration_workflow(dashgram_client, sample_aiogram_message):
+    """Test that background mode queues the update and runs the handler without awaiting tracking"""
+    dashgram_client.track_event = AsyncMock()
+    dashgram_client.track_event_nowait = Mock(return_value=True)
+    mock_handler = AsyncMock()
+
+    dp = aiogram.Dispatcher()
+
+    @dp.message()
+    async def message_handler(message: aiogram.types.Message):
+        await mock_handler(message)
+
+    bind(dashgram_client, dp, background=True)
+
+    update = aiogram.types.Update(update_id=1, message=sample_aiogram_message)
+
+    await dp.feed_update(Mock(), update)
+
+    dashgram_client.track_event.assert_not_awaited()
+    dashgram_client.track_event_nowait.assert_called_once()
+    assert dashgram_client.track_event_nowait.call_args[0][0].model_dump() == update.model_dump()
+    mock_handler.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_aiogram_background_tracking_errors_do_not_block_handler(dashgram_client, sample_aiogram_message, mocker):
+    """Test that tracking errors in background mode are reported and the handler still runs"""
+    mock_warn = mocker.patch("dashgram.integrations.aiogram.warnings.warn")
+    dashgram_client.track_event_nowait = Mock(side_effect=TypeError("boom"))
+    mock_handler = AsyncMock()
+
+    dp = aiogram.Dispatcher()
+
+    @dp.message()
+    async def message_handler(message: aiogram.types.Message):
+        await mock_handler(message)
+
+    bind(dashgram_client, dp, background=True)
+
+    await dp.feed_update(Mock(), aiogram.types.Update(update_id=1, message=sample_aiogram_message))
+
+    mock_warn.assert_called_once_with("TypeError: boom")
+    mock_handler.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_aiogram_track_update(dashgram_client, sample_aiogram_message, sample_message_dict, mock_httpx_client, posted_json):
     """Test aiogram track_event"""
     update = aiogram.types.Update(update_id=1, message=sample_aiogram_message)
     
     res = await dashgram_client.track_event(update)
     assert res is True
     
-    mock_httpx_client.post.assert_awaited_once_with(
+    assert posted_json() == [(
         "track",
-        json={
+        {
             "origin": "Python + Dashgram SDK",
             "updates": [
                 {
@@ -133,18 +234,18 @@ async def test_aiogram_track_update(dashgram_client, sample_aiogram_message, sam
                 }
             ],
         },
-    )
+    )]
     
     
 @pytest.mark.asyncio
-async def test_aiogram_track_handler(dashgram_client, sample_aiogram_message, sample_message_dict, mock_httpx_client):
+async def test_aiogram_track_handler(dashgram_client, sample_aiogram_message, sample_message_dict, mock_httpx_client, posted_json):
     """Test aiogram track_event"""
     res = await dashgram_client.track_event(sample_aiogram_message, HandlerType.MESSAGE)
     assert res is True
     
-    mock_httpx_client.post.assert_awaited_once_with(
+    assert posted_json() == [(
         "track",
-        json={
+        {
             "origin": "Python + Dashgram SDK",
             "updates": [
                 {
@@ -153,4 +254,4 @@ async def test_aiogram_track_handler(dashgram_client, sample_aiogram_message, sa
                 }
             ],
         },
-    )
+    )]
@@ -1,7 +1,7 @@
 import pytest
 from unittest.mock import Mock, patch
 from dashgram.integrations.base import (
-    get_package, determine_object_source, object_to_dict, resolve_framework
+    get_package, determine_object_source, object_to_dict, object_to_json, register_converter, resolve_framework
 )
 from dashgram.integrations import aiogram, telebot, telegram
 from dashgram.enums import HandlerType
@@ -75,6 +75,51 @@ def test_object_to_dict_with_unknown():
     """Test object_to_dict with unknown object"""
     
     assert object_to_dict(Mock(), HandlerType.MESSAGE) == {}
+
+
+@pytest.fixture
+def converter_registry(mocker):
+    """Isolate converters registered by a test"""
+    mocker.patch.dict("dashgram.integrations.base._REGISTERED", clear=True)
+    mocker.patch.dict("dashgram.integrations.base._CONVERTERS", clear=True)
+
+
+class TrackedUpdate:
+    def __init__(self, update):
+        self.update = update
+
+
+class TimedUpdate(TrackedUpdate):
+    pass
+
+
+def test_register_converter(converter_registry, sample_event_dict, sample_aiogram_message):
+    """Test registered converters apply to the class and its subclasses and take precedence"""
+    register_converter(TrackedUpdate, lambda obj, handler_type: obj.update)
+
+    assert object_to_dict(TrackedUpdate(sample_event_dict)) == sample_event_dict
+    assert object_to_dict(TimedUpdate(sample_event_dict)) == sample_event_dict
+    assert object_to_json(TrackedUpdate(sample_event_dict)) is None
+
+    register_converter(type(sample_aiogram_message), lambda obj, handler_type: {"update_id": -1},
+                       lambda obj, handler_type: b'{"update_id":-1}')
+    assert object_to_dict(sample_aiogram_message) == {"update_id": -1}
+    assert object_to_json(sample_aiogram_message) == b'{"update_id":-1}'
+
+
+def test_converters_resolved_once_per_class(converter_registry, sample_telegram_message, mocker):
+    """Test the converter of a class is cached after the first lookup"""
+    assert determine_object_source(sample_telegram_message) == telegram.object_to_dict
+
+    mocker.patch("dashgram.integrations.base._MAPPING", {})
+    assert determine_object_source(sample_telegram_message) == telegram.object_to_dict
+
+
+def test_object_to_json_only_for_supported_frameworks(sample_aiogram_message, sample_telegram_message):
+    """Test object_to_json encodes aiogram objects and leaves other frameworks to object_to_dict"""
+    assert object_to_json(sample_aiogram_message, HandlerType.MESSAGE).startswith(b'{"update_id":-1,"message":')
+    assert object_to_json(sample_telegram_message, HandlerType.MESSAGE) is None
+    assert object_to_json(Mock(), HandlerType.MESSAGE) is None
     
     
 @patch('dashgram.integrations.aiogram.aiogram', True)
@@ -26,6 +26,14 @@ def test_object_to_dict_with_update_object(sample_message_dict, sample_telebot_u
     }
 
 
+def test_object_to_dict_finds_update_type(sample_message_dict):
+    """Test object_to_dict finds the payload of any update type"""
+    callback_query = {"id": "1", "from": sample_message_dict["from"], "chat_instance": "2", "data": "buy"}
+    update = telebot.types.Update.de_json({"update_id": 2, "callback_query": callback_query})
+
+    assert object_to_dict(update) == {"update_id": 2, "callback_query": callback_query}
+
+
 def test_object_to_dict_with_message_object(sample_telebot_message):
     """Test object_to_dict with telebot Message object"""
     result = object_to_dict(sample_telebot_message, HandlerType.MESSAGE)
@@ -87,17 +95,69 @@ def test_bind_function_import_error(mocker):
         bind(Mock(), Mock())
 
 
+def test_bind_function_sync_starts_sender_thread(dashgram_client):
+    """Test bind starts the sender thread and stops the sender with polling"""
+    bot = telebot.TeleBot("test_token", use_class_middlewares=True, validate_token=False, threaded=False)
+
+    bind(dashgram_client, bot)
+
+    sender_thread = dashgram_client._sender_thread
+    assert sender_thread is not None and sender_thread.running
+    assert dashgram_client._sender.running
+
+    bot.stop_polling()
+
+    assert dashgram_client._sender_thread is None
+    assert not dashgram_client._sender.running
+
+
 def test_track_middleware_sync(dashgram_client, sample_telebot_message):
     """Test sync TrackMiddleware"""
-    dashgram_client.track_event = Mock()
+    dashgram_client.track_event_nowait = Mock()
     
     middleware = TrackMiddleware(dashgram_client)
     
     # Test post_process_message
     middleware.post_process_message(sample_telebot_message, {}, None)
     
-    # Verify track_event was called with correct parameters
-    dashgram_client.track_event.assert_called_once_with(sample_telebot_message, HandlerType.MESSAGE)
+    # Verify track_event_nowait was called with correct parameters
+    dashgram_client.track_event_nowait.assert_called_once_with(sample_telebot_message, HandlerType.MESSAGE)
+
+
+def test_track_middleware_sync_reports_errors(dashgram_client, sample_telebot_message, mocker):
+    """Test sync TrackMiddleware reports tracking errors as warnings"""
+    mock_warn = mocker.patch("dashgram.integrations.telebot.warnings.warn")
+    dashgram_client.track_event_nowait = Mock(side_effect=TypeError("boom"))
+
+    middleware = TrackMiddleware(dashgram_client)
+    middleware.post_process_message(sample_telebot_message, {}, None)
+
+    mock_warn.assert_called_once_with("TypeError: boom")
+
+
+def test_telebot_sync_sender_thread_delivers_events(dashgram_client, sample_telebot_update, sample_message_dict,
+                                                    mock_httpx_client, sample_api_success_response, posted_json):
+    """Test events queued by a sync bot are sent by the sender thread"""
+    mock_httpx_client.post.side_effect = None
+    mock_httpx_client.post.return_value = sample_api_success_response
+
+    bot = telebot.TeleBot("test_token", use_class_middlewares=True, validate_token=False, threaded=False)
+    bind(dashgram_client, bot)
+
+    @bot.message_handler()
+    def message_handler(message):
+        pass
+
+    bot.process_new_updates([sample_telebot_update])
+    bot.stop_polling()
+
+    assert posted_json() == [(
+        "track",
+        {
+            "origin": "Python + Dashgram SDK",
+            "updates": [{"update_id": -1, "message": sample_message_dict}],
+        },
+    )]
 
 
 @pytest.mark.asyncio
@@ -115,7 +175,7 @@ async def test_track_middleware_async(dashgram_client, sample_telebot_message):
 
 def test_full_telebot_sync_integration_workflow(dashgram_client, sample_telebot_update, sample_telebot_message):
     """Test complete telebot integration workflow"""
-    dashgram_client.track_event = Mock()
+    dashgram_client.track_event_nowait = Mock()
     mock_handler = Mock()
     
     # Create sync bot
@@ -131,7 +191,7 @@ def test_full_telebot_sync_integration_workflow(dashgram_client, sample_telebot_
     
     bot.process_new_updates([sample_telebot_update])
     
-    dashgram_client.track_event.assert_called_once_with(sample_telebot_update.message, HandlerType.MESSAGE)
+    dashgram_client.track_event_nowait.assert_called_once_with(sample_telebot_update.message, HandlerType.MESSAGE)
     
     mock_handler.assert_called_once_with(sample_telebot_update.message)
     
@@ -163,15 +223,15 @@ async def test_full_telebot_async_integration_workflow(dashgram_client, sample_t
 
 
 @pytest.mark.asyncio
-async def test_telebot_track_update(dashgram_client, sample_telebot_message, sample_message_dict, mock_httpx_client, sample_telebot_update):
+async def test_telebot_track_update(dashgram_client, sample_telebot_message, sample_message_dict, mock_httpx_client, sample_telebot_update, posted_json):
     """Test telebot track_event with update"""
     
     res = await dashgram_client.track_event(sample_telebot_update)
     assert res is True
     
-    mock_httpx_client.post.assert_awaited_once_with(
+    assert posted_json() == [(
         "track",
-        json={
+        {
             "origin": "Python + Dashgram SDK",
             "updates": [
                 {
@@ -180,18 +240,18 @@ async def test_telebot_track_update(dashgram_client, sample_telebot_message, sam
                 }
             ],
         },
-    )
+    )]
 
 
 @pytest.mark.asyncio
-async def test_telebot_track_message(dashgram_client, sample_telebot_message, sample_message_dict, mock_httpx_client):
+async def test_telebot_track_message(dashgram_client, sample_telebot_message, sample_message_dict, mock_httpx_client, posted_json):
     """Test telebot track_event with message and handler type"""
     res = await dashgram_client.track_event(sample_telebot_message, HandlerType.MESSAGE)
     assert res is True
     
-    mock_httpx_client.post.assert_awaited_once_with(
+    assert posted_json() == [(
         "track",
-        json={
+        {
             "origin": "Python + Dashgram SDK",
             "updates": [
                 {
@@ -200,4 +260,4 @@ async def test_telebot_track_message(dashgram_client, sample_telebot_message, sa
                 }
             ],
         },
-    )
+    )]
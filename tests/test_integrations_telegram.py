@@ -110,6 +110,56 @@ def test_object_to_dict_with_message_object(sample_telegram_message):
     assert result == sample_telegram_message.to_dict()
 
 
+@pytest.mark.parametrize("payload", [
+    {"message": {"message_id": 1, "date": 1640995200, "chat": {"id": -100, "type": "supergroup", "title": "G"},
+                 "from": {"id": 123, "first_name": "Test", "is_bot": False}, "caption": "album", "media_group_id": "9",
+                 "photo": [{"file_id": "a", "file_unique_id": "b", "width": 1, "height": 1},
+                           {"file_id": "c", "file_unique_id": "d", "width": 2, "height": 2, "file_size": 5}],
+                 "reply_markup": {"inline_keyboard": [[{"text": "a", "url": "https://example.com"}],
+                                                      [{"text": "b", "callback_data": "c"}]]},
+                 "link_preview_options": {"is_disabled": True},
+                 "unknown_field": {"a": 1}}},
+    {"message": {"message_id": 2, "date": 1640995200, "chat": {"id": 456, "type": "private"},
+                 "video": {"file_id": "a", "file_unique_id": "b", "width": 1, "height": 1, "duration": 12}}},
+    {"chat_member": {"chat": {"id": -100, "type": "supergroup"}, "from": {"id": 1, "first_name": "A", "is_bot": False},
+                     "date": 1640995200,
+                     "old_chat_member": {"status": "member", "user": {"id": 2, "first_name": "B", "is_bot": False}},
+                     "new_chat_member": {"status": "kicked", "user": {"id": 2, "first_name": "B", "is_bot": False},
+                                         "until_date": 1700000000}}},
+])
+def test_object_to_dict_matches_to_dict(payload):
+    """Test the fast conversion gives the same result as TelegramObject.to_dict()"""
+    update = telegram.Update.de_json({"update_id": 1, **payload}, None)
+
+    result = object_to_dict(update)
+
+    assert result == update.to_dict()
+    assert list(result) == list(update.to_dict())
+
+
+def test_object_to_dict_with_subclass_attributes(sample_telegram_message):
+    """Test objects with instance attributes fall back to their own to_dict()"""
+    class TrackedUpdate(telegram.Update):
+        pass
+
+    update = TrackedUpdate(update_id=1, message=sample_telegram_message)
+    with update._unfrozen():
+        update.received_at = 1640995200
+
+    assert object_to_dict(update) == update.to_dict()
+    assert object_to_dict(update)["received_at"] == 1640995200
+
+
+def test_object_to_dict_without_private_helpers(mocker, sample_telegram_message):
+    """Test objects are converted with their own to_dict() when the private helpers of the fast path are missing"""
+    mocker.patch("dashgram.integrations.telegram.fast_path", False)
+    mocker.patch.dict("dashgram.integrations.telegram._FIELDS", clear=True)
+    to_dict = mocker.spy(telegram.Message, "to_dict")
+
+    assert object_to_dict(sample_telegram_message) == sample_telegram_message.to_dict()
+    assert to_dict.call_count == 2
+
+
 def test_object_to_dict_import_error(mocker, sample_telegram_message):
     """Test object_to_dict when telegram is not installed"""
     mocker.patch("dashgram.integrations.telegram.telegram", False)
@@ -170,19 +220,19 @@ async def test_full_telegram_integration_workflow(dashgram_client, sample_telegr
 
 
 @pytest.mark.asyncio
-async def test_telegram_track_update(dashgram_client, sample_telegram_message, sample_message_dict, mock_httpx_client):
+async def test_telegram_track_update(dashgram_client, sample_telegram_message, sample_message_dict, mock_httpx_client, posted_json):
     """Test telegram track_event"""
     update = telegram.Update(update_id=1, message=sample_telegram_message)
     
     res = await dashgram_client.track_event(update)
     assert res is True
     
-    mock_httpx_client.post.assert_awaited_once_with(
+    assert posted_json() == [(
         "track",
-        json={
+        {
             "origin": "Python + Dashgram SDK",
             "updates": [
                 {'update_id': 1, 'message': {'channel_chat_created': False, 'delete_chat_photo': False, 'group_chat_created': False, 'supergroup_chat_created': False, 'text': 'Hello, world!', 'chat': {'id': 456, 'type': "private"}, 'date': 1640995200, 'message_id': 1, 'from': {'first_name': 'Test', 'id': 123, 'is_bot': False}}}
             ],
         },
-    )
+    )]
@@ -0,0 +1,92 @@
+import pytest
+
+from dashgram.enums import HandlerType
+from dashgram.projection import Projection, normalize_projections, project_update
+
+
+@pytest.fixture
+def message_payload():
+    return {
+        "message_id": 1,
+        "from": {"id": 123, "first_name": "Test", "is_bot": False},
+        "chat": {"id": 456, "type": "private", "first_name": "Test"},
+        "text": "Hello, world!",
+        "photo": [{"file_id": "a", "width": 90}, {"file_id": "b", "width": 320}],
+        "reply_to_message": {"message_id": 0, "text": "Earlier message", "chat": {"id": 456}},
+        "reply_markup": {"inline_keyboard": [[{"text": "Button", "callback_data": "x"}]]},
+    }
+
+
+def test_projection_include(message_payload):
+    """Test that only included fields are kept"""
+    projection = Projection(include=["message_id", "from.id", "chat", "photo.file_id"])
+
+    assert projection(message_payload) == {
+        "message_id": 1,
+        "from": {"id": 123},
+        "chat": {"id": 456, "type": "private", "first_name": "Test"},
+        "photo": [{"file_id": "a"}, {"file_id": "b"}],
+    }
+
+
+def test_projection_exclude(message_payload):
+    """Test that excluded fields are removed and the payload is not modified"""
+    projection = Projection(exclude=["reply_to_message", "reply_markup", "chat.first_name", "photo"])
+
+    assert projection(message_payload) == {
+        "message_id": 1,
+        "from": {"id": 123, "first_name": "Test", "is_bot": False},
+        "chat": {"id": 456, "type": "private"},
+        "text": "Hello, world!",
+    }
+    assert "reply_markup" in message_payload
+
+
+def test_projection_include_and_exclude(message_payload):
+    """Test that exclusions apply inside included fields"""
+    projection = Projection(include=["chat", "reply_to_message"], exclude=["chat.first_name", "reply_to_message.chat"])
+
+    assert projection(message_payload) == {
+        "chat": {"id": 456, "type": "private"},
+        "reply_to_message": {"message_id": 0, "text": "Earlier message"},
+    }
+
+
+def test_projection_max_text_length(message_payload):
+    """Test that text fields are trimmed at any depth"""
+    projection = Projection(max_text_length=5)
+
+    result = projection(message_payload)
+    assert result["text"] == "Hello"
+    assert result["reply_to_message"]["text"] == "Earli"
+    assert result["reply_markup"]["inline_keyboard"][0][0]["text"] == "Butto"
+
+    assert Projection(include=["text"], max_text_length=2)(message_payload) == {"text": "He"}
+
+
+def test_projection_without_rules_returns_payload(message_payload):
+    """Test that an empty projection does not copy the payload"""
+    assert Projection()(message_payload) is message_payload
+
+
+def test_projection_invalid_arguments():
+    """Test that invalid projections are rejected"""
+    with pytest.raises(ValueError):
+        Projection(include=["chat..id"])
+    with pytest.raises(ValueError):
+        Projection(max_text_length=-1)
+    with pytest.raises(ValueError):
+        normalize_projections({"not_a_type": Projection()})
+
+
+def test_project_update(message_payload):
+    """Test that projections are applied per update type and keep update_id"""
+    projections = normalize_projections({HandlerType.MESSAGE: Projection(include=["message_id"])})
+
+    assert project_update({"update_id": 5, "message": message_payload}, projections) == {
+        "update_id": 5,
+        "message": {"message_id": 1},
+    }
+    poll_update = {"update_id": 6, "poll": {"id": "1"}}
+    assert project_update(poll_update, projections) is poll_update
+    assert project_update(poll_update, Projection(include=["id"])) == poll_update
@@ -0,0 +1,119 @@
+import pytest
+import asyncio
+import concurrent.futures
+
+from dashgram.ratelimit import ConcurrencyLimiter, RateLimit, TokenBucket, normalize_rate_limits
+from dashgram.utils import LoopThread
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_burst_then_rate():
+    """Test the bucket allows a burst and then paces requests at the rate"""
+    bucket = TokenBucket(20, burst=2)
+    loop = asyncio.get_running_loop()
+
+    assert bucket.try_acquire() is True
+    assert bucket.try_acquire() is True
+    assert bucket.try_acquire() is False
+    assert not bucket.available
+
+    started = loop.time()
+    await asyncio.gather(bucket.acquire(), bucket.acquire())
+    assert loop.time() - started >= 0.09
+
+
+def test_token_bucket_validation():
+    """Test invalid rates are rejected"""
+    with pytest.raises(ValueError):
+        TokenBucket(0)
+    with pytest.raises(ValueError):
+        TokenBucket(1, burst=0)
+
+
+@pytest.mark.asyncio
+async def test_concurrency_limiter_caps_in_flight():
+    """Test no more than the limit of holders run at once"""
+    limiter = ConcurrencyLimiter(2)
+    running = max_running = 0
+
+    async def hold():
+        nonlocal running, max_running
+        await limiter.acquire()
+        try:
+            running += 1
+            max_running = max(max_running, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+        finally:
+            limiter.release()
+
+    await asyncio.gather(*(hold() for _ in range(6)))
+
+    assert max_running == 2
+    assert limiter.in_flight == 0 and limiter.waiting == 0
+
+
+@pytest.mark.asyncio
+async def test_concurrency_limiter_cancelled_waiter():
+    """Test a cancelled waiter does not leak a slot"""
+    limiter = ConcurrencyLimiter(1)
+    await limiter.acquire()
+
+    waiter = asyncio.ensure_future(limiter.acquire())
+    await asyncio.sleep(0)
+    assert limiter.waiting == 1
+
+    limiter.release()
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+    await asyncio.sleep(0)
+
+    assert limiter.in_flight == 0
+    assert limiter.available
+
+
+def test_concurrency_limiter_across_loops():
+    """Test a slot released on one loop wakes a waiter of another loop"""
+    limiter = ConcurrencyLimiter(1)
+    loop_thread = LoopThread()
+    loop_thread.start()
+    try:
+        asyncio.run(limiter.acquire())
+        waiter = loop_thread.submit(limiter.acquire())
+        with pytest.raises(concurrent.futures.TimeoutError):
+            waiter.result(timeout=0.05)
+
+        limiter.release()
+        waiter.result(timeout=1)
+        assert limiter.in_flight == 1
+    finally:
+        loop_thread.stop()
+
+
+@pytest.mark.asyncio
+async def test_rate_limit_counts_throttled_requests():
+    """Test saturation and metrics of a rate limit"""
+    limit = RateLimit(max_in_flight=1)
+    async with limit:
+        assert limit.saturated
+        waiter = asyncio.ensure_future(limit.acquire())
+        await asyncio.sleep(0)
+        assert limit.metrics() == {"in_flight": 1, "waiting": 1, "throttled": 1}
+    await waiter
+    limit.release()
+
+    assert not limit.saturated
+    assert not RateLimit().saturated
+
+
+def test_normalize_rate_limits():
+    """Test limits are keyed by endpoint"""
+    shared = RateLimit(10)
+    assert normalize_rate_limits(shared) == {
+        "track": shared, "invited_by": shared, "payment": shared, "payment/refund": shared,
+    }
+    assert normalize_rate_limits({"track": shared}) == {"track": shared}
+
+    with pytest.raises(ValueError):
+        normalize_rate_limits({"refund": shared})
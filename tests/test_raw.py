@@ -0,0 +1,44 @@
+import pytest
+
+import aiogram
+
+from dashgram.enums import HandlerType
+from dashgram.raw import RawUpdates
+
+
+def test_raw_updates_returned_once(sample_aiogram_message):
+    """Test captured updates are returned once for the object with the same update_id"""
+    raw = RawUpdates()
+    body = b'{"update_id":42,"message":{"text":"hi"}}'
+
+    assert raw.add(body.decode()) is True
+    assert raw.add({"update_id": 43, "message": {}}) is True
+    assert raw.add(b'{"message":{}}') is False
+    assert len(raw) == 2
+
+    update = aiogram.types.Update(update_id=42, message=sample_aiogram_message)
+    assert raw.pop(update) == body
+    assert raw.pop(update) is None
+    assert raw.pop(aiogram.types.Update(update_id=43, message=sample_aiogram_message)) == {"update_id": 43, "message": {}}
+    assert raw.pop(sample_aiogram_message, HandlerType.MESSAGE) is None
+    assert (raw.hits, raw.misses) == (2, 1)
+
+
+def test_raw_updates_bounded(mocker):
+    """Test updates expire after max_age and the oldest are evicted beyond max_size"""
+    mock_time = mocker.patch("dashgram.raw.time.monotonic", return_value=0.0)
+    raw = RawUpdates(max_age=10, max_size=2)
+
+    for update_id in range(3):
+        raw.add({"update_id": update_id})
+    assert raw.pop({"update_id": 0}) is None
+    assert len(raw) == 2
+
+    mock_time.return_value = 10.0
+    assert raw.pop({"update_id": 1}) is None
+
+    raw.add({"update_id": 3})
+    assert len(raw) == 1
+
+    with pytest.raises(ValueError):
+        RawUpdates(max_size=0)
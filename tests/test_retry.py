@@ -0,0 +1,55 @@
+import pytest
+import email.utils
+import time
+
+import httpx
+
+from dashgram.retry import RetryPolicy, parse_retry_after
+from dashgram.exceptions import DashgramApiError, InvalidCredentials
+
+
+def test_parse_retry_after():
+    """Test Retry-After values in seconds and as HTTP date"""
+    assert parse_retry_after("120") == 120.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("soon") is None
+
+    delay = parse_retry_after(email.utils.formatdate(time.time() + 30, usegmt=True))
+    assert 28 <= delay <= 30
+
+
+def test_retry_policy_retryable_errors():
+    """Test which failures are retried"""
+    policy = RetryPolicy(max_attempts=3)
+
+    assert policy.should_retry(httpx.ConnectError("reset"), 1)
+    assert policy.should_retry(httpx.ReadTimeout("timeout"), 2)
+    assert policy.should_retry(DashgramApiError(503, "Unavailable"), 1)
+    assert not policy.should_retry(DashgramApiError(503, "Unavailable"), 3)
+    assert not policy.should_retry(DashgramApiError(400, "Invalid request"), 1)
+    assert not policy.should_retry(InvalidCredentials(), 1)
+    assert not policy.should_retry(ValueError("bug"), 1)
+
+
+def test_retry_policy_backoff_with_full_jitter(mocker):
+    """Test exponential backoff is capped and jittered"""
+    mock_uniform = mocker.patch("dashgram.retry.random.uniform", side_effect=lambda a, b: b)
+    policy = RetryPolicy(base_delay=0.5, max_delay=3.0)
+
+    assert [policy.backoff(attempt) for attempt in range(1, 6)] == [0.5, 1.0, 2.0, 3.0, 3.0]
+    mock_uniform.assert_called_with(0, 3.0)
+
+
+def test_retry_policy_honors_retry_after():
+    """Test Retry-After is used for 429/503 and capped"""
+    policy = RetryPolicy(max_retry_after=10.0)
+
+    assert policy.get_delay(DashgramApiError(429, "Too many requests", retry_after=2.0), 1) == 2.0
+    assert policy.get_delay(DashgramApiError(503, "Unavailable", retry_after=600.0), 1) == 10.0
+    assert policy.get_delay(DashgramApiError(502, "Bad gateway", retry_after=2.0), 1) <= policy.base_delay
+
+
+def test_retry_policy_invalid_arguments():
+    """Test max_attempts must be positive"""
+    with pytest.raises(ValueError):
+        RetryPolicy(max_attempts=0)
@@ -0,0 +1,76 @@
+import pytest
+
+from dashgram.enums import HandlerType
+from dashgram.sampling import Sampler, get_chat_id, get_user_id, resolve_update
+
+
+def test_resolve_update():
+    """Test that the update type and payload are found without conversion"""
+    assert resolve_update({"update_id": 1, "poll": {"id": "5"}}) == ("poll", {"id": "5"})
+    assert resolve_update({"text": "hi"}, HandlerType.MESSAGE) == ("message", {"text": "hi"})
+    assert resolve_update(b'{"update_id":1}') == (None, None)
+
+
+def test_get_ids_from_dicts_and_objects(sample_message_dict, sample_aiogram_message, sample_telegram_message,
+                                        sample_telebot_message):
+    """Test that user and chat ids are read from dictionaries and framework objects"""
+    for payload in (sample_message_dict, sample_aiogram_message, sample_telegram_message, sample_telebot_message):
+        assert get_user_id(payload) == 123
+        assert get_chat_id(payload) == 456
+
+    callback_query = {"id": "1", "message": {"chat": {"id": 7}}}
+    assert get_user_id(callback_query) is None
+    assert get_chat_id(callback_query) == 7
+
+
+def test_sampler_keeps_unsampled_types(sample_event_dict):
+    """Test that types without a rate use the default rate"""
+    sampler = Sampler({HandlerType.POLL: 0.0})
+
+    assert sampler.should_track(sample_event_dict) is True
+    assert sampler.should_track({"update_id": 1, "poll": {"id": "1"}}) is False
+    assert sampler.skipped == {"poll": 1}
+
+
+def test_sampler_is_consistent_per_user():
+    """Test that a user is either kept or dropped for all of their events"""
+    sampler = Sampler({HandlerType.MESSAGE: 0.3, HandlerType.CALLBACK_QUERY: 0.6})
+
+    kept = 0
+    for user_id in range(1000):
+        message = sampler.should_track({"from": {"id": user_id}, "text": "a"}, HandlerType.MESSAGE)
+        assert sampler.should_track({"from": {"id": user_id}, "text": "b"}, HandlerType.MESSAGE) is message
+        if message:
+            kept += 1
+            assert sampler.should_track({"from": {"id": user_id}}, HandlerType.CALLBACK_QUERY) is True
+
+    assert 200 < kept < 400
+
+
+def test_sampler_by_chat():
+    """Test that sampling by chat keeps or drops whole chats"""
+    sampler = Sampler(default_rate=0.5, key="chat")
+
+    for chat_id in range(100):
+        decision = sampler.should_track({"from": {"id": 1}, "chat": {"id": chat_id}}, HandlerType.MESSAGE)
+        assert sampler.should_track({"from": {"id": 2}, "chat": {"id": chat_id}}, HandlerType.MESSAGE) is decision
+
+
+def test_sampler_without_id_samples_randomly(mocker):
+    """Test that events without a user or chat id are sampled randomly"""
+    mocker.patch("dashgram.sampling.random.random", side_effect=[0.1, 0.9])
+    sampler = Sampler({"message_reaction_count": 0.5})
+
+    event = {"chat": None, "reactions": []}
+    assert sampler.should_track(event, HandlerType.MESSAGE_REACTION_COUNT) is True
+    assert sampler.should_track(event, HandlerType.MESSAGE_REACTION_COUNT) is False
+
+
+def test_sampler_invalid_arguments():
+    """Test that invalid sampling settings are rejected"""
+    with pytest.raises(ValueError):
+        Sampler({HandlerType.POLL: 1.5})
+    with pytest.raises(ValueError):
+        Sampler({"not_a_type": 0.5})
+    with pytest.raises(ValueError):
+        Sampler(key="update")
@@ -0,0 +1,71 @@
+import pytest
+import json
+
+from dashgram.serialization import (
+    encode_request, encode_track_body, get_json_encoder, json_dumps, msgspec_dumps, orjson_dumps,
+    split_requests, wrap_raw_event,
+)
+from dashgram.enums import HandlerType
+
+
+def test_json_dumps_is_compact():
+    """Test the stdlib encoder produces compact UTF-8 JSON"""
+    assert json_dumps({"text": "привет", "id": 1}) == '{"text":"привет","id":1}'.encode("utf-8")
+
+
+def test_get_json_encoder_auto_detection(mocker):
+    """Test the fastest installed encoder is picked"""
+    mocker.patch("dashgram.serialization.orjson", object())
+    assert get_json_encoder() is orjson_dumps
+
+    mocker.patch("dashgram.serialization.orjson", None)
+    mocker.patch("dashgram.serialization.msgspec", object())
+    assert get_json_encoder() is msgspec_dumps
+
+    mocker.patch("dashgram.serialization.msgspec", None)
+    assert get_json_encoder() is json_dumps
+
+
+def test_get_json_encoder_by_name_and_callable(mocker):
+    """Test encoders can be selected by name or passed as a callable"""
+    def encoder(obj):
+        return b"{}"
+
+    assert get_json_encoder(encoder) is encoder
+    assert get_json_encoder("json") is json_dumps
+
+    with pytest.raises(ValueError):
+        get_json_encoder("ujson")
+
+    mocker.patch("dashgram.serialization.orjson", None)
+    with pytest.raises(ImportError):
+        get_json_encoder("orjson")
+
+
+def test_orjson_dumps():
+    """Test the orjson encoder"""
+    pytest.importorskip("orjson")
+    assert json.loads(orjson_dumps({"update_id": 1})) == {"update_id": 1}
+
+
+def test_wrap_raw_event():
+    """Test raw event bytes are wrapped only when handler_type is given"""
+    raw = b'{"update_id":1,"message":{"text":"hi"}}'
+    assert wrap_raw_event(raw) == raw
+    assert wrap_raw_event(memoryview(b'{"text":"hi"}'), HandlerType.MESSAGE) == b'{"update_id":-1,"message":{"text":"hi"}}'
+
+
+def test_encode_track_body_mixes_dicts_and_bytes():
+    """Test dictionaries are encoded and bytes are inserted as-is"""
+    body = encode_track_body(json_dumps, "origin", [{"update_id": 1}, b'{"update_id":2}'])
+    assert body == b'{"origin":"origin","updates":[{"update_id":1},{"update_id":2}]}'
+
+
+def test_split_requests():
+    """Test request records are separated from track events"""
+    record = encode_request("payment/refund", b'{"payment_id":"p1"}')
+    assert record == b'payment/refund\n{"payment_id":"p1"}'
+
+    updates, requests = split_requests([b'{"update_id":1}', record, {"update_id": 2}, b' {"update_id":3}'])
+    assert updates == [b'{"update_id":1}', {"update_id": 2}, b' {"update_id":3}']
+    assert requests == [("payment/refund", b'{"payment_id":"p1"}')]
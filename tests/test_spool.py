@@ -0,0 +1,96 @@
+import pytest
+import os
+import time
+
+from dashgram.spool import Spool
+
+
+def test_spool_append_read_commit(tmp_path):
+    """Test events are read back in order and removed once committed"""
+    spool = Spool(tmp_path)
+    spool.append([b'{"update_id":1}', b'{"update_id":2}', b'{"update_id":3}'])
+
+    assert spool.pending == 3
+
+    batch = spool.read(2)
+    assert batch.events == [b'{"update_id":1}', b'{"update_id":2}']
+    assert spool.read(2).events == batch.events
+
+    spool.commit(batch)
+    assert spool.pending == 1
+    assert spool.read(10).events == [b'{"update_id":3}']
+
+    spool.commit(spool.read(10))
+    assert spool.empty
+
+
+def test_spool_survives_restart(tmp_path):
+    """Test pending events and the read position survive reopening the spool"""
+    spool = Spool(tmp_path)
+    spool.append([b"1", b"2", b"3"])
+    spool.commit(spool.read(1))
+    spool.close()
+
+    reopened = Spool(tmp_path)
+    assert reopened.pending == 2
+    assert reopened.read(10).events == [b"2", b"3"]
+
+    reopened.append([b"4"])
+    assert reopened.read(10).events == [b"2", b"3", b"4"]
+
+
+def test_spool_truncates_torn_tail(tmp_path):
+    """Test a partially written record is discarded on restart"""
+    spool = Spool(tmp_path)
+    spool.append([b"1", b"2"])
+    spool.close()
+
+    segment = os.path.join(tmp_path, sorted(name for name in os.listdir(tmp_path) if name.endswith(".seg"))[-1])
+    with open(segment, "ab") as f:
+        f.write(b"\x10\x00\x00")
+
+    reopened = Spool(tmp_path)
+    assert reopened.pending == 2
+    reopened.append([b"3"])
+    assert reopened.read(10).events == [b"1", b"2", b"3"]
+
+
+def test_spool_rotates_segments(tmp_path):
+    """Test events span segments and consumed segments are deleted"""
+    spool = Spool(tmp_path, segment_size=28)
+    spool.append([b"x" * 20 for _ in range(5)])
+
+    assert len([name for name in os.listdir(tmp_path) if name.endswith(".seg")]) == 5
+    assert len(spool.read(10).events) == 5
+
+    spool.commit(spool.read(4))
+    assert len([name for name in os.listdir(tmp_path) if name.endswith(".seg")]) == 1
+    assert spool.read(10).events == [b"x" * 20]
+
+
+def test_spool_max_bytes_drops_oldest(tmp_path):
+    """Test the oldest segments are dropped once max_bytes is exceeded"""
+    spool = Spool(tmp_path, segment_size=28, max_bytes=100)
+    spool.append([str(i).encode() * 20 for i in range(6)])
+
+    assert spool.size <= 100
+    assert spool.dropped == 3
+    assert spool.pending == 3
+    assert spool.read(10).events[0] == b"3" * 20
+
+
+def test_spool_max_age_drops_expired_segments(tmp_path):
+    """Test segments older than max_age are removed"""
+    spool = Spool(tmp_path, max_age=60)
+    spool.append([b"old"])
+
+    segment = os.path.join(tmp_path, [name for name in os.listdir(tmp_path) if name.endswith(".seg")][0])
+    os.utime(segment, (time.time() - 120, time.time() - 120))
+    spool._last_expire = 0.0
+
+    assert spool.read(10).events == []
+    assert spool.dropped == 1
+    assert spool.empty
+
+    spool.append([b"new"])
+    assert spool.read(10).events == [b"new"]
@@ -0,0 +1,49 @@
+import pytest
+import httpx
+
+from dashgram.transport import create_client, get_pool_stats
+
+
+def test_create_client_with_pool_options():
+    """Test pool limits and timeouts are applied to the client"""
+    client = create_client(
+        "https://api.dashgram.io/v1/123",
+        {"Authorization": "Bearer test"},
+        max_connections=10,
+        max_keepalive_connections=5,
+        keepalive_expiry=30.0,
+        timeout=httpx.Timeout(10.0, connect=2.0),
+    )
+
+    pool = client._transport._pool
+    assert pool._max_connections == 10
+    assert pool._max_keepalive_connections == 5
+    assert pool._keepalive_expiry == 30.0
+    assert client.timeout.connect == 2.0
+    assert client.timeout.read == 10.0
+    assert client.headers["Authorization"] == "Bearer test"
+
+
+def test_create_client_with_http2():
+    """Test HTTP/2 can be enabled"""
+    pytest.importorskip("h2")
+    client = create_client("https://api.dashgram.io/v1/123", {}, http2=True)
+    assert client._transport._pool._http2 is True
+
+
+def test_get_pool_stats_of_new_client():
+    """Test pool statistics of a client without connections"""
+    client = create_client("https://api.dashgram.io/v1/123", {}, max_connections=10, max_keepalive_connections=5)
+    assert get_pool_stats(client) == {
+        "active_requests": 0,
+        "queued_requests": 0,
+        "active_connections": 0,
+        "idle_connections": 0,
+        "max_connections": 10,
+        "max_keepalive_connections": 5,
+    }
+
+
+def test_get_pool_stats_without_pool():
+    """Test pool statistics of a client that cannot be inspected"""
+    assert get_pool_stats(object())["active_connections"] == 0
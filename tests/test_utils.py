@@ -1,8 +1,9 @@
 import pytest
 
-import inspect
+import asyncio
+import threading
 
-from dashgram.utils import auto_async, wrap_event
+from dashgram.utils import LoopThread, auto_async, get_loop_thread, wrap_event
 from dashgram.enums import HandlerType
 
 
@@ -28,15 +29,82 @@ def test_auto_async_with_sync_function(auto_async_function):
 async def test_auto_async_with_async_function(auto_async_function):
     """Test auto_async with an asynchronous function"""
     
-    coro = auto_async_function(1, 2)
-    assert inspect.iscoroutine(coro)
+    task = auto_async_function(1, 2)
+    assert isinstance(task, asyncio.Task)
 
-    assert await coro == 3
+    assert await task == 3
     assert await auto_async_function(1, 2, c=False) == 3
     with pytest.raises(ValueError):
         await auto_async_function(1, 2, c=True)
 
 
+def test_auto_async_sync_calls_share_one_loop():
+    """Test sync calls from different threads run on the shared background loop"""
+    @auto_async
+    async def current_loop():
+        return asyncio.get_running_loop()
+
+    loops = [current_loop()]
+    thread = threading.Thread(target=lambda: loops.append(current_loop()))
+    thread.start()
+    thread.join()
+
+    assert loops[0] is loops[1] is get_loop_thread().loop
+
+
+def test_auto_async_sync_call_while_other_thread_loop_is_running():
+    """Test a sync call from a worker thread completes while the main thread's loop is running"""
+    @auto_async
+    async def func():
+        return threading.current_thread().name
+
+    async def main():
+        return await asyncio.get_running_loop().run_in_executor(None, func)
+
+    assert asyncio.run(main()) == get_loop_thread().name
+
+
+@pytest.mark.asyncio
+async def test_auto_async_runs_without_await():
+    """Test a call from async context runs even if the result is never awaited"""
+    called = asyncio.Event()
+
+    @auto_async
+    async def func():
+        called.set()
+
+    func()
+    await asyncio.wait_for(called.wait(), 1)
+
+
+def test_loop_thread_reuses_one_loop():
+    """Test LoopThread runs coroutines on the same loop in a separate thread"""
+    loop_thread = LoopThread(name="test-loop")
+
+    async def current():
+        return asyncio.get_running_loop(), threading.current_thread().name
+
+    first = loop_thread.submit(current()).result(1)
+    second = loop_thread.submit(current()).result(1)
+
+    assert first == second == (loop_thread.loop, "test-loop")
+    assert loop_thread.call(lambda a, b: a + b, 1, 2) == 3
+
+    loop_thread.stop(1)
+    assert not loop_thread.running
+    assert loop_thread.loop.is_closed()
+
+
+def test_loop_thread_stop_cancels_pending_tasks():
+    """Test LoopThread cancels pending tasks when stopped"""
+    loop_thread = LoopThread()
+    future = loop_thread.submit(asyncio.sleep(60))
+
+    loop_thread.stop(1)
+
+    assert future.cancelled()
+
+
 def test_wrap_event_with_update_id():
     """Test wrap_event with event that already has update_id"""
     event = {